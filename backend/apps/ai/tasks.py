@@ -0,0 +1,71 @@
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def check_upcoming_coverage(days=None):
+    """
+    Scan the next N days (COVERAGE_ALERT_DAYS) for critical windows that
+    approved shifts leave uncovered and email admins one digest.
+    Scheduled to run daily (6 AM).
+    """
+    from apps.users.models import User
+    from apps.coverage.utils import find_uncovered_windows
+    from apps.users.mail import build_messages, send_messages
+    
+    days = days or settings.COVERAGE_ALERT_DAYS
+    start_date = timezone.localdate()
+    end_date = start_date + timedelta(days=days - 1)
+    
+    gaps = find_uncovered_windows(start_date, end_date)
+    
+    if not gaps:
+        logger.info(f'Coverage check: all critical windows covered {start_date} to {end_date}')
+        return f'No coverage gaps in the next {days} days'
+    
+    admin_emails = list(
+        User.objects.filter(role='ADMIN', is_active=True).values_list('email', flat=True)
+    )
+    if not admin_emails:
+        logger.warning(f'Coverage check found {len(gaps)} gaps but there are no active admins to notify')
+        return f'Found {len(gaps)} coverage gaps, no admins to notify'
+    
+    context = {
+        'start_date': start_date.strftime('%B %d, %Y'),
+        'end_date': end_date.strftime('%B %d, %Y'),
+        'days': days,
+        'gap_count': len(gaps),
+        'urgent_count': sum(1 for gap in gaps if gap['days_away'] < settings.COVERAGE_ALERT_URGENT_DAYS),
+        'gaps': [
+            {
+                'date': gap['date'].strftime('%a, %b %d'),
+                'days_away': gap['days_away'],
+                'urgent': gap['days_away'] < settings.COVERAGE_ALERT_URGENT_DAYS,
+                'window': gap['window'].title(),
+                'start_time': gap['start_time'].strftime('%I:%M %p'),
+                'end_time': gap['end_time'].strftime('%I:%M %p'),
+                'uncovered_minutes': gap['uncovered_minutes'],
+                'pending': [
+                    f"{shift.requested_by.get_full_name()} ({shift.start_time.strftime('%I:%M %p')} - {shift.end_time.strftime('%I:%M %p')})"
+                    for shift in gap['pending_shifts']
+                ],
+            }
+            for gap in gaps
+        ],
+        'frontend_url': settings.FRONTEND_URL,
+    }
+    
+    # One message per admin so no admin sees the others' addresses
+    messages = build_messages(
+        f'Coverage alert: {len(gaps)} uncovered critical windows in the next {days} days',
+        'coverage_digest', context, admin_emails
+    )
+    send_messages(messages, 'coverage_digest')
+    
+    logger.info(f'Coverage check: sent digest of {len(gaps)} gaps to {len(admin_emails)} admins')
+    return f'Sent digest of {len(gaps)} coverage gaps to {len(admin_emails)} admins'
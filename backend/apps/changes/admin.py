@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import ChangeLogEntry
+
+
+@admin.register(ChangeLogEntry)
+class ChangeLogEntryAdmin(admin.ModelAdmin):
+    list_display = ['id', 'xid', 'entity', 'object_id', 'action', 'visible_to', 'created_at']
+    list_filter = ['entity', 'action']
+    search_fields = ['object_id']
+    readonly_fields = ['id', 'xid', 'entity', 'object_id', 'action', 'data', 'visible_to', 'created_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='changelogentry',
+            options={'ordering': ['xid', 'id'], 'verbose_name': 'Change Log Entry', 'verbose_name_plural': 'Change Log'},
+        ),
+        migrations.AddField(
+            model_name='changelogentry',
+            name='xid',
+            field=models.BigIntegerField(db_default=models.Func(output_field=models.BigIntegerField(), template='pg_current_xact_id()::text::bigint')),
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['xid', 'id'], name='change_log_xid_id_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+from django.db import models
+from django.conf import settings
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only record of changes to shifts, suggestions and critical coverage.
+    The xid (id of the transaction that wrote the entry) is the sequence number
+    clients sync from (GET /api/changes/?since=<xid>); entries written by one
+    transaction share it and are ordered by id.
+    """
+    ENTITY_CHOICES = [
+        ('shift', 'Shift Request'),
+        ('suggestion', 'Shift Suggestion'),
+        ('coverage', 'Critical Time Coverage'),
+    ]
+    
+    ACTION_CHOICES = [
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('status', 'Status Change'),
+        ('delete', 'Delete'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # create: every tracked field; update/status: changed fields only; delete: empty
+    data = models.JSONField(default=dict)
+    # Null means every user may see the change; otherwise only this user (and admins)
+    visible_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # 64-bit transaction id, never wraps; see recorder.high_water_mark
+    xid = models.BigIntegerField(
+        db_default=models.Func(template='pg_current_xact_id()::text::bigint', output_field=models.BigIntegerField())
+    )
+    
+    class Meta:
+        db_table = 'change_log'
+        ordering = ['xid', 'id']
+        indexes = [
+            models.Index(fields=['xid', 'id'], name='change_log_xid_id_idx'),
+        ]
+        verbose_name = 'Change Log Entry'
+        verbose_name_plural = 'Change Log'
+    
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.entity} {self.object_id}"
+
+
+class ChangeLogPrune(models.Model):
+    """
+    Single row recording how far prune_change_log has deleted the log.
+    Clients that last synced below pruned_through have missed changes.
+    """
+    pruned_through = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'change_log_prune'
+    
+    @classmethod
+    def pruned_through_seq(cls):
+        return cls.objects.values_list('pruned_through', flat=True).first() or 0
+    
+    def __str__(self):
+        return f"Pruned through {self.pruned_through}"
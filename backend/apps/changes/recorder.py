@@ -0,0 +1,122 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from django.db import connection
+from .models import ChangeLogEntry
+
+# Tracked fields per entity; ids are sent under the relation name (requested_by, not requested_by_id)
+TRACKED_FIELDS = {
+    'shift': [
+        'schedule_period_id', 'requested_by_id', 'date', 'start_time', 'end_time',
+        'duration_hours', 'status', 'approved_by_id',
+    ],
+    'suggestion': [
+        'schedule_period_id', 'suggested_by_id', 'suggested_to_id', 'date', 'start_time',
+        'end_time', 'status', 'related_shift_request_id',
+    ],
+    'coverage': [
+        'date', 'morning_covered', 'evening_covered', 'morning_shift_id', 'evening_shift_id',
+    ],
+}
+
+
+def _json(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _key(attname):
+    return attname[:-3] if attname.endswith('_id') else attname
+
+
+def _visible_to(entity, instance):
+    # Suggestions are private to the PA they were made to; everything else is on the shared calendar
+    return instance.suggested_to_id if entity == 'suggestion' else None
+
+
+def entry_for_save(entity, instance, created=False):
+    """
+    Unsaved ChangeLogEntry for a create or update, or None if no tracked
+    field changed. Changes are read from instance._loaded_values
+    (see LoadedValuesMixin).
+    """
+    fields = TRACKED_FIELDS[entity]
+    previous = getattr(instance, '_loaded_values', None)
+
+    if created or previous is None:
+        return ChangeLogEntry(
+            entity=entity,
+            object_id=instance.pk,
+            action='create',
+            data={_key(field): _json(getattr(instance, field)) for field in fields},
+            visible_to_id=_visible_to(entity, instance)
+        )
+
+    data = {
+        _key(field): _json(getattr(instance, field))
+        for field in fields
+        if field in previous and previous[field] != getattr(instance, field)
+    }
+    if not data:
+        return None
+
+    action = 'update'
+    if 'status' in data:
+        action = 'status'
+        data['previous_status'] = previous['status']
+
+    return ChangeLogEntry(
+        entity=entity,
+        object_id=instance.pk,
+        action=action,
+        data=data,
+        visible_to_id=_visible_to(entity, instance)
+    )
+
+
+def entry_for_delete(entity, instance):
+    return ChangeLogEntry(
+        entity=entity,
+        object_id=instance.pk,
+        action='delete',
+        data={},
+        visible_to_id=_visible_to(entity, instance)
+    )
+
+
+def record_changes(entries):
+    """Append entries to the change log; the database stamps each with the writing transaction's xid"""
+    entries = [entry for entry in entries if entry is not None]
+    if entries:
+        ChangeLogEntry.objects.bulk_create(entries)
+
+
+def high_water_mark():
+    """
+    Highest sequence number that is safe to sync up to: every change with
+    a lower or equal number has committed or rolled back.
+
+    Sequence numbers are transaction ids, and every transaction older than
+    the oldest one still running (the snapshot's xmin) has finished, so
+    this is xmin - 1. Nothing is locked: a long-running transaction holds
+    the mark back (clients see its and later changes once it ends) but
+    never blocks writers.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint')
+        return cursor.fetchone()[0] - 1
+
+
+def entries_for_status(entity, object_ids, previous_status, status):
+    """Status-change entries for rows changed with queryset.update()"""
+    return [
+        ChangeLogEntry(
+            entity=entity,
+            object_id=object_id,
+            action='status',
+            data={'status': status, 'previous_status': previous_status}
+        )
+        for object_id in object_ids
+    ]
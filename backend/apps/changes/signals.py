@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.shifts.models import ShiftRequest, ShiftSuggestion
+from apps.coverage.models import CriticalTimeCoverage
+from .recorder import entry_for_save, entry_for_delete, record_changes
+
+ENTITIES = {
+    ShiftRequest: 'shift',
+    ShiftSuggestion: 'suggestion',
+    CriticalTimeCoverage: 'coverage',
+}
+
+
+@receiver(post_save, sender=ShiftRequest)
+@receiver(post_save, sender=ShiftSuggestion)
+@receiver(post_save, sender=CriticalTimeCoverage)
+def record_save(sender, instance, created, raw=False, **kwargs):
+    """Log creates and tracked-field updates (saves that change nothing tracked are skipped)"""
+    if raw:
+        return
+    record_changes([entry_for_save(ENTITIES[sender], instance, created)])
+
+
+@receiver(post_delete, sender=ShiftRequest)
+@receiver(post_delete, sender=ShiftSuggestion)
+@receiver(post_delete, sender=CriticalTimeCoverage)
+def record_delete(sender, instance, **kwargs):
+    record_changes([entry_for_delete(ENTITIES[sender], instance)])
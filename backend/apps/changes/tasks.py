@@ -0,0 +1,33 @@
+from celery import shared_task
+
+
+@shared_task
+def prune_change_log(retention_days=None):
+    """
+    Delete change log entries older than CHANGE_LOG_RETENTION_DAYS.
+    Clients that last synced before the cut get 410 Gone and reload.
+    """
+    from datetime import timedelta
+    from django.conf import settings
+    from django.db import transaction
+    from django.db.models import Max
+    from django.utils import timezone
+    from .models import ChangeLogEntry, ChangeLogPrune
+    from .recorder import high_water_mark
+
+    retention_days = retention_days or settings.CHANGE_LOG_RETENTION_DAYS
+    expired = ChangeLogEntry.objects.filter(
+        created_at__lt=timezone.now() - timedelta(days=retention_days),
+        xid__lte=high_water_mark()
+    )
+
+    # Whole transactions only: clients resume from a transaction's sequence number
+    cutoff = expired.aggregate(last=Max('xid'))['last']
+    if cutoff is None:
+        return 0
+
+    # Watermark and deletion commit together, so no client reads a gap as "no changes"
+    with transaction.atomic():
+        ChangeLogPrune.objects.update_or_create(pk=1, defaults={'pruned_through': cutoff})
+        deleted, _ = ChangeLogEntry.objects.filter(xid__lte=cutoff).delete()
+    return deleted
@@ -0,0 +1,29 @@
+class LoadedValuesMixin:
+    """
+    Remembers a model instance's field values as loaded from (or last saved
+    to) the database in _loaded_values, so signal receivers can tell what a
+    save changed.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        attnames = [field.attname for field in self._meta.concrete_fields]
+        if fields is not None:
+            attnames = [name for name in attnames if name in fields or name[:-3] in fields]
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{name: getattr(self, name) for name in attnames},
+        }
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
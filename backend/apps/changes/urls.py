@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import ChangesAPI
+
+app_name = 'changes'
+
+urlpatterns = [
+    path('', ChangesAPI.as_view(), name='change-list'),
+]
@@ -0,0 +1,76 @@
+from django.db.models import Q
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import ChangeLogEntry, ChangeLogPrune
+from .recorder import high_water_mark
+
+
+class ChangesAPI(APIView):
+    """
+    GET /api/changes/?since=<seq>
+    Changes to shifts, suggestions and critical coverage after sequence number `since`.
+
+    Start without `since` to get the current `last_seq`, load the data once,
+    then poll with since=<last_seq> and apply the returned deltas in order.
+    While `has_more` is true, fetch again straight away.
+
+    Query params:
+    - since: last sequence number the client has applied
+    - limit: max changes per response (default 500, max 1000). A page always
+      ends on a whole transaction, so it can run over when one transaction
+      wrote more than that.
+
+    Responds 410 Gone when `since` is older than the retained log; the
+    client must reload everything and start again without `since`.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    default_limit = 500
+    max_limit = 1000
+    
+    def get(self, request):
+        last_seq = high_water_mark()
+        
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({'last_seq': last_seq, 'changes': [], 'has_more': False})
+        
+        try:
+            since = int(since)
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            return Response(
+                {'error': 'since and limit must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        entries = ChangeLogEntry.objects.filter(xid__gt=since, xid__lte=last_seq)
+        if request.user.role != 'ADMIN':
+            entries = entries.filter(Q(visible_to__isnull=True) | Q(visible_to=request.user))
+        fields = ('xid', 'entity', 'object_id', 'action', 'data')
+        
+        rows = list(entries.order_by('xid', 'id').values_list('id', *fields)[:limit])
+        has_more = False
+        if len(rows) == limit:
+            # Entries of one transaction share a sequence number, so finish its page
+            last_id, last_xid = rows[-1][:2]
+            rows += entries.filter(xid=last_xid, id__gt=last_id).order_by('id').values_list('id', *fields)
+            has_more = entries.filter(xid__gt=last_xid).exists()
+        rows = [row[1:] for row in rows]
+        
+        # Checked after reading so a prune committed meanwhile can't pass for "no changes"
+        if since < ChangeLogPrune.pruned_through_seq():
+            return Response(
+                {'error': 'Changes since this sequence number are no longer available', 'last_seq': last_seq},
+                status=status.HTTP_410_GONE
+            )
+        
+        return Response({
+            # Without more to fetch the client is up to date with everything, including entries it may not see
+            'last_seq': rows[-1][0] if has_more else last_seq,
+            'changes': [
+                {'seq': seq, 'entity': entity, 'id': object_id, 'action': action, 'data': data}
+                for seq, entity, object_id, action, data in rows
+            ],
+            'has_more': has_more,
+        })
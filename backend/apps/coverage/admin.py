@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import CriticalTimeCoverage, WeeklyCoverage
+from .models import CriticalWindow, CriticalTimeCoverage, WeeklyCoverage
+
+
+@admin.register(CriticalWindow)
+class CriticalWindowAdmin(admin.ModelAdmin):
+    list_display = ['name', 'start_time', 'end_time', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    readonly_fields = ['created_at', 'updated_at']
 
 
 @admin.register(CriticalTimeCoverage)
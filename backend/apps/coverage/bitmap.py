@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+MINUTES_PER_DAY = 24 * 60
+
+# Source for slice painting: no shift or window is longer than a day
+_FILLED = b'\x01' * MINUTES_PER_DAY
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+class CoverageBitmap:
+    """
+    Minute-resolution occupancy for a date range: one byte per minute,
+    1440 per day, laid out back to back so overnight shifts and gaps run
+    across day boundaries without special cases.
+
+    Painting is a slice assignment and window checks are bytearray
+    find/count calls, so the per-minute work runs in C rather than in
+    Python loops. Minutes are wall-clock (the 23/25 hour DST days are
+    treated as 24 hours, like the shift times themselves).
+    """
+
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.days = (end_date - start_date).days + 1
+        self.minutes = bytearray(self.days * MINUTES_PER_DAY)
+
+    def span(self, date, start_time, end_time):
+        """(start, end) minute offsets of a shift or window; end_time <= start_time runs into the next day"""
+        start = (date - self.start_date).days * MINUTES_PER_DAY + _minutes(start_time)
+        end = start - _minutes(start_time) + _minutes(end_time)
+        if end <= start:
+            end += MINUTES_PER_DAY
+        return start, end
+
+    def _clip(self, start, end):
+        return max(start, 0), min(end, len(self.minutes))
+
+    def paint(self, date, start_time, end_time):
+        """Mark the minutes of a shift as covered (parts outside the range are ignored)"""
+        start, end = self._clip(*self.span(date, start_time, end_time))
+        if end > start:
+            self.minutes[start:end] = _FILLED[:end - start]
+
+    def paint_shifts(self, shifts):
+        """Paint an iterable of objects with date, start_time and end_time"""
+        for shift in shifts:
+            self.paint(shift.date, shift.start_time, shift.end_time)
+
+    def covered_minutes(self, date, start_time, end_time):
+        """Minutes of the span that are covered; minutes outside the range count as uncovered"""
+        start, end = self._clip(*self.span(date, start_time, end_time))
+        if end <= start:
+            return 0
+        return (end - start) - self.minutes.count(0, start, end)
+
+    def is_covered(self, date, start_time, end_time):
+        """True if every minute of the span is covered"""
+        start, end = self.span(date, start_time, end_time)
+        if start < 0 or end > len(self.minutes):
+            return False
+        return self.minutes.find(0, start, end) == -1
+
+    def evaluate_windows(self, windows):
+        """
+        Covered minutes of every window on every date.
+
+        Args:
+            windows: list of (name, start_time, end_time)
+
+        Returns:
+            dict of date -> {name: covered minutes}
+        """
+        results = {}
+        for offset in range(self.days):
+            date = self.start_date + timedelta(days=offset)
+            results[date] = {
+                name: self.covered_minutes(date, window_start, window_end)
+                for name, window_start, window_end in windows
+            }
+        return results
+
+    def to_datetime(self, offset):
+        """Naive wall-clock datetime for a minute offset"""
+        return datetime.combine(self.start_date, datetime.min.time()) + timedelta(minutes=offset)
+
+    def gaps(self, min_minutes=0):
+        """
+        Uncovered runs in the range, in order.
+
+        Returns:
+            list of (start datetime, end datetime, minutes); naive wall-clock datetimes
+        """
+        gaps = []
+        total = len(self.minutes)
+        position = self.minutes.find(0)
+        while position != -1:
+            end = self.minutes.find(1, position)
+            if end == -1:
+                end = total
+            if end - position >= min_minutes:
+                gaps.append((self.to_datetime(position), self.to_datetime(end), end - position))
+            position = self.minutes.find(0, end) if end < total else -1
+        return gaps
+
+    def overlap(self, shift, date, start_time, end_time):
+        """Minutes a single shift overlaps a span (used to credit a window to a shift)"""
+        shift_start, shift_end = self.span(shift.date, shift.start_time, shift.end_time)
+        window_start, window_end = self.span(date, start_time, end_time)
+        return max(0, min(shift_end, window_end) - max(shift_start, window_start))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:00
+
+from datetime import time
+from django.db import migrations, models
+
+
+def seed_windows(apps, schema_editor):
+    CriticalWindow = apps.get_model('coverage', 'CriticalWindow')
+    CriticalWindow.objects.get_or_create(name='morning', defaults={'start_time': time(6, 0), 'end_time': time(9, 0)})
+    CriticalWindow.objects.get_or_create(name='evening', defaults={'start_time': time(21, 0), 'end_time': time(22, 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coverage', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CriticalWindow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Critical Window',
+                'verbose_name_plural': 'Critical Windows',
+                'db_table': 'critical_windows',
+                'ordering': ['start_time'],
+            },
+        ),
+        migrations.RunPython(seed_windows, migrations.RunPython.noop),
+    ]
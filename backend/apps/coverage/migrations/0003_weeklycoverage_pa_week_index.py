@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:14
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('coverage', '0002_criticalwindow'),
+        ('schedules', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='weeklycoverage',
+            index=models.Index(fields=['pa', 'week_start_date', 'id'], name='weekly_pa_week_idx'),
+        ),
+    ]
@@ -1,9 +1,36 @@
 # apps/coverage/models.py
 from django.db import models
 from django.conf import settings
+from apps.changes.tracking import LoadedValuesMixin
 
 
-class CriticalTimeCoverage(models.Model):
+class CriticalWindow(models.Model):
+    """
+    A time of day that must be covered every day (e.g. morning 6-9 AM).
+    A window whose end_time is not after its start_time runs past midnight.
+    
+    CriticalTimeCoverage stores the windows named 'morning' and 'evening';
+    changing a window rebuilds it for current and future periods
+    (see apps/coverage/signals.py).
+    """
+    name = models.CharField(max_length=50, unique=True)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'critical_windows'
+        ordering = ['start_time']
+        verbose_name = 'Critical Window'
+        verbose_name_plural = 'Critical Windows'
+    
+    def __str__(self):
+        return f"{self.name} ({self.start_time.strftime('%I:%M %p')} - {self.end_time.strftime('%I:%M %p')})"
+
+
+class CriticalTimeCoverage(LoadedValuesMixin, models.Model):
     """
     Tracks whether critical times (6-9 AM morning, 9-10 PM evening) are covered for each date.
     Updated automatically when shifts are approved/rejected/deleted.
@@ -84,6 +111,10 @@ class WeeklyCoverage(models.Model):
         db_table = 'weekly_coverage'
         unique_together = ['schedule_period', 'pa', 'week_start_date']
         ordering = ['week_start_date', 'pa']
+        indexes = [
+            # Weekly totals are kept on the oldest row per PA week, whatever its period
+            models.Index(fields=['pa', 'week_start_date', 'id'], name='weekly_pa_week_idx'),
+        ]
         verbose_name = 'Weekly Coverage'
         verbose_name_plural = 'Weekly Coverage'
     
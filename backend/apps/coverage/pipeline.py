@@ -0,0 +1,138 @@
+from datetime import date as date_cls, timedelta
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY_PREFIX = 'coverage:dirty'
+
+# Fields that change which windows or hours a shift counts towards
+COVERAGE_FIELDS = ('date', 'start_time', 'end_time', 'status', 'requested_by_id')
+
+
+def coverage_affected(shift, created=False):
+    """
+    True if saving the shift can change critical coverage or weekly hours.
+    Saves that only touch fields like admin_notes, and shifts that neither
+    are nor were APPROVED, leave coverage alone.
+    """
+    previous = getattr(shift, '_loaded_values', None)
+    is_approved = shift.status == 'APPROVED'
+
+    if created or previous is None:
+        return is_approved
+
+    if previous.get('status') != 'APPROVED' and not is_approved:
+        return False
+
+    return any(previous.get(field) != getattr(shift, field) for field in COVERAGE_FIELDS)
+
+
+def coverage_keys_for_shift(shift):
+    """
+    Dirty dates for a shift: its date, plus the date it had when loaded if
+    an edit moved it.
+
+    Critical coverage for a date is read from the shifts a day either side
+    (overnight shifts, windows past midnight), so neighbouring dates are dirty too.
+    Weekly hours are not queued here; see apply_weekly_hours_deltas.
+
+    Returns:
+        set of dates
+    """
+    dates = set()
+    previous = getattr(shift, '_loaded_values', None) or {}
+
+    for shift_date in [shift.date, previous.get('date')]:
+        if shift_date is None:
+            continue
+        dates.update(shift_date + timedelta(days=offset) for offset in (-1, 0, 1))
+
+    return dates
+
+
+def _dirty_key(*parts):
+    return ':'.join([DIRTY_KEY_PREFIX] + [str(part) for part in parts])
+
+
+def date_dirty_key(date):
+    return _dirty_key('date', date.isoformat())
+
+
+def week_dirty_key(pa_id, week_start):
+    return _dirty_key('week', pa_id, week_start.isoformat())
+
+
+def mark_coverage_dirty(dates, weeks=()):
+    """
+    Record dirty keys and schedule one background recompute for the ones
+    that were not already pending.
+
+    Each key gets a marker that lives for the debounce window; while it
+    exists, further changes to the same key are absorbed by the recompute
+    already scheduled, so a burst of edits to one day costs one recompute.
+    """
+    if settings.COVERAGE_SYNC_UPDATES:
+        recompute_coverage(dates, weeks)
+        return
+
+    from .tasks import recompute_dirty_coverage
+
+    debounce = settings.COVERAGE_UPDATE_DEBOUNCE_SECONDS
+
+    new_dates = [d for d in sorted(dates) if cache.add(date_dirty_key(d), True, timeout=debounce)]
+    new_weeks = [w for w in sorted(weeks) if cache.add(week_dirty_key(*w), True, timeout=debounce)]
+
+    if not new_dates and not new_weeks:
+        return
+
+    recompute_dirty_coverage.apply_async(
+        kwargs={
+            'dates': [d.isoformat() for d in new_dates],
+            'weeks': [[pa_id, week_start.isoformat()] for pa_id, week_start in new_weeks],
+        },
+        countdown=debounce
+    )
+
+
+def queue_coverage_update(shift):
+    """Mark the shift's dates dirty once the surrounding transaction commits"""
+    dates = coverage_keys_for_shift(shift)
+    transaction.on_commit(lambda: mark_coverage_dirty(dates))
+
+
+def recompute_coverage(dates, weeks=()):
+    """
+    Recompute critical coverage for each date and weekly hours for each
+    (PA, week) once.
+
+    Args:
+        dates: iterable of datetime.date
+        weeks: iterable of (pa_id, week_start); full recounts, normally empty
+            since saves apply weekly deltas directly
+    """
+    from apps.users.models import User
+    from .utils import calculate_critical_coverage, calculate_weekly_hours
+
+    for date in sorted(set(dates)):
+        calculate_critical_coverage(date)
+
+    weeks = sorted(set(weeks))
+    pas = User.objects.select_related('pa_profile').in_bulk({pa_id for pa_id, _ in weeks})
+    for pa_id, week_start in weeks:
+        pa = pas.get(pa_id)
+        if pa is not None:
+            calculate_weekly_hours(pa, week_start)
+
+    logger.debug(f'Recomputed coverage for {len(set(dates))} dates and {len(weeks)} PA weeks')
+
+
+def parse_dirty_keys(dates, weeks):
+    """Turn the JSON task arguments back into dates and (pa_id, week_start) tuples"""
+    return (
+        [date_cls.fromisoformat(d) for d in dates],
+        [(pa_id, date_cls.fromisoformat(week_start)) for pa_id, week_start in weeks],
+    )
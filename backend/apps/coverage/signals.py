@@ -1,23 +1,56 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from apps.shifts.models import ShiftRequest
-from .utils import update_coverage_for_shift
+from .models import CriticalWindow
+from .pipeline import coverage_affected, queue_coverage_update
+from .utils import update_weekly_hours_for_shift
 
 
 @receiver(post_save, sender=ShiftRequest)
-def shift_saved(sender, instance, **kwargs):
+def shift_saved(sender, instance, created, **kwargs):
     """
-    Update coverage whenever a shift is saved.
-    Only update for approved shifts.
+    When a save changes an approved shift's date, times, PA or status
+    (including an approved shift being cancelled), apply the weekly hours
+    delta in the same transaction and queue a critical coverage update.
     """
-    if instance.status == 'APPROVED':
-        update_coverage_for_shift(instance)
+    if coverage_affected(instance, created):
+        update_weekly_hours_for_shift(instance)
+        queue_coverage_update(instance)
 
 
 @receiver(post_delete, sender=ShiftRequest)
 def shift_deleted(sender, instance, **kwargs):
     """
-    Update coverage when a shift is deleted.
+    Remove a deleted approved shift's hours and queue a coverage update.
     """
     if instance.status == 'APPROVED':
-        update_coverage_for_shift(instance)
\ No newline at end of file
+        update_weekly_hours_for_shift(instance, deleted=True)
+        queue_coverage_update(instance)
+
+
+@receiver(post_save, sender=CriticalWindow)
+@receiver(post_delete, sender=CriticalWindow)
+def critical_window_changed(sender, instance, **kwargs):
+    """
+    Every day's critical times depend on the windows: drop all cached
+    calendars and rebuild critical coverage for periods that have not
+    ended yet (past days keep the coverage they were scheduled under).
+    """
+    transaction.on_commit(rebuild_for_window_change)
+
+
+def rebuild_for_window_change():
+    from django.db.models import Min, Max
+    from django.utils import timezone
+    from apps.schedules.cache import invalidate_all_calendars
+    from apps.schedules.models import SchedulePeriod
+    from .tasks import rebuild_coverage_range
+
+    invalidate_all_calendars()
+
+    span = SchedulePeriod.objects.filter(end_date__gte=timezone.localdate()).aggregate(
+        start=Min('start_date'), end=Max('end_date')
+    )
+    if span['start'] is not None:
+        rebuild_coverage_range.delay(span['start'].isoformat(), span['end'].isoformat())
@@ -0,0 +1,62 @@
+from celery import shared_task
+from django.core.cache import cache
+
+
+@shared_task
+def recompute_dirty_coverage(dates, weeks=None):
+    """
+    Recompute coverage for dirty keys recorded by mark_coverage_dirty.
+
+    Args:
+        dates: list of ISO dates
+        weeks: list of [pa_id, ISO week start]
+    """
+    from .pipeline import parse_dirty_keys, recompute_coverage, date_dirty_key, week_dirty_key
+
+    dates, weeks = parse_dirty_keys(dates, weeks or [])
+
+    # Clear the markers before reading so changes from here on schedule a new run
+    cache.delete_many(
+        [date_dirty_key(d) for d in dates] + [week_dirty_key(*w) for w in weeks]
+    )
+
+    recompute_coverage(dates, weeks)
+
+
+@shared_task
+def rebuild_coverage_range(start_date, end_date, dry_run=False):
+    """
+    Rebuild coverage tables for an ISO date range (see rebuild_coverage).
+    Returns the summary without the per-row changes.
+    """
+    from datetime import date
+    from .utils import rebuild_coverage
+
+    summary = rebuild_coverage(
+        date.fromisoformat(start_date),
+        date.fromisoformat(end_date),
+        dry_run=dry_run
+    )
+    summary['changed_rows'] = len(summary.pop('changes'))
+    return summary
+
+
+@shared_task
+def reconcile_weekly_hours(weeks_back=None):
+    """
+    Periodic check of delta-maintained weekly totals against a full
+    aggregate of approved shifts, from weeks_back weeks ago onwards.
+    Returns the summary without the per-row changes.
+    """
+    from datetime import timedelta
+    from django.conf import settings
+    from django.utils import timezone
+    from .utils import reconcile_weekly_coverage
+
+    if weeks_back is None:
+        weeks_back = settings.WEEKLY_HOURS_RECONCILE_WEEKS
+
+    start_date = timezone.localdate() - timedelta(weeks=weeks_back)
+    summary = reconcile_weekly_coverage(start_date=start_date)
+    summary['changed_rows'] = len(summary.pop('changes'))
+    return summary
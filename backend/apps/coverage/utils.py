@@ -1,17 +1,72 @@
 from datetime import time, timedelta
+from decimal import Decimal
+import logging
+from django.db import connection, transaction
+from django.db.models import F, Sum, Max, Case, When, Value
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
 from apps.shifts.models import ShiftRequest
 from .models import CriticalTimeCoverage, WeeklyCoverage
 
+logger = logging.getLogger(__name__)
+
+HOURS_QUANTUM = Decimal('0.01')
+
+# Critical times that must be covered every day: (name, start, end)
+CRITICAL_WINDOWS = [
+    ('morning', time(6, 0), time(9, 0)),
+    ('evening', time(21, 0), time(22, 0)),
+]
+
+
+def get_critical_windows():
+    """
+    Active critical windows as (name, start_time, end_time), from CriticalWindow.
+    Falls back to CRITICAL_WINDOWS until any windows are configured.
+    """
+    from .models import CriticalWindow
+    
+    rows = list(CriticalWindow.objects.values_list('name', 'start_time', 'end_time', 'is_active'))
+    if not rows:
+        return list(CRITICAL_WINDOWS)
+    return [(name, start_time, end_time) for name, start_time, end_time, is_active in rows if is_active]
+
+
+def _critical_values(bitmap, date, windows, candidates):
+    """
+    CriticalTimeCoverage field values for one date.
+    
+    A window is covered when every minute of it is covered by approved shifts,
+    together or alone. The shift credited with it is the one overlapping it most
+    (earliest first on ties).
+    
+    Args:
+        bitmap: CoverageBitmap painted with the approved shifts
+        windows: dict of name -> (start_time, end_time)
+        candidates: shifts dated the day before, on, or after the date, sorted by date and start
+    """
+    values = {}
+    for name in ('morning', 'evening'):
+        window = windows.get(name)
+        covered = window is not None and bitmap.is_covered(date, *window)
+        shift_id = None
+        if covered:
+            shift_id = max(candidates, key=lambda shift: bitmap.overlap(shift, date, *window)).id
+        values[f'{name}_covered'] = covered
+        values[f'{name}_shift_id'] = shift_id
+    return values
+
 
 def calculate_critical_coverage(date):
     """
     Calculate and update critical time coverage for a specific date.
     
-    Critical Times:
-    - Morning: 6:00 AM - 9:00 AM (must cover full 3 hours)
-    - Evening: 9:00 PM - 10:00 PM (must cover full 1 hour)
+    Critical Times (CriticalWindow rows named 'morning' and 'evening'):
+    - Morning: 6:00 AM - 9:00 AM by default (must cover full 3 hours)
+    - Evening: 9:00 PM - 10:00 PM by default (must cover full 1 hour)
     
-    Handles overnight shifts correctly (when end_time < start_time).
+    Coverage is read from a minute bitmap, so an overnight shift from the day
+    before covers this morning, and back-to-back shifts can cover a window together.
     
     Args:
         date: datetime.date object
@@ -19,37 +74,22 @@ def calculate_critical_coverage(date):
     Returns:
         CriticalTimeCoverage instance
     """
+    from .bitmap import CoverageBitmap
+    
     coverage, created = CriticalTimeCoverage.objects.get_or_create(date=date)
+    windows = {name: (start_time, end_time) for name, start_time, end_time in get_critical_windows()}
     
-    shifts = ShiftRequest.objects.filter(
-        date=date,
+    shifts = list(ShiftRequest.objects.filter(
+        date__gte=date - timedelta(days=1),
+        date__lte=date + timedelta(days=1),
         status='APPROVED'
-    )
+    ).order_by('date', 'start_time', 'id'))
     
-    coverage.morning_covered = False
-    coverage.evening_covered = False
-    coverage.morning_shift = None
-    coverage.evening_shift = None
+    bitmap = CoverageBitmap(date, date + timedelta(days=1))
+    bitmap.paint_shifts(shifts)
     
-    for shift in shifts:
-        is_overnight = shift.end_time < shift.start_time
-        
-        if is_overnight:
-            if shift.start_time <= time(21, 0):
-                coverage.evening_covered = True
-                coverage.evening_shift = shift
-            
-            if shift.end_time >= time(9, 0):
-                coverage.morning_covered = True
-                coverage.morning_shift = shift
-        else:
-            if shift.start_time <= time(6, 0) and shift.end_time >= time(9, 0):
-                coverage.morning_covered = True
-                coverage.morning_shift = shift
-            
-            if shift.start_time <= time(21, 0) and shift.end_time >= time(22, 0):
-                coverage.evening_covered = True
-                coverage.evening_shift = shift
+    for field, value in _critical_values(bitmap, date, windows, shifts).items():
+        setattr(coverage, field, value)
     
     coverage.save()
     return coverage
@@ -57,7 +97,9 @@ def calculate_critical_coverage(date):
 
 def calculate_weekly_hours(pa, week_start_date):
     """
-    Calculate and update weekly hours for a PA.
+    Calculate and update weekly hours for a PA from scratch.
+    Saves keep totals current with apply_weekly_hours_deltas; this is the
+    full recount for a single week.
     
     Args:
         pa: User instance (PA)
@@ -66,8 +108,6 @@ def calculate_weekly_hours(pa, week_start_date):
     Returns:
         WeeklyCoverage instance
     """
-    from apps.users.models import User
-    
     if week_start_date.weekday() != 0:
         week_start_date = week_start_date - timedelta(days=week_start_date.weekday())
     
@@ -80,33 +120,392 @@ def calculate_weekly_hours(pa, week_start_date):
         date__lte=week_end_date
     )
     
-    total_hours = sum(shift.duration_hours for shift in shifts)
+    total_hours = shifts.aggregate(total=Sum('duration_hours'))['total']
+    
+    if total_hours is None:
+        # No approved shifts left this week (e.g. the last one was cancelled)
+        WeeklyCoverage.objects.filter(
+            pa=pa,
+            week_start_date=week_start_date
+        ).update(total_hours=0, exceeds_limit=False, updated_at=timezone.now())
+        return None
     
     max_hours = 40
     if hasattr(pa, 'pa_profile'):
         max_hours = pa.pa_profile.max_hours_per_week
     
-    schedule_period = None
-    if shifts.exists():
-        schedule_period = shifts.first().schedule_period
-    
-    if schedule_period:
-        coverage, created = WeeklyCoverage.objects.get_or_create(
-            schedule_period=schedule_period,
+    coverage = WeeklyCoverage.objects.filter(pa=pa, week_start_date=week_start_date).order_by('id').first()
+    if coverage is None:
+        coverage = WeeklyCoverage(
+            schedule_period_id=shifts.order_by('-created_at').values_list('schedule_period_id', flat=True).first(),
             pa=pa,
-            week_start_date=week_start_date,
-            defaults={'total_hours': total_hours}
+            week_start_date=week_start_date
         )
+    
+    coverage.total_hours = total_hours
+    coverage.check_exceeds_limit(max_hours)
+    coverage.save()
+    
+    return coverage
+
+
+def _hours(value):
+    """Round hours the way the DecimalField columns store them"""
+    return Decimal(value).quantize(HOURS_QUANTUM)
+
+
+def weekly_hours_deltas(shift, deleted=False):
+    """
+    Signed hour changes a shift save or delete makes to weekly totals.
+    
+    Compares the shift as loaded (_loaded_values) with the shift as saved:
+    approving adds its hours, cancelling or rejecting removes them, editing
+    the times changes them by the difference, and moving it to another week
+    or PA removes them from the old week and adds them to the new one.
+    
+    Returns:
+        dict of (pa_id, week_start) -> (schedule_period_id, delta hours), zero deltas left out
+    """
+    previous = getattr(shift, '_loaded_values', None) or {}
+    current = {
+        'status': shift.status,
+        'requested_by_id': shift.requested_by_id,
+        'date': shift.date,
+        'duration_hours': shift.duration_hours,
+        'schedule_period_id': shift.schedule_period_id,
+    }
+    if deleted and not previous:
+        previous = current
+    
+    deltas = {}
+    if previous.get('status') == 'APPROVED' and previous.get('duration_hours') is not None:
+        key = (previous['requested_by_id'], get_monday_of_week(previous['date']))
+        deltas[key] = (previous['schedule_period_id'], -_hours(previous['duration_hours']))
+    
+    if not deleted and current['status'] == 'APPROVED':
+        key = (current['requested_by_id'], get_monday_of_week(current['date']))
+        _, delta = deltas.get(key, (None, Decimal('0')))
+        deltas[key] = (current['schedule_period_id'], delta + _hours(current['duration_hours']))
+    
+    return {key: value for key, value in deltas.items() if value[1] != 0}
+
+
+def apply_weekly_hours_deltas(deltas):
+    """
+    Apply signed hour changes to WeeklyCoverage with atomic F() updates.
+    
+    Each PA week has one row (the oldest, whatever its period); the first
+    approved hours of a week create it under the shift's period. The
+    exceeds_limit check is part of the same UPDATE, so concurrent saves
+    never lose an increment.
+    
+    Args:
+        deltas: output of weekly_hours_deltas
+    """
+    from apps.users.models import PAProfile
+    
+    if not deltas:
+        return
+    
+    max_hours = dict(
+        PAProfile.objects.filter(
+            user_id__in={pa_id for pa_id, _ in deltas}
+        ).values_list('user_id', 'max_hours_per_week')
+    )
+    
+    for (pa_id, week_start), (period_id, delta) in deltas.items():
+        limit = max_hours.get(pa_id, 40)
+        canonical = WeeklyCoverage.objects.filter(
+            id=WeeklyCoverage.objects.filter(
+                pa_id=pa_id,
+                week_start_date=week_start
+            ).order_by('id').values('id')[:1]
+        )
+        changes = {
+            'total_hours': F('total_hours') + delta,
+            # SET expressions see the row before the update: old + delta > limit
+            'exceeds_limit': Case(
+                When(total_hours__gt=limit - delta, then=Value(True)),
+                default=Value(False)
+            ),
+            'updated_at': timezone.now(),
+        }
         
-        if not created:
-            coverage.total_hours = total_hours
-        
-        coverage.check_exceeds_limit(max_hours)
-        coverage.save()
+        if not canonical.update(**changes) and delta > 0:
+            # Insert an empty row and add to it, rather than inserting the total:
+            # a concurrent first approval for the same week waits on the unique
+            # index and then adds its hours instead of losing them
+            WeeklyCoverage.objects.bulk_create(
+                [WeeklyCoverage(schedule_period_id=period_id, pa_id=pa_id, week_start_date=week_start, total_hours=0)],
+                ignore_conflicts=True
+            )
+            canonical.update(**changes)
+
+
+def update_weekly_hours_for_shift(shift, deleted=False):
+    """Apply a shift's save or delete to weekly totals"""
+    apply_weekly_hours_deltas(weekly_hours_deltas(shift, deleted=deleted))
+
+
+# pg_advisory_xact_lock(bigint) namespace for PA weeks (shift dates use 7301, the change log 7302)
+WEEK_LOCK_NAMESPACE = 7303
+
+
+def lock_pa_weeks(keys):
+    """
+    Take a transaction-scoped advisory lock per PA week.
+
+    Serialises overtime checks for the same PA week even before the week
+    has a WeeklyCoverage row to select_for_update, e.g. two first approvals
+    on different days of the same week. Taken in key order, after any
+    per-date locks (see apps.shifts.conflicts.lock_dates).
+
+    Args:
+        keys: iterable of (pa_id, week_start)
+    """
+    if connection.vendor != 'postgresql':
+        return
+    if not connection.in_atomic_block:
+        raise RuntimeError('lock_pa_weeks must be called inside transaction.atomic()')
+
+    with connection.cursor() as cursor:
+        for pa_id, week_start in sorted(set(keys)):
+            # Namespace, PA and week packed into one bigint key
+            key = (WEEK_LOCK_NAMESPACE << 48) | (pa_id << 20) | (week_start.toordinal() // 7)
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [key])
+
+
+def project_weekly_hours(shift, lock=False):
+    """
+    Weekly hours the shift's PA would have if the shift were approved.
+
+    Reads the maintained WeeklyCoverage total for the shift's week (one
+    indexed row) rather than summing the week's shifts. A shift that is
+    already approved is counted in that total, so it adds nothing.
+
+    Args:
+        shift: ShiftRequest instance
+        lock: take the PA week's advisory lock (see lock_pa_weeks) so
+            concurrent approvals for the same PA week are checked one at a time
+
+    Returns:
+        dict with current, shift, projected and max hours, and whether
+        the projection exceeds the limit
+    """
+    from apps.users.models import PAProfile
+
+    week_start = get_monday_of_week(shift.date)
+    if lock:
+        lock_pa_weeks([(shift.requested_by_id, week_start)])
+    rows = WeeklyCoverage.objects.filter(
+        pa_id=shift.requested_by_id,
+        week_start_date=week_start
+    ).order_by('id')
+
+    current_hours = rows.values_list('total_hours', flat=True).first() or Decimal('0.00')
+    max_hours = PAProfile.objects.filter(
+        user_id=shift.requested_by_id
+    ).values_list('max_hours_per_week', flat=True).first() or 40
+
+    previous = getattr(shift, '_loaded_values', None) or {}
+    already_counted = previous.get('status') == 'APPROVED'
+    shift_hours = Decimal('0.00') if already_counted else _hours(shift.duration_hours)
+    projected_hours = current_hours + shift_hours
+
+    return {
+        'pa_id': shift.requested_by_id,
+        'week_start_date': str(week_start),
+        'current_hours': str(current_hours),
+        'shift_hours': str(shift_hours),
+        'projected_hours': str(projected_hours),
+        'max_hours': max_hours,
+        'exceeds_limit': projected_hours > max_hours,
+        'overtime_hours': str(max(projected_hours - max_hours, Decimal('0.00'))),
+    }
+
+
+def project_weekly_deltas(deltas, lock=False):
+    """
+    Projected weekly hours for many PA weeks at once (see project_weekly_hours).
+
+    Args:
+        deltas: merged output of weekly_hours_deltas for the shifts being changed
+        lock: take the affected PA weeks' advisory locks
+
+    Returns:
+        list of projection dicts, one per PA week, ordered by PA and week
+    """
+    from apps.users.models import PAProfile
+
+    if not deltas:
+        return []
+
+    if lock:
+        lock_pa_weeks(deltas)
+    rows = WeeklyCoverage.objects.filter(
+        pa_id__in={pa_id for pa_id, _ in deltas},
+        week_start_date__in={week_start for _, week_start in deltas}
+    ).order_by('-id')
+
+    # Ordered newest first so the oldest (canonical) row wins
+    current = {
+        (pa_id, week_start): total_hours
+        for pa_id, week_start, total_hours in rows.values_list('pa_id', 'week_start_date', 'total_hours')
+    }
+    max_hours = dict(
+        PAProfile.objects.filter(
+            user_id__in={pa_id for pa_id, _ in deltas}
+        ).values_list('user_id', 'max_hours_per_week')
+    )
+
+    projections = []
+    for (pa_id, week_start), (_, delta) in sorted(deltas.items()):
+        current_hours = current.get((pa_id, week_start), Decimal('0.00'))
+        limit = max_hours.get(pa_id, 40)
+        projected_hours = current_hours + delta
+        projections.append({
+            'pa_id': pa_id,
+            'week_start_date': str(week_start),
+            'current_hours': str(current_hours),
+            'shift_hours': str(delta),
+            'projected_hours': str(projected_hours),
+            'max_hours': limit,
+            'exceeds_limit': projected_hours > limit,
+            'overtime_hours': str(max(projected_hours - limit, Decimal('0.00'))),
+        })
+
+    return projections
+
+
+def merge_weekly_deltas(*deltas):
+    """Sum several weekly_hours_deltas results into one"""
+    merged = {}
+    for shift_deltas in deltas:
+        for key, (period_id, delta) in shift_deltas.items():
+            _, total = merged.get(key, (period_id, Decimal('0')))
+            merged[key] = (period_id, total + delta)
+    return {key: value for key, value in merged.items() if value[1] != 0}
+
+
+def reconcile_weekly_coverage(start_date=None, end_date=None, dry_run=False, batch_size=1000):
+    """
+    Verify WeeklyCoverage against a full aggregate of approved shifts and fix drift
+    (bulk updates, queryset.update() calls, admin-site edits or lost deltas).
+    
+    Totals come from one grouped SUM per (PA, week). Each PA week keeps its
+    oldest row; any extra rows for the same week are zeroed.
+    
+    Args:
+        start_date, end_date: optional date range, widened to whole weeks
+        dry_run: compute the diff without writing
+        batch_size: rows per bulk write
+    
+    Returns:
+        dict with created/updated/unchanged counts and the list of changes
+    """
+    from apps.users.models import PAProfile
+    
+    shifts = ShiftRequest.objects.filter(status='APPROVED')
+    rows = WeeklyCoverage.objects.all()
+    if start_date:
+        shifts = shifts.filter(date__gte=get_monday_of_week(start_date))
+        rows = rows.filter(week_start_date__gte=get_monday_of_week(start_date))
+    if end_date:
+        shifts = shifts.filter(date__lte=get_monday_of_week(end_date) + timedelta(days=6))
+        rows = rows.filter(week_start_date__lte=get_monday_of_week(end_date))
+    
+    # Newest period in the week for rows that don't exist yet
+    totals = {
+        (row['requested_by_id'], row['week_start']): row
+        for row in shifts.annotate(week_start=TruncWeek('date')).values(
+            'requested_by_id', 'week_start'
+        ).annotate(
+            total_hours=Sum('duration_hours'),
+            schedule_period_id=Max('schedule_period_id')
+        ).order_by()
+    }
+    
+    max_hours = dict(
+        PAProfile.objects.filter(
+            user_id__in={pa_id for pa_id, _ in totals}
+        ).values_list('user_id', 'max_hours_per_week')
+    )
+    
+    def expected(pa_id, total_hours):
+        return {
+            'total_hours': _hours(total_hours),
+            'exceeds_limit': total_hours > max_hours.get(pa_id, 40),
+        }
+    
+    now = timezone.now()
+    fields = ['total_hours', 'exceeds_limit']
+    changes = []
+    created = []
+    updated = []
+    unchanged = 0
+    seen = set()
+    
+    for row in rows.order_by('id'):
+        key = (row.pa_id, row.week_start_date)
+        if key in totals and key not in seen:
+            values = expected(row.pa_id, totals[key]['total_hours'])
+        else:
+            # No approved hours, or an extra row for a week already counted
+            values = {'total_hours': Decimal('0.00'), 'exceeds_limit': False}
+        seen.add(key)
         
-        return coverage
+        diff = _diff(row, values, fields)
+        if not diff:
+            unchanged += 1
+            continue
+        changes.append({
+            'table': 'weekly', 'pa_id': row.pa_id, 'week_start_date': str(row.week_start_date),
+            'created': False, 'changes': diff
+        })
+        row.total_hours = values['total_hours']
+        row.exceeds_limit = values['exceeds_limit']
+        row.updated_at = now
+        updated.append(row)
     
-    return None
+    for (pa_id, week_start), total in totals.items():
+        if (pa_id, week_start) in seen:
+            continue
+        values = expected(pa_id, total['total_hours'])
+        changes.append({
+            'table': 'weekly', 'pa_id': pa_id, 'week_start_date': str(week_start),
+            'created': True, 'changes': _diff(None, values, fields)
+        })
+        created.append(WeeklyCoverage(
+            schedule_period_id=total['schedule_period_id'],
+            pa_id=pa_id,
+            week_start_date=week_start,
+            **values
+        ))
+    
+    if not dry_run and changes:
+        with transaction.atomic():
+            WeeklyCoverage.objects.bulk_create(
+                created,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['schedule_period', 'pa', 'week_start_date'],
+                update_fields=['total_hours', 'exceeds_limit', 'updated_at']
+            )
+            WeeklyCoverage.objects.bulk_update(
+                updated,
+                ['total_hours', 'exceeds_limit', 'updated_at'],
+                batch_size=batch_size
+            )
+    
+    if changes:
+        logger.warning(f'Weekly coverage drift: {len(changes)} rows {"would change" if dry_run else "fixed"}')
+    
+    return {
+        'created': len(created),
+        'updated': len(updated),
+        'unchanged': unchanged,
+        'changes': changes,
+    }
 
 
 def get_monday_of_week(date):
@@ -122,14 +521,190 @@ def get_monday_of_week(date):
     return date - timedelta(days=date.weekday())
 
 
-def update_coverage_for_shift(shift):
+def _diff(existing, computed, fields):
+    """{field: [old, new]} for fields whose value changed (JSON friendly)"""
+    changes = {}
+    for field in fields:
+        old = getattr(existing, field) if existing is not None else None
+        new = computed[field]
+        if old != new:
+            changes[field] = [
+                str(value) if isinstance(value, Decimal) else value
+                for value in (old, new)
+            ]
+    return changes
+
+
+def rebuild_coverage(start_date, end_date, dry_run=False, batch_size=1000):
     """
-    Update both critical time coverage and weekly hours when a shift changes.
+    Recompute CriticalTimeCoverage for every date in the range from one pass
+    over approved shifts, and reconcile WeeklyCoverage for every week touching it.
+    
+    Only rows whose values differ are written: new rows with
+    bulk_create(update_conflicts=True), changed rows with bulk_update.
+    Use after imports, admin-site edits or queryset.update() calls that skip signals.
     
     Args:
-        shift: ShiftRequest instance
+        start_date, end_date: inclusive date range
+        dry_run: compute the diff without writing
+        batch_size: rows per bulk write
+    
+    Returns:
+        dict with counts per table and the list of changes
     """
-    calculate_critical_coverage(shift.date)
+    from .bitmap import CoverageBitmap
     
-    week_start = get_monday_of_week(shift.date)
-    calculate_weekly_hours(shift.requested_by, week_start)
\ No newline at end of file
+    windows = {name: (start_time, end_time) for name, start_time, end_time in get_critical_windows()}
+    
+    # Overnight shifts from the day before and windows running past midnight reach one day out
+    bitmap = CoverageBitmap(start_date, end_date + timedelta(days=1))
+    shifts_by_date = {}
+    shift_count = 0
+    
+    shifts = ShiftRequest.objects.filter(
+        status='APPROVED',
+        date__gte=start_date - timedelta(days=1),
+        date__lte=end_date + timedelta(days=1)
+    ).order_by('date', 'start_time', 'id').values_list('id', 'date', 'start_time', 'end_time', named=True)
+    
+    for shift in shifts.iterator(chunk_size=batch_size):
+        bitmap.paint(shift.date, shift.start_time, shift.end_time)
+        shifts_by_date.setdefault(shift.date, []).append(shift)
+        if start_date <= shift.date <= end_date:
+            shift_count += 1
+    
+    critical = {}
+    day = start_date
+    while day <= end_date:
+        candidates = [
+            shift
+            for offset in (-1, 0, 1)
+            for shift in shifts_by_date.get(day + timedelta(days=offset), [])
+        ]
+        critical[day] = _critical_values(bitmap, day, windows, candidates)
+        day += timedelta(days=1)
+    
+    now = timezone.now()
+    changes = []
+    summary = {
+        'start_date': str(start_date),
+        'end_date': str(end_date),
+        'dry_run': dry_run,
+        'shifts': shift_count,
+    }
+    
+    # Critical time coverage
+    existing_critical = CriticalTimeCoverage.objects.filter(date__gte=start_date, date__lte=end_date).in_bulk(field_name='date')
+    critical_fields = ['morning_covered', 'evening_covered', 'morning_shift_id', 'evening_shift_id']
+    critical_created = []
+    critical_updated = []
+    
+    for date, values in critical.items():
+        row = existing_critical.get(date)
+        diff = _diff(row, values, critical_fields)
+        if row is not None and not diff:
+            continue
+        changes.append({'table': 'critical', 'date': str(date), 'created': row is None, 'changes': diff})
+        if row is None:
+            critical_created.append(CriticalTimeCoverage(date=date, **values))
+        else:
+            for field, value in values.items():
+                setattr(row, field, value)
+            row.updated_at = now
+            critical_updated.append(row)
+    
+    summary['critical'] = {
+        'created': len(critical_created),
+        'updated': len(critical_updated),
+        'unchanged': len(critical) - len(critical_created) - len(critical_updated),
+    }
+    
+    with transaction.atomic():
+        if not dry_run and (critical_created or critical_updated):
+            CriticalTimeCoverage.objects.bulk_create(
+                critical_created,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['date'],
+                update_fields=['morning_covered', 'evening_covered', 'morning_shift', 'evening_shift', 'updated_at']
+            )
+            CriticalTimeCoverage.objects.bulk_update(
+                critical_updated,
+                ['morning_covered', 'evening_covered', 'morning_shift', 'evening_shift', 'updated_at'],
+                batch_size=batch_size
+            )
+            # Bulk writes skip the post_save receivers that feed the change log
+            from apps.changes.recorder import entry_for_save, record_changes
+            record_changes(
+                [entry_for_save('coverage', row, created=True) for row in critical_created]
+                + [entry_for_save('coverage', row) for row in critical_updated]
+            )
+        
+        weekly = reconcile_weekly_coverage(start_date, end_date, dry_run=dry_run, batch_size=batch_size)
+    
+    summary['weekly'] = {key: weekly[key] for key in ['created', 'updated', 'unchanged']}
+    summary['changes'] = changes + weekly['changes']
+    
+    if not dry_run and (critical_created or critical_updated):
+        # Bulk writes skip the post_save receivers that invalidate cached calendars
+        from apps.schedules.cache import invalidate_calendar_range
+        invalidate_calendar_range(start_date, end_date)
+    
+    return summary
+
+
+def find_uncovered_windows(start_date, end_date):
+    """
+    Critical windows in a date range that approved shifts leave uncovered,
+    with the pending requests that overlap each one.
+    
+    One query loads approved and pending shifts (plus the day before, for
+    overnight shifts); windows are evaluated on a CoverageBitmap of the
+    approved ones.
+    
+    Returns:
+        list of dicts ordered by urgency: soonest first, then windows with no
+        pending request to approve, then most uncovered minutes
+    """
+    from .bitmap import CoverageBitmap
+    
+    windows = get_critical_windows()
+    shifts = list(ShiftRequest.objects.filter(
+        date__gte=start_date - timedelta(days=1),
+        date__lte=end_date,
+        status__in=['APPROVED', 'PENDING']
+    ).select_related('requested_by').order_by('date', 'start_time', 'id'))
+    
+    bitmap = CoverageBitmap(start_date, end_date + timedelta(days=1))
+    bitmap.paint_shifts(shift for shift in shifts if shift.status == 'APPROVED')
+    pending = [shift for shift in shifts if shift.status == 'PENDING']
+    
+    uncovered = []
+    for date, covered in bitmap.evaluate_windows(windows).items():
+        if date > end_date:
+            continue
+        for name, window_start, window_end in windows:
+            span_start, span_end = bitmap.span(date, window_start, window_end)
+            window_minutes = span_end - span_start
+            if covered[name] >= window_minutes:
+                continue
+            uncovered.append({
+                'date': date,
+                'days_away': (date - start_date).days,
+                'window': name,
+                'start_time': window_start,
+                'end_time': window_end,
+                'uncovered_minutes': window_minutes - covered[name],
+                'pending_shifts': [
+                    shift for shift in pending
+                    if bitmap.overlap(shift, date, window_start, window_end) > 0
+                ],
+            })
+    
+    uncovered.sort(key=lambda gap: (
+        gap['days_away'],
+        bool(gap['pending_shifts']),
+        -gap['uncovered_minutes'],
+        gap['start_time']
+    ))
+    return uncovered
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SchedulePeriod
+from .models import FinalizeJob, SchedulePeriod
 
 
 @admin.register(SchedulePeriod)
@@ -17,4 +17,11 @@ class SchedulePeriodAdmin(admin.ModelAdmin):
             'fields': ('created_by', 'created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(FinalizeJob)
+class FinalizeJobAdmin(admin.ModelAdmin):
+    list_display = ['period', 'status', 'stage', 'progress', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = ['job_id', 'created_at', 'updated_at', 'finished_at']
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class SchedulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.schedules'
\ No newline at end of file
+    name = 'apps.schedules'
+    
+    def ready(self):
+        import apps.schedules.signals  # noqa
\ No newline at end of file
@@ -0,0 +1,244 @@
+from datetime import timedelta
+import hashlib
+import time
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Count
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = 'calendar:version'
+PERIOD_VERSION_KEY_PREFIX = 'periods:version'
+# Folded into every range version; bumped when the critical windows change
+GLOBAL_VERSION_KEY = f'{VERSION_KEY_PREFIX}:all'
+RESPONSE_KEY_PREFIX = 'calendar:response'
+HITS_KEY = 'calendar:stats:hits'
+MISSES_KEY = 'calendar:stats:misses'
+
+
+def _version_key(year, month):
+    return f'{VERSION_KEY_PREFIX}:{year}-{month:02d}'
+
+
+def _month_version_keys(start_date, end_date):
+    """Version keys for every month touched by the date range"""
+    keys = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        keys.append(_version_key(year, month))
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return keys
+
+
+def _new_version():
+    """
+    Seed for a missing version counter.
+    Time-based so an evicted counter never restarts at a value that
+    older cached responses were stored under.
+    """
+    return int(time.time() * 1000)
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+def get_range_version(start_date, end_date):
+    """
+    Version string for a date range, built from the per-month counters
+    and the global counter. Changes whenever any month in the range is
+    invalidated, or everything is.
+    """
+    keys = _month_version_keys(start_date, end_date) + [GLOBAL_VERSION_KEY]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def invalidate_calendar_range(start_date, end_date=None):
+    """
+    Bump the version counter of every month in the range so cached
+    calendar responses covering it are never served again.
+    """
+    end_date = end_date or start_date
+    for key in _month_version_keys(start_date, end_date):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _new_version(), timeout=None)
+
+
+def invalidate_all_calendars():
+    """Make every cached calendar response unreachable (e.g. critical windows changed)"""
+    try:
+        cache.incr(GLOBAL_VERSION_KEY)
+    except ValueError:
+        cache.add(GLOBAL_VERSION_KEY, _new_version(), timeout=None)
+
+
+def invalidate_calendar_dates(*dates):
+    """
+    Invalidate the calendar for each date and the day after it
+    (overnight shifts spill into the following day's view).
+    """
+    for date in {d for d in dates if d}:
+        invalidate_calendar_range(date, date + timedelta(days=1))
+
+
+def _period_version_key(period_id):
+    return f'{PERIOD_VERSION_KEY_PREFIX}:{period_id}'
+
+
+def invalidate_period_shift_counts(*period_ids):
+    """
+    Bump the version counter of each period whose shift_count changed
+    (shifts created, deleted or moved between periods).
+    """
+    for period_id in {p for p in period_ids if p}:
+        key = _period_version_key(period_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _new_version(), timeout=None)
+
+
+def calendar_cache_key(view_name, start_date, end_date, status_filter=None, pa_id=None, **extra):
+    """
+    Cache key for a calendar response.
+    Includes the range version, so bumping a month makes every key covering it unreachable.
+    """
+    parts = [
+        RESPONSE_KEY_PREFIX,
+        view_name,
+        start_date.isoformat(),
+        end_date.isoformat(),
+        (status_filter or '').upper(),
+        str(pa_id or ''),
+    ]
+    parts.extend(f'{name}={value}' for name, value in sorted(extra.items()))
+    parts.append(get_range_version(start_date, end_date))
+    return ':'.join(parts)
+
+
+def get_cached_calendar(key):
+    """Return cached response data or None, recording a hit or a miss"""
+    data = cache.get(key)
+    if data is None:
+        _incr(MISSES_KEY)
+        logger.debug(f'Calendar cache miss: {key}')
+    else:
+        _incr(HITS_KEY)
+    return data
+
+
+def set_cached_calendar(key, data):
+    cache.set(key, data, timeout=settings.CALENDAR_CACHE_TIMEOUT)
+
+
+def get_calendar_cache_stats():
+    """Hit/miss counters for sizing the calendar cache"""
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counts.get(HITS_KEY, 0)
+    misses = counts.get(MISSES_KEY, 0)
+    total = hits + misses
+
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': (hits / total * 100) if total > 0 else 0,
+        'timeout_seconds': settings.CALENDAR_CACHE_TIMEOUT,
+        'backend': settings.CACHES['default']['BACKEND'],
+    }
+
+
+def _fingerprint(*parts):
+    raw = '|'.join(str(part) for part in parts)
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def _table_state(queryset):
+    """(latest updated_at, row count) for a queryset in one aggregate query"""
+    state = queryset.aggregate(last_updated=Max('updated_at'), rows=Count('id'))
+    return state['last_updated'], state['rows']
+
+
+def calendar_etag(view_name, start_date, end_date, status_filter=None, pa_id=None, **extra):
+    """
+    ETag for a calendar range, built from the latest updated_at and row count
+    of the shifts and coverage rows in it, and of the critical windows (which
+    mark is_critical_time on every day). Row counts catch deletions, which
+    leave no updated_at behind. Costs three aggregate queries and no serialization.
+    """
+    from apps.shifts.models import ShiftRequest
+    from apps.coverage.models import CriticalTimeCoverage, CriticalWindow
+
+    shift_state = _table_state(
+        ShiftRequest.objects.filter(date__gte=start_date, date__lte=end_date)
+    )
+    coverage_state = _table_state(
+        CriticalTimeCoverage.objects.filter(date__gte=start_date, date__lte=end_date)
+    )
+    window_state = _table_state(CriticalWindow.objects.all())
+
+    return _fingerprint(
+        view_name, start_date, end_date, (status_filter or '').upper(), pa_id or '',
+        sorted(extra.items()), *shift_state, *coverage_state, *window_state
+    )
+
+
+def period_list_etag(query_string, periods):
+    """
+    ETag for the schedule period list.
+
+    Built from the listed periods' own state plus their shift-count version
+    counters (each period reports its shift_count), so the cost depends on
+    the number of periods listed, never on how many shifts there are.
+
+    Args:
+        query_string: request query string
+        periods: SchedulePeriod queryset being listed
+    """
+    period_ids = list(periods.values_list('id', flat=True))
+    keys = [_period_version_key(period_id) for period_id in period_ids]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return _fingerprint(
+        'periods', query_string,
+        *_table_state(periods),
+        *[f'{period_id}:{versions[key]}' for period_id, key in zip(period_ids, keys)]
+    )
+
+
+def get_not_modified_response(request, etag):
+    """Return a 304 response if the client's If-None-Match matches the ETag, else None"""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
+
+def with_etag(response, etag):
+    """Attach the ETag and ask clients to revalidate before reusing their copy"""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from rest_framework.renderers import JSONRenderer
+from apps.shifts.models import ShiftRequest
+
+STATUS_CODES = [code for code, _ in ShiftRequest.STATUS_CHOICES]
+STATUS_INDEX = {code: index for index, code in enumerate(STATUS_CODES)}
+
+# Coverage bitmask per day
+MORNING_COVERED = 1
+EVENING_COVERED = 2
+
+
+class CompactCalendarRenderer(JSONRenderer):
+    """
+    Selected with ?format=compact on the calendar endpoints.
+    The view checks request.accepted_renderer.format and returns the columnar payload.
+    """
+    format = 'compact'
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def encode_compact_calendar(start_date, end_date, shifts, coverage_map):
+    """
+    Dictionary-encode shifts for a date range into columnar arrays.
+
+    Args:
+        start_date, end_date: range the day offsets and coverage array refer to
+        shifts: iterable of ShiftRequest with requested_by loaded
+        coverage_map: dict of date -> CriticalTimeCoverage
+
+    Returns:
+        dict with a PA lookup table, parallel shift columns referencing it by index,
+        sparse notes keyed by shift id and a coverage bitmask per day
+    """
+    pa_index = {}
+    pas = {'id': [], 'name': []}
+    columns = {'id': [], 'pa': [], 'day': [], 'start': [], 'end': [], 'status': []}
+    notes = {}
+
+    for shift in shifts:
+        pa_id = shift.requested_by_id
+        if pa_id not in pa_index:
+            pa_index[pa_id] = len(pas['id'])
+            pas['id'].append(pa_id)
+            pas['name'].append(shift.requested_by.get_full_name())
+
+        columns['id'].append(shift.id)
+        columns['pa'].append(pa_index[pa_id])
+        columns['day'].append((shift.date - start_date).days)
+        columns['start'].append(_minutes(shift.start_time))
+        columns['end'].append(_minutes(shift.end_time))
+        columns['status'].append(STATUS_INDEX[shift.status])
+        if shift.notes:
+            notes[shift.id] = shift.notes
+
+    coverage = []
+    for offset in range((end_date - start_date).days + 1):
+        row = coverage_map.get(start_date + timedelta(days=offset))
+        mask = 0
+        if row is not None:
+            mask = (MORNING_COVERED if row.morning_covered else 0) | (EVENING_COVERED if row.evening_covered else 0)
+        coverage.append(mask)
+
+    return {
+        'format': 'compact',
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'statuses': STATUS_CODES,
+        'pas': pas,
+        'shifts': columns,
+        'notes': notes,
+        'coverage': coverage,
+    }
@@ -146,6 +146,17 @@ class ScheduleConsumer(AsyncWebsocketConsumer):
             'message': event.get('message', 'Schedule period finalized')
         }))
     
+    async def period_finalize_progress(self, event):
+        """Broadcast progress of a background finalize job"""
+        await self.send(text_data=json.dumps({
+            'type': 'period.finalize_progress',
+            'job_id': event['job_id'],
+            'status': event['status'],
+            'stage': event['stage'],
+            'progress': event['progress'],
+            'message': event.get('message', '')
+        }))
+    
     # Helper methods
     
     @database_sync_to_async
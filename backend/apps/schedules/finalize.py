@@ -0,0 +1,107 @@
+from datetime import timedelta
+from uuid import uuid4
+import logging
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import FinalizeJob
+
+logger = logging.getLogger(__name__)
+
+# A queued or running job that has not reported progress for this long is
+# taken to have lost its worker (crash, deploy) and may be replaced
+FINALIZE_JOB_STALE_AFTER = timedelta(minutes=10)
+
+ACTIVE_STATUSES = ['queued', 'running']
+
+
+def job_state(job):
+    """Job state as returned by the API and pushed over the WebSocket"""
+    return {
+        'job_id': job.job_id.hex,
+        'period_id': job.period_id,
+        'idempotency_key': job.idempotency_key,
+        'requested_by': job.requested_by_id,
+        'status': job.status,
+        'stage': job.stage,
+        'progress': job.progress,
+        'message': job.message,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'result': job.result,
+        'error': job.error or None,
+    }
+
+
+def get_finalize_job(period_id, idempotency_key=''):
+    """
+    Latest finalize job state for a period (the latest with this
+    idempotency key, if one is given), or None
+    """
+    jobs = FinalizeJob.objects.filter(period_id=period_id)
+    if idempotency_key:
+        jobs = jobs.filter(idempotency_key=idempotency_key)
+    job = jobs.order_by('-created_at').first()
+    return job_state(job) if job is not None else None
+
+
+def start_finalize_job(period, requested_by, idempotency_key=''):
+    """
+    Reserve the finalize job for a period.
+    Only one job per period can be queued or running; a failed or stale job
+    can be restarted.
+
+    Returns:
+        tuple of (job state dict, created)
+    """
+    stale = timezone.now() - FINALIZE_JOB_STALE_AFTER
+    replaced = FinalizeJob.objects.filter(
+        period=period, status__in=ACTIVE_STATUSES, updated_at__lt=stale
+    ).update(
+        status='failed', stage='failed', message='Finalization stalled',
+        error='No progress reported; the worker was probably lost', finished_at=timezone.now()
+    )
+    if replaced:
+        logger.warning(f'Replacing stalled finalize job for period {period.id}')
+
+    try:
+        # Savepoint so a lost race doesn't break an enclosing transaction
+        with transaction.atomic():
+            job = FinalizeJob.objects.create(
+                job_id=uuid4(),
+                period=period,
+                idempotency_key=idempotency_key,
+                requested_by=requested_by
+            )
+        return job_state(job), True
+    except IntegrityError:
+        # one_active_finalize_job_per_period: another job is already queued or running
+        job = FinalizeJob.objects.filter(period=period, status__in=ACTIVE_STATUSES).first()
+        if job is None:
+            # It finished between the insert and this read
+            return start_finalize_job(period, requested_by, idempotency_key)
+        return job_state(job), False
+
+
+def update_finalize_job(job_id, broadcast=True, **changes):
+    """
+    Store job progress and push it to the period's WebSocket group.
+
+    Returns:
+        updated job state dict, or None if the job no longer exists
+    """
+    job = FinalizeJob.objects.filter(job_id=job_id).first()
+    if job is None:
+        return None
+
+    for field, value in changes.items():
+        setattr(job, field, value)
+    job.save(update_fields=[*changes, 'updated_at'])
+    state = job_state(job)
+
+    if broadcast:
+        from .websocket_utils import broadcast_finalize_progress
+        broadcast_finalize_progress(job.period_id, state)
+
+    return state
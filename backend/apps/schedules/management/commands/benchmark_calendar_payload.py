@@ -0,0 +1,95 @@
+from django.core.management.base import BaseCommand
+from datetime import date, time, timedelta
+from decimal import Decimal
+import random
+import time as clock
+from rest_framework.renderers import JSONRenderer
+from apps.users.models import User
+from apps.shifts.models import ShiftRequest
+from apps.coverage.models import CriticalTimeCoverage
+from apps.schedules.serializers import CalendarShiftSerializer
+from apps.schedules.compact import encode_compact_calendar
+
+
+class Command(BaseCommand):
+    help = 'Compare size and encode time of the compact calendar payload against CalendarShiftSerializer output'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shifts', type=int, default=600, help='Synthetic shifts in the month')
+        parser.add_argument('--pas', type=int, default=12, help='Synthetic PAs')
+        parser.add_argument('--repeat', type=int, default=20, help='Encode runs to average over')
+
+    def handle(self, *args, **options):
+        # Unsaved in-memory objects: nothing touches the database
+        start_date = date(2025, 11, 1)
+        end_date = date(2025, 11, 30)
+        rng = random.Random(42)
+
+        pas = [
+            User(id=index + 1, email=f'pa{index}@example.com', first_name=f'First{index}', last_name=f'Last{index}', role='PA')
+            for index in range(options['pas'])
+        ]
+
+        shifts = []
+        for index in range(options['shifts']):
+            start_hour = rng.randrange(0, 24)
+            length = rng.choice([4, 6, 8, 10, 12])
+            pa = rng.choice(pas)
+            shift = ShiftRequest(
+                id=index + 1,
+                requested_by=pa,
+                date=start_date + timedelta(days=rng.randrange(0, 30)),
+                start_time=time(start_hour, rng.choice([0, 30])),
+                end_time=time((start_hour + length) % 24, 0),
+                duration_hours=Decimal(length),
+                status=rng.choice(['APPROVED', 'PENDING']),
+                notes=rng.choice(['', '', 'Can cover morning', 'Swap with weekend'])
+            )
+            shifts.append(shift)
+        shifts.sort(key=lambda s: (s.date, s.start_time))
+
+        coverage_map = {
+            start_date + timedelta(days=offset): CriticalTimeCoverage(
+                date=start_date + timedelta(days=offset),
+                morning_covered=rng.random() > 0.3,
+                evening_covered=rng.random() > 0.3
+            )
+            for offset in range(30)
+        }
+
+        renderer = JSONRenderer()
+
+        def full_payload():
+            by_date = {}
+            for shift in shifts:
+                by_date.setdefault(shift.date, []).append(shift)
+            return renderer.render({
+                'days': [
+                    {
+                        'date': day.isoformat(),
+                        'shifts': CalendarShiftSerializer(by_date.get(day, []), many=True).data,
+                    }
+                    for day in sorted(coverage_map)
+                ]
+            })
+
+        def compact_payload():
+            return renderer.render(encode_compact_calendar(start_date, end_date, shifts, coverage_map))
+
+        results = {}
+        for name, build in [('serializer', full_payload), ('compact', compact_payload)]:
+            body = build()
+            started = clock.perf_counter()
+            for _ in range(options['repeat']):
+                build()
+            elapsed_ms = (clock.perf_counter() - started) * 1000 / options['repeat']
+            results[name] = (len(body), elapsed_ms)
+            self.stdout.write(f'{name:>10}: {len(body):>9,} bytes  {elapsed_ms:8.2f} ms/encode')
+
+        full_size, full_ms = results['serializer']
+        compact_size, compact_ms = results['compact']
+        self.stdout.write(self.style.SUCCESS(
+            f'compact is {compact_size / full_size * 100:.1f}% of the size and '
+            f'{full_ms / compact_ms:.1f}x faster to encode '
+            f'({options["shifts"]} shifts, {options["pas"]} PAs)'
+        ))
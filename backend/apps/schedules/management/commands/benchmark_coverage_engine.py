@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+import random
+import time as clock
+from apps.coverage.bitmap import CoverageBitmap
+from apps.coverage.utils import CRITICAL_WINDOWS
+
+
+class Command(BaseCommand):
+    help = 'Time the minute-bitmap coverage engine (paint, window evaluation, gaps) over multi-year ranges'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=3, help='Length of the synthetic range in years')
+        parser.add_argument('--shifts-per-day', type=int, default=4, help='Synthetic approved shifts per day')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs to average over')
+
+    def handle(self, *args, **options):
+        # In-memory shifts: nothing touches the database
+        start_date = date(2025, 1, 1)
+        end_date = start_date + timedelta(days=365 * options['years'] - 1)
+        rng = random.Random(42)
+
+        shifts = []
+        day = start_date
+        while day <= end_date:
+            for _ in range(options['shifts_per_day']):
+                start_hour = rng.randrange(0, 24)
+                length = rng.choice([4, 6, 8, 10, 12])
+                shifts.append(SimpleNamespace(
+                    date=day,
+                    start_time=time(start_hour, rng.choice([0, 15, 30, 45])),
+                    end_time=time((start_hour + length) % 24, 0)
+                ))
+            day += timedelta(days=1)
+
+        timings = {'paint': 0.0, 'windows': 0.0, 'gaps': 0.0}
+        for _ in range(options['repeat']):
+            started = clock.perf_counter()
+            bitmap = CoverageBitmap(start_date, end_date)
+            bitmap.paint_shifts(shifts)
+            painted = clock.perf_counter()
+            results = bitmap.evaluate_windows(CRITICAL_WINDOWS)
+            evaluated = clock.perf_counter()
+            gaps = bitmap.gaps()
+            finished = clock.perf_counter()
+
+            timings['paint'] += painted - started
+            timings['windows'] += evaluated - painted
+            timings['gaps'] += finished - evaluated
+
+        for name, total in timings.items():
+            self.stdout.write(f'{name:>8}: {total * 1000 / options["repeat"]:9.2f} ms')
+
+        uncovered = sum(minutes for _, _, minutes in gaps)
+        fully_covered_days = sum(
+            1 for day in results
+            if all(bitmap.is_covered(day, start, end) for _, start, end in CRITICAL_WINDOWS)
+        )
+        total_ms = sum(timings.values()) * 1000 / options['repeat']
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(shifts):,} shifts over {bitmap.days:,} days in {total_ms:.1f} ms: '
+            f'{len(gaps):,} gaps ({uncovered:,} uncovered minutes), '
+            f'{fully_covered_days:,} days with every window covered'
+        ))
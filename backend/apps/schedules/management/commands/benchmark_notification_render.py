@@ -0,0 +1,111 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.template.loader import render_to_string
+import time as clock
+from apps.users import mail
+from apps.users.mail import build_messages, compiled_template
+
+TEMPLATE = 'shift_cancelled_by_pa'
+
+
+class Command(BaseCommand):
+    help = 'Compare rendering a multi-admin notification per recipient against render-once with per-recipient fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--admins', type=int, nargs='+', default=[1, 5, 25, 100, 500], help='Admin counts to try')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs to average over')
+
+    def handle(self, *args, **options):
+        # Plain strings only: nothing touches the database or sends mail
+        context = {
+            'pa_name': 'Jordan Rivera',
+            'date': 'November 14, 2025',
+            'start_time': '06:00 AM',
+            'end_time': '02:00 PM',
+            'duration': '8.00',
+            'cancellation_reason': 'Family emergency <urgent>',
+            'coverage_warning': '⚠️ WARNING: This shift covered the critical MORNING time slot (6-9 AM).',
+            'schedule_url': f'{settings.FRONTEND_URL}/schedule',
+        }
+        subject = f'⚠️ Shift Cancelled by {context["pa_name"]}'
+
+        def per_recipient(admins):
+            # What each admin loop used to do: a full render of both templates per admin
+            return [
+                (
+                    render_to_string(f'emails/{TEMPLATE}.txt', {**context, 'admin_name': name}),
+                    render_to_string(f'emails/{TEMPLATE}.html', {**context, 'admin_name': name}),
+                )
+                for _, name in admins
+            ]
+
+        def render_once(admins):
+            return build_messages(
+                subject, TEMPLATE, context,
+                [email for email, _ in admins],
+                recipient_context={email: {'admin_name': name} for email, name in admins}
+            )
+
+        # The first render compiles the templates; keep that out of the timings
+        compiled_template(f'emails/{TEMPLATE}.txt')
+        compiled_template(f'emails/{TEMPLATE}.html')
+
+        # Time spent inside render_email during build_messages, i.e. template rendering
+        # as opposed to filling in recipient fields and building the messages
+        render_stats = {'calls': 0, 'seconds': 0.0}
+        render_email = mail.render_email
+
+        def timed_render_email(*args, **kwargs):
+            started = clock.perf_counter()
+            try:
+                return render_email(*args, **kwargs)
+            finally:
+                render_stats['calls'] += 1
+                render_stats['seconds'] += clock.perf_counter() - started
+
+        self.stdout.write(
+            f'{"admins":>7}  {"per-recipient render":>20}  {"render-once render":>18}  {"fill + build":>12}'
+        )
+        once_ms = {}
+        for count in options['admins']:
+            admins = [(f'admin{n}@example.com', f'Admin{n}') for n in range(count)]
+
+            started = clock.perf_counter()
+            for _ in range(options['repeat']):
+                per_recipient(admins)
+            per_recipient_ms = (clock.perf_counter() - started) * 1000 / options['repeat']
+
+            render_stats.update(calls=0, seconds=0.0)
+            mail.render_email = timed_render_email
+            try:
+                started = clock.perf_counter()
+                for _ in range(options['repeat']):
+                    render_once(admins)
+                total_ms = (clock.perf_counter() - started) * 1000 / options['repeat']
+            finally:
+                mail.render_email = render_email
+            render_ms = render_stats['seconds'] * 1000 / options['repeat']
+
+            # The deterministic part of "flat": one render per event, whatever the admin count
+            if render_stats['calls'] != options['repeat']:
+                raise CommandError(
+                    f'{render_stats["calls"] / options["repeat"]:.0f} renders per event for {count} admins, expected 1'
+                )
+
+            # Same bodies either way
+            expected_text, expected_html = per_recipient(admins[:1])[0]
+            message = render_once(admins[:1])[0]
+            if message.body != expected_text or message.alternatives[0][0] != expected_html:
+                raise CommandError('Render-once output differs from a full per-recipient render')
+
+            once_ms[count] = render_ms
+            self.stdout.write(
+                f'{count:>7}  {per_recipient_ms:>17.2f} ms  {render_ms:>15.2f} ms  {total_ms - render_ms:>9.2f} ms'
+            )
+
+        smallest, largest = min(once_ms), max(once_ms)
+        self.stdout.write(
+            f'render-once template rendering: {once_ms[smallest]:.2f} ms at {smallest} admins, '
+            f'{once_ms[largest]:.2f} ms at {largest} (per-recipient rendering grows ~{largest / smallest:.0f}x)'
+        )
+        self.stdout.write(self.style.SUCCESS('One template render per event, whatever the admin count'))
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min, Max
+from datetime import datetime
+import time as clock
+from apps.shifts.models import ShiftRequest
+from apps.coverage.utils import rebuild_coverage
+from apps.coverage.tasks import rebuild_coverage_range
+
+
+class Command(BaseCommand):
+    help = 'Recompute CriticalTimeCoverage and WeeklyCoverage for a date range from approved shifts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First date (YYYY-MM-DD); defaults to the earliest approved shift')
+        parser.add_argument('--end', help='Last date (YYYY-MM-DD); defaults to the latest approved shift')
+        parser.add_argument('--dry-run', action='store_true', help='Show what would change without writing')
+        parser.add_argument('--async', dest='run_async', action='store_true', help='Queue a Celery task instead of running here')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk write')
+
+    def handle(self, *args, **options):
+        bounds = ShiftRequest.objects.filter(status='APPROVED').aggregate(first=Min('date'), last=Max('date'))
+
+        try:
+            start_date = self._parse(options['start']) or bounds['first']
+            end_date = self._parse(options['end']) or bounds['last']
+        except ValueError:
+            raise CommandError('Dates must be YYYY-MM-DD')
+
+        if start_date is None or end_date is None:
+            self.stdout.write(self.style.WARNING('No approved shifts and no range given. Nothing to rebuild.'))
+            return
+
+        if end_date < start_date:
+            raise CommandError('--end must be on or after --start')
+
+        if options['run_async']:
+            result = rebuild_coverage_range.delay(start_date.isoformat(), end_date.isoformat(), options['dry_run'])
+            self.stdout.write(self.style.SUCCESS(f'Queued coverage rebuild {start_date} to {end_date} (task {result.id})'))
+            return
+
+        started = clock.perf_counter()
+        summary = rebuild_coverage(start_date, end_date, dry_run=options['dry_run'], batch_size=options['batch_size'])
+        elapsed = clock.perf_counter() - started
+
+        if options['dry_run']:
+            for change in summary['changes']:
+                label = change['date'] if change['table'] == 'critical' else f"PA {change['pa_id']} week of {change['week_start_date']}"
+                action = 'create' if change['created'] else 'update'
+                fields = ', '.join(f'{field}: {old} -> {new}' for field, (old, new) in change['changes'].items())
+                self.stdout.write(f"  {action} {change['table']} {label}: {fields}")
+
+        for table in ['critical', 'weekly']:
+            counts = summary[table]
+            self.stdout.write(
+                f"{table:>8}: {counts['created']} created, {counts['updated']} updated, {counts['unchanged']} unchanged"
+            )
+
+        verb = 'Would rebuild' if options['dry_run'] else 'Rebuilt'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} coverage {start_date} to {end_date} from {summary['shifts']} approved shifts in {elapsed:.2f}s"
+        ))
+
+    def _parse(self, value):
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%d').date()
@@ -19,4 +19,44 @@ class SchedulePeriod(models.Model):
     
     class Meta:
         db_table = 'schedule_periods'
-        ordering = ['-start_date']
\ No newline at end of file
+        ordering = ['-start_date']
+
+class FinalizeJob(models.Model):
+    """
+    Background finalize run for a schedule period (see apps/schedules/finalize.py).
+    At most one job per period is queued or running at a time.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    job_id = models.UUIDField(unique=True)
+    period = models.ForeignKey(SchedulePeriod, on_delete=models.CASCADE, related_name='finalize_jobs')
+    idempotency_key = models.CharField(max_length=255, blank=True)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    stage = models.CharField(max_length=20, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0)
+    message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'finalize_jobs'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['period'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='one_active_finalize_job_per_period'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Finalize {self.period_id} ({self.status})"
@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.shifts.models import ShiftRequest
+from apps.coverage.models import CriticalTimeCoverage
+from .cache import invalidate_calendar_dates, invalidate_period_shift_counts
+
+
+@receiver(post_save, sender=ShiftRequest)
+@receiver(post_delete, sender=ShiftRequest)
+def shift_changed(sender, instance, **kwargs):
+    """
+    Invalidate cached calendar responses for the shift's date.
+    Edits that move a shift also invalidate the date it moved from.
+    """
+    previous = getattr(instance, '_loaded_values', {})
+    dates = [instance.date, previous.get('date')]
+    transaction.on_commit(lambda: invalidate_calendar_dates(*dates))
+    
+    # Period shift counts change on create, delete or a move between periods
+    if kwargs.get('created', True) or previous.get('schedule_period_id') != instance.schedule_period_id:
+        period_ids = [instance.schedule_period_id, previous.get('schedule_period_id')]
+        transaction.on_commit(lambda: invalidate_period_shift_counts(*period_ids))
+
+
+@receiver(post_save, sender=CriticalTimeCoverage)
+@receiver(post_delete, sender=CriticalTimeCoverage)
+def coverage_changed(sender, instance, **kwargs):
+    """Invalidate cached calendar responses when a day's coverage changes"""
+    transaction.on_commit(lambda: invalidate_calendar_dates(instance.date))
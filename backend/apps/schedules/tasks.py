@@ -0,0 +1,164 @@
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+REJECT_CHUNK_SIZE = 500
+FINALIZED_REASON = 'Schedule period has been finalized'
+
+
+def get_coverage_warnings(period):
+    """
+    Warnings for every uncovered critical window in the period.
+    Reads the period's CriticalTimeCoverage rows in one query; window labels
+    come from the configured critical windows.
+    """
+    from apps.coverage.models import CriticalTimeCoverage
+    from apps.coverage.utils import get_critical_windows
+
+    # CriticalTimeCoverage tracks the windows named morning and evening; skip any not configured
+    labels = {
+        name: f"{name.title()} ({start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')})"
+        for name, start_time, end_time in get_critical_windows()
+        if name in ('morning', 'evening')
+    }
+    if not labels:
+        return []
+
+    coverage_map = {
+        coverage.date: coverage
+        for coverage in CriticalTimeCoverage.objects.filter(
+            date__gte=period.start_date,
+            date__lte=period.end_date
+        )
+    }
+
+    coverage_warnings = []
+    current_date = period.start_date
+
+    while current_date <= period.end_date:
+        coverage = coverage_map.get(current_date)
+        if coverage is None:
+            coverage_warnings.append(f"{current_date.strftime('%b %d')}: No coverage at all")
+        else:
+            for name, label in labels.items():
+                if not getattr(coverage, f'{name}_covered'):
+                    coverage_warnings.append(f"{current_date.strftime('%b %d')}: {label} not covered")
+
+        current_date += timedelta(days=1)
+
+    return coverage_warnings
+
+
+@shared_task
+def finalize_period(period_id, job_id):
+    """
+    Finalize a schedule period in the background.
+
+    Marks the period FINALIZED, rejects its pending requests in chunks, emails
+    each affected PA once and reports progress to the schedule_{period_id}
+    WebSocket group. Safe to re-run: each step only acts on what is left.
+    """
+    from apps.shifts.models import ShiftRequest
+    from apps.shifts.tasks import send_requests_closed_email
+    from apps.changes.recorder import entries_for_status, record_changes
+    from .models import FinalizeJob, SchedulePeriod
+    from .serializers import SchedulePeriodSerializer
+    from .cache import invalidate_calendar_range
+    from .finalize import ACTIVE_STATUSES, update_finalize_job
+    from .websocket_utils import broadcast_period_finalized
+
+    if not FinalizeJob.objects.filter(job_id=job_id, status__in=ACTIVE_STATUSES).exists():
+        # Replaced as stalled while it sat in the queue; the newer job does the work
+        logger.info(f'Finalize job {job_id} for period {period_id} is no longer active, skipping')
+        return None
+
+    try:
+        period = SchedulePeriod.objects.get(id=period_id)
+
+        update_finalize_job(job_id, status='running', stage='coverage', progress=5, message='Checking coverage')
+        coverage_warnings = get_coverage_warnings(period)
+
+        SchedulePeriod.objects.filter(id=period_id).exclude(status='FINALIZED').update(
+            status='FINALIZED',
+            updated_at=timezone.now()
+        )
+        period.refresh_from_db()
+
+        pending = ShiftRequest.objects.filter(schedule_period_id=period_id, status='PENDING')
+        total_pending = pending.count()
+        update_finalize_job(
+            job_id, stage='rejecting', progress=10,
+            message=f'Rejecting {total_pending} pending requests'
+        )
+
+        rejected_by_pa = {}
+        rejected_count = 0
+        while True:
+            with transaction.atomic():
+                chunk = list(
+                    pending.select_for_update()
+                    .order_by('id')
+                    .values_list('id', 'requested_by_id')[:REJECT_CHUNK_SIZE]
+                )
+                if not chunk:
+                    break
+
+                ShiftRequest.objects.filter(id__in=[shift_id for shift_id, _ in chunk]).update(
+                    status='REJECTED',
+                    rejected_reason=FINALIZED_REASON,
+                    updated_at=timezone.now()
+                )
+                record_changes(entries_for_status(
+                    'shift', [shift_id for shift_id, _ in chunk], 'PENDING', 'REJECTED'
+                ))
+
+            for shift_id, pa_id in chunk:
+                rejected_by_pa.setdefault(pa_id, []).append(shift_id)
+            rejected_count += len(chunk)
+
+            update_finalize_job(
+                job_id,
+                progress=10 + int(80 * rejected_count / max(total_pending, 1)),
+                message=f'Rejected {rejected_count} of {total_pending} pending requests'
+            )
+
+        # queryset.update() skips the post_save hooks that invalidate the calendar cache
+        invalidate_calendar_range(period.start_date, period.end_date + timedelta(days=1))
+
+        update_finalize_job(job_id, stage='notifying', progress=95, message='Notifying PAs')
+        for pa_id, shift_ids in rejected_by_pa.items():
+            send_requests_closed_email.delay(pa_id, shift_ids)
+
+        broadcast_period_finalized(period, message=f'{period.name} has been finalized')
+
+        result = {
+            'message': f'Schedule period "{period.name}" finalized successfully.',
+            'period': SchedulePeriodSerializer(period).data,
+            'rejected_requests': rejected_count,
+            'notified_pas': len(rejected_by_pa),
+        }
+        if coverage_warnings:
+            result['coverage_warnings'] = coverage_warnings
+            result['warning_count'] = len(coverage_warnings)
+        else:
+            result['coverage_status'] = 'All critical times covered! ✅'
+
+        update_finalize_job(
+            job_id, status='completed', stage='done', progress=100,
+            message=result['message'], result=result,
+            finished_at=timezone.now()
+        )
+        logger.info(f'Finalized period {period_id}: rejected {rejected_count} pending requests')
+        return result
+
+    except Exception as e:
+        logger.error(f'Finalize job {job_id} for period {period_id} failed: {e}')
+        update_finalize_job(
+            job_id, status='failed', stage='failed', message='Finalization failed',
+            error=str(e), finished_at=timezone.now()
+        )
+        raise
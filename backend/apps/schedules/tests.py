@@ -1,3 +1,74 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from datetime import date, time, timedelta
+from rest_framework.test import APIClient
+from apps.users.models import User
+from apps.schedules.models import SchedulePeriod
+from apps.shifts.models import ShiftRequest
+from apps.coverage.utils import rebuild_coverage
 
-# Create your tests here.
+
+class MonthViewQueryCountTests(TestCase):
+    """The month view runs a fixed number of queries however many shifts and PAs a month has"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(email='admin@example.com', role='ADMIN', first_name='Month', last_name='Admin')
+        pas = User.objects.bulk_create([
+            # bulk_create skips User.save(), which normally fills in the username
+            User(username=f'pa{n}', email=f'pa{n}@example.com', role='PA', first_name='Month', last_name=f'PA {n}')
+            for n in range(12)
+        ])
+        period = SchedulePeriod.objects.create(
+            name='Query count', start_date=date(2031, 1, 1), end_date=date(2031, 4, 30), created_by=cls.admin
+        )
+
+        # January 2031: no shifts; February: one PA, a shift a week; March: twelve PAs, three shifts a day
+        shifts = []
+        for day in (date(2031, 2, 3) + timedelta(weeks=n) for n in range(4)):
+            shifts.append((pas[0], day, time(6), time(10), 'APPROVED'))
+        for offset in range(31):
+            day = date(2031, 3, 1) + timedelta(days=offset)
+            for n, (start_hour, end_hour) in enumerate([(6, 14), (14, 22), (22, 6)]):
+                shifts.append((pas[(offset * 3 + n) % len(pas)], day, time(start_hour), time(end_hour), 'APPROVED'))
+            shifts.append((pas[offset % len(pas)], day, time(9), time(12), 'PENDING'))
+
+        rows = []
+        for pa, day, start_time, end_time, status in shifts:
+            shift = ShiftRequest(
+                schedule_period=period, requested_by=pa, date=day,
+                start_time=start_time, end_time=end_time, status=status
+            )
+            shift.update_duration()
+            shift.update_span()
+            rows.append(shift)
+        ShiftRequest.objects.bulk_create(rows)
+        rebuild_coverage(date(2031, 1, 1), date(2031, 4, 30))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        # Warm per-process lookups (critical windows) outside the counted requests
+        cache.clear()
+        self.client.get('/api/calendar/month/2031/4/')
+
+    def month_queries(self, month, **params):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/calendar/month/2031/{month}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_shifts(self):
+        for params in [{}, {'format': 'compact'}]:
+            with self.subTest(**params):
+                empty, baseline = self.month_queries(1, **params)
+                self.assertEqual(empty.data['total_shifts'], 0)
+
+                for month in [2, 3]:
+                    cache.clear()
+                    with self.assertNumQueries(baseline):
+                        response = self.client.get(f'/api/calendar/month/2031/{month}/', params)
+                    self.assertGreater(response.data['total_shifts'], 0)
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import SchedulePeriodViewSet, MonthViewAPI, WeekViewAPI, DayViewAPI
+from .views import SchedulePeriodViewSet, MonthViewAPI, WeekViewAPI, DayViewAPI, RangeViewAPI, CoverageGapsAPI, CalendarCacheStatsAPI
 
 router = DefaultRouter()
 router.register(r'', SchedulePeriodViewSet, basename='schedule-period')
@@ -11,4 +11,7 @@ urlpatterns = [
     path('calendar/month/<int:year>/<int:month>/', MonthViewAPI.as_view(), name='calendar-month'),
     path('calendar/week/<int:year>/<int:week>/', WeekViewAPI.as_view(), name='calendar-week'),
     path('calendar/day/<str:date>/', DayViewAPI.as_view(), name='calendar-day'),
+    path('calendar/range/', RangeViewAPI.as_view(), name='calendar-range'),
+    path('calendar/gaps/', CoverageGapsAPI.as_view(), name='calendar-gaps'),
+    path('calendar/cache-stats/', CalendarCacheStatsAPI.as_view(), name='calendar-cache-stats'),
 ]
@@ -1,49 +1,11 @@
 from datetime import datetime, timedelta, time
 from calendar import monthrange
+from django.utils import timezone
 from apps.shifts.models import ShiftRequest
 from apps.coverage.models import CriticalTimeCoverage
+from apps.coverage.utils import get_critical_windows
 
-
-def check_shift_conflicts(schedule_period, date, start_time, end_time, exclude_request_id=None):
-    """
-    Check if requested time conflicts with any APPROVED shift.
-    Only APPROVED shifts block new requests (PENDING doesn't block).
-    
-    Args:
-        schedule_period: SchedulePeriod instance
-        date: datetime.date
-        start_time: datetime.time
-        end_time: datetime.time
-        exclude_request_id: Optional request ID to exclude from conflict check
-    
-    Returns:
-        bool: True if there are conflicts, False otherwise
-    """
-    conflicts = ShiftRequest.objects.filter(
-        date=date,
-        status='APPROVED'
-    )
-    
-    if exclude_request_id:
-        conflicts = conflicts.exclude(id=exclude_request_id)
-    
-    requested_start = datetime.combine(date, start_time)
-    requested_end = datetime.combine(date, end_time)
-    
-    if requested_end <= requested_start:
-        requested_end += timedelta(days=1)
-    
-    for shift in conflicts:
-        shift_start = datetime.combine(shift.date, shift.start_time)
-        shift_end = datetime.combine(shift.date, shift.end_time)
-        
-        if shift_end <= shift_start:
-            shift_end += timedelta(days=1)
-        
-        if requested_start < shift_end and requested_end > shift_start:
-            return True
-    
-    return False
+MINUTES_PER_DAY = 24 * 60
 
 
 def get_coverage_for_date(date):
@@ -95,6 +57,224 @@ def get_coverage_for_date(date):
         }
 
 
+def get_coverage_map(start_date, end_date):
+    """
+    Load CriticalTimeCoverage rows for a date range in a single query.
+    Returns dict keyed by date; dates without a row are simply absent.
+    """
+    return {
+        coverage.date: coverage
+        for coverage in CriticalTimeCoverage.objects.filter(
+            date__gte=start_date,
+            date__lte=end_date
+        )
+    }
+
+
+def serialize_day_coverage(coverage):
+    """
+    Calendar coverage dict for a CriticalTimeCoverage row.
+    Accepts None for dates that have no coverage row yet.
+    """
+    if coverage is None:
+        return {
+            'morning_covered': False,
+            'evening_covered': False,
+            'status': 'none'
+        }
+    
+    if coverage.morning_covered and coverage.evening_covered:
+        coverage_status = 'full'
+    elif coverage.morning_covered or coverage.evening_covered:
+        coverage_status = 'partial'
+    else:
+        coverage_status = 'none'
+    
+    return {
+        'morning_covered': coverage.morning_covered,
+        'evening_covered': coverage.evening_covered,
+        'status': coverage_status
+    }
+
+
+def group_shifts_by_date(shifts):
+    """Index an iterable of shifts into a dict of date -> list of shifts (order preserved)"""
+    shifts_by_date = {}
+    for shift in shifts:
+        shifts_by_date.setdefault(shift.date, []).append(shift)
+    return shifts_by_date
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def build_day_timeline(shifts, carryover_shifts=(), resolution=60, windows=None):
+    """
+    Build a day's timeline with a single sweep over shift boundaries.
+    
+    Args:
+        shifts: shifts dated on the day
+        carryover_shifts: overnight shifts from the previous day (they cover the early hours)
+        resolution: slot length in minutes (15, 30 or 60)
+        windows: critical windows as (name, start, end); loaded from CriticalWindow if omitted
+    
+    Returns:
+        list of slot dicts; each slot references the shifts covering it by id
+    """
+    slot_count = MINUTES_PER_DAY // resolution
+    
+    # (slot index, order, shift id): order 0 removes before 1 adds at the same slot
+    events = []
+    for shift in shifts:
+        start = _minutes(shift.start_time)
+        end = _minutes(shift.end_time)
+        if end < start:
+            end = MINUTES_PER_DAY  # continues past midnight into the next day
+        if end > start:
+            events.append((start // resolution, 1, shift.id))
+            events.append(((end - 1) // resolution + 1, 0, shift.id))
+    
+    for shift in carryover_shifts:
+        end = _minutes(shift.end_time)
+        if end > 0:
+            events.append((0, 1, shift.id))
+            events.append(((end - 1) // resolution + 1, 0, shift.id))
+    
+    events.sort()
+    
+    if windows is None:
+        windows = get_critical_windows()
+    
+    # Windows that run past midnight recur daily, so split them across the day
+    critical_ranges = []
+    for _, window_start, window_end in windows:
+        start, end = _minutes(window_start), _minutes(window_end)
+        if end > start:
+            critical_ranges.append((start, end))
+        else:
+            critical_ranges.extend([(start, MINUTES_PER_DAY), (0, end)])
+    
+    timeline = []
+    active = {}
+    event_index = 0
+    for slot in range(slot_count):
+        while event_index < len(events) and events[event_index][0] == slot:
+            _, is_start, shift_id = events[event_index]
+            if is_start:
+                active[shift_id] = True
+            else:
+                active.pop(shift_id, None)
+            event_index += 1
+        
+        slot_start = slot * resolution
+        slot_end = slot_start + resolution
+        hour, minute = divmod(slot_start, 60)
+        
+        timeline.append({
+            'hour': hour,
+            'minute': minute,
+            'hour_label': f'{hour:02d}:{minute:02d}',
+            'shift_ids': list(active),
+            'is_critical_time': any(
+                slot_start < window_end and slot_end > window_start
+                for window_start, window_end in critical_ranges
+            )
+        })
+    
+    return timeline
+
+
+GAP_SORT_KEYS = {
+    'start': lambda gap: gap['start'],
+    'length': lambda gap: (-gap['duration_minutes'], gap['start']),
+    'critical': lambda gap: (-gap['critical_minutes'], -gap['duration_minutes'], gap['start']),
+}
+
+
+def _critical_overlap(gap_start, gap_end, windows):
+    """Critical windows intersecting an uncovered span, with minutes uncovered in each"""
+    from apps.shifts.conflicts import shift_span
+    
+    overlaps = []
+    # Start a day early for windows that run past midnight into the gap
+    day = gap_start.date() - timedelta(days=1)
+    while day <= gap_end.date():
+        for name, window_start, window_end in windows:
+            window_starts_at, window_ends_at = shift_span(day, window_start, window_end)
+            overlap = min(gap_end, window_ends_at) - max(gap_start, window_starts_at)
+            if overlap > timedelta(0):
+                overlaps.append({
+                    'name': name,
+                    'date': str(day),
+                    'minutes': int(overlap.total_seconds() // 60)
+                })
+        day += timedelta(days=1)
+    return overlaps
+
+
+def find_coverage_gaps(start_date, end_date, sort='length', min_minutes=0):
+    """
+    Find every stretch with no approved shift between the start of start_date
+    and the end of end_date.
+    
+    Approved spans come from one range query ordered by start and are merged in
+    a single sweep, so gaps that cross midnight come out as one gap and the cost
+    is O(n log n) in the shifts rather than a query per day.
+    
+    Args:
+        start_date, end_date: inclusive date range
+        sort: 'length' (longest first), 'critical' (most critical-window minutes first) or 'start'
+        min_minutes: leave out gaps shorter than this
+    
+    Returns:
+        list of gap dicts
+    """
+    from apps.shifts.conflicts import shift_span
+    
+    range_start, _ = shift_span(start_date, time(0, 0), time(0, 0))
+    range_end, _ = shift_span(end_date + timedelta(days=1), time(0, 0), time(0, 0))
+    
+    spans = ShiftRequest.objects.filter(
+        status='APPROVED',
+        starts_at__lt=range_end,
+        ends_at__gt=range_start
+    ).order_by('starts_at').values_list('starts_at', 'ends_at')
+    
+    uncovered = []
+    covered_until = range_start
+    for starts_at, ends_at in spans:
+        if starts_at > covered_until:
+            uncovered.append((covered_until, starts_at))
+        covered_until = max(covered_until, ends_at)
+    if covered_until < range_end:
+        uncovered.append((covered_until, range_end))
+    
+    tz = timezone.get_default_timezone()
+    windows = get_critical_windows()
+    gaps = []
+    for gap_start, gap_end in uncovered:
+        duration_minutes = int((gap_end - gap_start).total_seconds() // 60)
+        if duration_minutes < min_minutes:
+            continue
+        
+        gap_start = gap_start.astimezone(tz)
+        gap_end = gap_end.astimezone(tz)
+        critical_windows = _critical_overlap(gap_start, gap_end, windows)
+        gaps.append({
+            'start': gap_start,
+            'end': gap_end,
+            'date': str(gap_start.date()),
+            'crosses_midnight': (gap_end - timedelta(microseconds=1)).date() > gap_start.date(),
+            'duration_minutes': duration_minutes,
+            'critical_minutes': sum(window['minutes'] for window in critical_windows),
+            'critical_windows': critical_windows
+        })
+    
+    gaps.sort(key=GAP_SORT_KEYS[sort])
+    return gaps
+
+
 def get_shifts_for_date(date):
     """Get all approved shifts for a specific date"""
     return ShiftRequest.objects.filter(
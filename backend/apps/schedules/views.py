@@ -2,11 +2,41 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.settings import api_settings
 from django.shortcuts import get_object_or_404
-from django.db.models import Sum, Q
+from django.utils import timezone
+from django.db.models import Sum, Q, F
+from django.http import StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from asgiref.sync import sync_to_async
 from datetime import datetime, timedelta
 from calendar import monthrange
+from itertools import groupby, islice
+from operator import attrgetter
+import json
 from .models import SchedulePeriod
+from .compact import CompactCalendarRenderer, encode_compact_calendar
+from .finalize import get_finalize_job, start_finalize_job, update_finalize_job
+from .tasks import finalize_period
+from .utils import (
+    get_coverage_map,
+    serialize_day_coverage,
+    group_shifts_by_date,
+    build_day_timeline,
+    find_coverage_gaps,
+    GAP_SORT_KEYS
+)
+from .cache import (
+    calendar_cache_key,
+    get_cached_calendar,
+    set_cached_calendar,
+    get_calendar_cache_stats,
+    calendar_etag,
+    period_list_etag,
+    get_not_modified_response,
+    with_etag
+)
 from apps.shifts.models import ShiftRequest
 from apps.coverage.models import CriticalTimeCoverage
 from .serializers import (
@@ -36,6 +66,7 @@ class SchedulePeriodViewSet(viewsets.ModelViewSet):
     Update: PUT/PATCH /api/schedule-periods/{id}/ (admin only)
     Delete: DELETE /api/schedule-periods/{id}/ (admin only)
     Finalize: POST /api/schedule-periods/{id}/finalize/ (admin only)
+    Finalize status: GET /api/schedule-periods/{id}/finalize/status/ (admin only)
     """
     queryset = SchedulePeriod.objects.all().order_by('-start_date')
     
@@ -49,10 +80,22 @@ class SchedulePeriodViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         """Admin only for create/update/delete"""
-        if self.action in ['create', 'update', 'partial_update', 'destroy', 'finalize']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'finalize', 'finalize_status']:
             return [IsAdminUser()]
         return [permissions.IsAuthenticated()]
     
+    def list(self, request, *args, **kwargs):
+        """List periods, answering 304 when nothing changed since the client's copy"""
+        etag = period_list_etag(
+            request.META.get('QUERY_STRING', ''),
+            self.filter_queryset(self.get_queryset())
+        )
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        return with_etag(super().list(request, *args, **kwargs), etag)
+    
     def perform_create(self, serializer):
         """Set created_by to current user"""
         serializer.save(created_by=self.request.user)
@@ -62,66 +105,68 @@ class SchedulePeriodViewSet(viewsets.ModelViewSet):
         """
         Finalize a schedule period (admin only)
         Shows coverage warnings but does NOT block finalization.
+        
+        Runs as a background job: responds 202 with the job state, streams
+        progress to the schedule_{id} WebSocket group and keeps the result at
+        GET /api/schedule-periods/{id}/finalize/status/.
+        
+        Send an Idempotency-Key header to make retries safe: a repeat with the
+        same key returns the existing job instead of an error or a second job.
+        
+        The period is marked FINALIZED before its pending requests are
+        rejected, so a job that failed or stalled part-way can be re-run
+        while pending requests remain.
         """
         period = self.get_object()
+        idempotency_key = request.headers.get('Idempotency-Key', '')
+        
+        if idempotency_key:
+            job = get_finalize_job(period.id, idempotency_key)
+            if job is not None:
+                return self._finalize_job_response(job)
         
-        if period.status == 'FINALIZED':
+        unfinished = ShiftRequest.objects.filter(schedule_period=period, status='PENDING').exists()
+        if period.status == 'FINALIZED' and not unfinished:
             return Response(
                 {'error': 'This period is already finalized.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        from apps.coverage.models import CriticalTimeCoverage
-        from datetime import timedelta
-        
-        coverage_warnings = []
-        current_date = period.start_date
-        
-        while current_date <= period.end_date:
+        job, created = start_finalize_job(period, request.user, idempotency_key)
+        if created:
             try:
-                coverage = CriticalTimeCoverage.objects.get(date=current_date)
-                if not coverage.morning_covered:
-                    coverage_warnings.append(f"{current_date.strftime('%b %d')}: Morning (6-9 AM) not covered")
-                if not coverage.evening_covered:
-                    coverage_warnings.append(f"{current_date.strftime('%b %d')}: Evening (9-10 PM) not covered")
-            except CriticalTimeCoverage.DoesNotExist:
-                coverage_warnings.append(f"{current_date.strftime('%b %d')}: No coverage at all")
-            
-            current_date += timedelta(days=1)
-        
-        period.status = 'FINALIZED'
-        period.save()
-        
-        from apps.shifts.models import ShiftRequest
-        pending = ShiftRequest.objects.filter(
-            schedule_period=period,
-            status='PENDING'
-        )
-        rejected_count = pending.count()
-        pending.update(
-            status='REJECTED',
-            rejected_reason='Schedule period has been finalized'
-        )
-        
-        from apps.users.models import User
-        pa_emails = list(User.objects.filter(role='PA', is_active=True).values_list('email', flat=True))
-        
-        from apps.schedules.websocket_utils import broadcast_period_finalized
-        broadcast_period_finalized(period, message=f'{period.name} has been finalized')
+                finalize_period.delay(period.id, job['job_id'])
+            except Exception as e:
+                # Release the job so the admin can retry once the queue is back
+                update_finalize_job(
+                    job['job_id'], broadcast=False, status='failed', stage='failed',
+                    error=str(e), finished_at=timezone.now()
+                )
+                return Response(
+                    {'error': 'Could not start finalization. Please try again.'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            job = get_finalize_job(period.id) or job
         
-        response_data = {
-            'message': f'Schedule period "{period.name}" finalized successfully.',
-            'period': SchedulePeriodSerializer(period).data,
-            'rejected_requests': rejected_count,
-        }
+        return self._finalize_job_response(job)
+    
+    @action(detail=True, methods=['get'], url_path='finalize/status')
+    def finalize_status(self, request, pk=None):
+        """Progress and result of the period's finalize job"""
+        period = self.get_object()
+        job = get_finalize_job(period.id)
         
-        if coverage_warnings:
-            response_data['coverage_warnings'] = coverage_warnings
-            response_data['warning_count'] = len(coverage_warnings)
-        else:
-            response_data['coverage_status'] = 'All critical times covered! ✅'
+        if job is None:
+            return Response(
+                {'error': 'No finalize job for this period.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        return Response(response_data, status=status.HTTP_200_OK)
+        return self._finalize_job_response(job)
+    
+    def _finalize_job_response(self, job):
+        response_status = status.HTTP_200_OK if job['status'] in ['completed', 'failed'] else status.HTTP_202_ACCEPTED
+        return Response(job, status=response_status)
 
 
 class MonthViewAPI(APIView):
@@ -130,11 +175,17 @@ class MonthViewAPI(APIView):
     Returns approved AND pending shifts for a given month in calendar format
     Weeks start on Sunday
     
+    Shifts and coverage for the whole grid (including the leading/trailing
+    days of neighbouring months) are loaded with one query each, so the
+    query count stays constant regardless of the month or number of shifts.
+    
     Query params:
     - pa_id: Filter by specific PA
     - status: Filter by status (APPROVED, PENDING, etc.) - defaults to both APPROVED and PENDING
+    - format=compact: Columnar payload (see apps/schedules/compact.py)
     """
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [CompactCalendarRenderer]
     
     def get(self, request, year, month):
         """Get month view data with both approved and pending shifts"""
@@ -151,18 +202,23 @@ class MonthViewAPI(APIView):
             first_day = datetime(year, month, 1).date()
             last_day = datetime(year, month, monthrange(year, month)[1]).date()
             
+            # Go back to Sunday (weekday 6 in Python, where Monday=0)
+            grid_start = first_day - timedelta(days=(first_day.weekday() + 1) % 7)
+            week_count = min(6, ((last_day - grid_start).days // 7) + 1)
+            grid_end = grid_start + timedelta(days=week_count * 7 - 1)
+            
             status_filter = request.query_params.get('status')
             
             if status_filter:
                 shifts = ShiftRequest.objects.filter(
-                    date__gte=first_day,
-                    date__lte=last_day,
+                    date__gte=grid_start,
+                    date__lte=grid_end,
                     status=status_filter.upper()
                 )
             else:
                 shifts = ShiftRequest.objects.filter(
-                    date__gte=first_day,
-                    date__lte=last_day,
+                    date__gte=grid_start,
+                    date__lte=grid_end,
                     status__in=['APPROVED', 'PENDING']
                 )
             
@@ -179,62 +235,75 @@ class MonthViewAPI(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
             
-            weeks = []
-            current_date = first_day
+            compact = request.accepted_renderer.format == 'compact'
             
-            # Go back to Sunday (weekday 6 in Python, where Monday=0)
-            while current_date.weekday() != 6:
-                current_date -= timedelta(days=1)
+            etag = calendar_etag('month', grid_start, grid_end, status_filter, pa_id, compact=compact)
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+            
+            cache_key = calendar_cache_key('month', grid_start, grid_end, status_filter, pa_id, compact=compact)
+            cached = get_cached_calendar(cache_key)
+            if cached is not None:
+                return with_etag(Response(cached), etag)
+            
+            shifts_by_date = group_shifts_by_date(shifts)
+            coverage_map = get_coverage_map(grid_start, grid_end)
             
-            week_number = 1
-            while current_date <= last_day or current_date.month == month:
-                week_start = current_date
-                week_end = current_date + timedelta(days=6)
+            total_shifts = sum(
+                len(day_shifts) for day_date, day_shifts in shifts_by_date.items()
+                if first_day <= day_date <= last_day
+            )
+            
+            if compact:
+                response_data = encode_compact_calendar(grid_start, grid_end, shifts, coverage_map)
+                response_data.update({
+                    'year': year,
+                    'month': month,
+                    'month_name': first_day.strftime('%B %Y'),
+                    'total_shifts': total_shifts,
+                    'coverage_stats': self._get_month_coverage_stats(first_day, last_day, coverage_map)
+                })
+                set_cached_calendar(cache_key, response_data)
+                return with_etag(Response(response_data), etag)
+            
+            weeks = []
+            for week_index in range(week_count):
+                week_start = grid_start + timedelta(weeks=week_index)
+                week_end = week_start + timedelta(days=6)
                 
                 days = []
                 for day_offset in range(7):
                     day_date = week_start + timedelta(days=day_offset)
-                    
-                    day_shifts = [s for s in shifts if s.date == day_date]
-                    
-                    coverage = self._get_day_coverage(day_date)
-                    
-                    total_hours = sum(s.duration_hours for s in day_shifts)
+                    day_shifts = shifts_by_date.get(day_date, [])
                     
                     days.append({
                         'date': day_date.isoformat(),
                         'day_name': day_date.strftime('%A'),
                         'shifts': CalendarShiftSerializer(day_shifts, many=True).data,
-                        'coverage': coverage,
-                        'total_hours': float(total_hours),
+                        'coverage': serialize_day_coverage(coverage_map.get(day_date)),
+                        'total_hours': float(sum(s.duration_hours for s in day_shifts)),
                         'is_current_month': day_date.month == month
                     })
                 
                 weeks.append({
                     'week_start': week_start.isoformat(),
                     'week_end': week_end.isoformat(),
-                    'week_number': week_number,
+                    'week_number': week_index + 1,
                     'days': days
                 })
-                
-                current_date = week_end + timedelta(days=1)
-                week_number += 1
-                
-                if week_number > 6:
-                    break
-            
-            coverage_stats = self._get_month_coverage_stats(first_day, last_day)
             
             response_data = {
                 'year': year,
                 'month': month,
                 'month_name': first_day.strftime('%B %Y'),
                 'weeks': weeks,
-                'total_shifts': shifts.count(),
-                'coverage_stats': coverage_stats
+                'total_shifts': total_shifts,
+                'coverage_stats': self._get_month_coverage_stats(first_day, last_day, coverage_map)
             }
             
-            return Response(response_data)
+            set_cached_calendar(cache_key, response_data)
+            return with_etag(Response(response_data), etag)
             
         except ValueError:
             return Response(
@@ -242,42 +311,16 @@ class MonthViewAPI(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
-    def _get_day_coverage(self, date):
-        """Get coverage status for a specific day"""
-        try:
-            coverage = CriticalTimeCoverage.objects.get(date=date)
-            
-            # Calculate status based on coverage
-            if coverage.morning_covered and coverage.evening_covered:
-                coverage_status = 'full'
-            elif coverage.morning_covered or coverage.evening_covered:
-                coverage_status = 'partial'
-            else:
-                coverage_status = 'none'
-            
-            return {
-                'morning_covered': coverage.morning_covered,
-                'evening_covered': coverage.evening_covered,
-                'status': coverage_status
-            }
-        except CriticalTimeCoverage.DoesNotExist:
-            return {
-                'morning_covered': False,
-                'evening_covered': False,
-                'status': 'none'
-            }
-    
-    def _get_month_coverage_stats(self, start_date, end_date):
-        """Calculate coverage statistics for the month"""
+    def _get_month_coverage_stats(self, start_date, end_date, coverage_map):
+        """Calculate coverage statistics for the month from the preloaded coverage rows"""
         total_days = (end_date - start_date).days + 1
         
         # Count days where either morning OR evening is covered
-        covered_days = CriticalTimeCoverage.objects.filter(
-            date__gte=start_date,
-            date__lte=end_date
-        ).filter(
-            Q(morning_covered=True) | Q(evening_covered=True)
-        ).count()
+        covered_days = sum(
+            1 for day_date, coverage in coverage_map.items()
+            if start_date <= day_date <= end_date
+            and (coverage.morning_covered or coverage.evening_covered)
+        )
         
         return {
             'total_days': total_days,
@@ -294,8 +337,10 @@ class WeekViewAPI(APIView):
     Query params:
     - pa_id: Filter by specific PA
     - status: Filter by status (APPROVED, PENDING, etc.) - defaults to both APPROVED and PENDING
+    - format=compact: Columnar payload (see apps/schedules/compact.py)
     """
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [CompactCalendarRenderer]
     
     def get(self, request, year, week):
         """Get week view data with both approved and pending shifts"""
@@ -345,22 +390,42 @@ class WeekViewAPI(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
             
+            compact = request.accepted_renderer.format == 'compact'
+            
+            etag = calendar_etag('week', week_start, week_end, status_filter, pa_id, compact=compact)
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+            
+            cache_key = calendar_cache_key('week', week_start, week_end, status_filter, pa_id, compact=compact)
+            cached = get_cached_calendar(cache_key)
+            if cached is not None:
+                return with_etag(Response(cached), etag)
+            
+            shifts_by_date = group_shifts_by_date(shifts)
+            coverage_map = get_coverage_map(week_start, week_end)
+            
+            if compact:
+                response_data = encode_compact_calendar(week_start, week_end, shifts, coverage_map)
+                response_data.update({
+                    'week_number': week,
+                    'year': year,
+                    'total_shifts': sum(len(day_shifts) for day_shifts in shifts_by_date.values())
+                })
+                set_cached_calendar(cache_key, response_data)
+                return with_etag(Response(response_data), etag)
+            
             days = []
             for day_offset in range(7):
                 day_date = week_start + timedelta(days=day_offset)
-                
-                day_shifts = [s for s in shifts if s.date == day_date]
-                
-                coverage = self._get_day_coverage(day_date)
-                
-                total_hours = sum(s.duration_hours for s in day_shifts)
+                day_shifts = shifts_by_date.get(day_date, [])
                 
                 days.append({
                     'date': day_date.isoformat(),
                     'day_name': day_date.strftime('%A'),
                     'shifts': CalendarShiftSerializer(day_shifts, many=True).data,
-                    'coverage': coverage,
-                    'total_hours': float(total_hours)
+                    'coverage': serialize_day_coverage(coverage_map.get(day_date)),
+                    'total_hours': float(sum(s.duration_hours for s in day_shifts))
                 })
             
             response_data = {
@@ -369,70 +434,59 @@ class WeekViewAPI(APIView):
                 'week_number': week,
                 'year': year,
                 'days': days,
-                'total_shifts': shifts.count()
+                'total_shifts': sum(len(day_shifts) for day_shifts in shifts_by_date.values())
             }
             
-            return Response(response_data)
+            set_cached_calendar(cache_key, response_data)
+            return with_etag(Response(response_data), etag)
             
         except ValueError:
             return Response(
                 {'error': 'Invalid year or week'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-    
-    def _get_day_coverage(self, date):
-        """Get coverage status for a specific day"""
-        try:
-            coverage = CriticalTimeCoverage.objects.get(date=date)
-            
-            # Calculate status based on coverage
-            if coverage.morning_covered and coverage.evening_covered:
-                coverage_status = 'full'
-            elif coverage.morning_covered or coverage.evening_covered:
-                coverage_status = 'partial'
-            else:
-                coverage_status = 'none'
-            
-            return {
-                'morning_covered': coverage.morning_covered,
-                'evening_covered': coverage.evening_covered,
-                'status': coverage_status
-            }
-        except CriticalTimeCoverage.DoesNotExist:
-            return {
-                'morning_covered': False,
-                'evening_covered': False,
-                'status': 'none'
-            }
 
 
 class DayViewAPI(APIView):
     """
     GET /api/calendar/day/{date}/
-    Returns approved AND pending shifts for a specific day with hourly breakdown
+    Returns approved AND pending shifts for a specific day with a timeline breakdown
     Date format: YYYY-MM-DD
     
+    Each shift is serialized once; timeline slots reference shifts by id.
+    Overnight shifts from the previous day are returned in carryover_shifts
+    and appear in the early-morning slots.
+    
     Query params:
     - pa_id: Filter by specific PA
     - status: Filter by status (APPROVED, PENDING, etc.) - defaults to both APPROVED and PENDING
+    - resolution: Timeline slot length in minutes (15, 30 or 60) - defaults to 60
+    - format=compact: Columnar payload without the timeline (see apps/schedules/compact.py)
     """
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [CompactCalendarRenderer]
+    
+    TIMELINE_RESOLUTIONS = (15, 30, 60)
     
     def get(self, request, date):
         """Get day view data with both approved and pending shifts"""
         try:
             day_date = datetime.strptime(date, '%Y-%m-%d').date()
+            previous_day = day_date - timedelta(days=1)
             
             status_filter = request.query_params.get('status')
             
+            # Shifts on the day, plus previous-day shifts that run past midnight
+            day_filter = Q(date=day_date) | Q(date=previous_day, end_time__lt=F('start_time'))
+            
             if status_filter:
                 shifts = ShiftRequest.objects.filter(
-                    date=day_date,
+                    day_filter,
                     status=status_filter.upper()
                 )
             else:
                 shifts = ShiftRequest.objects.filter(
-                    date=day_date,
+                    day_filter,
                     status__in=['APPROVED', 'PENDING']
                 )
             
@@ -450,62 +504,288 @@ class DayViewAPI(APIView):
                     )
             
             try:
-                coverage = CriticalTimeCoverage.objects.get(date=day_date)
-                
-                # Calculate status
-                if coverage.morning_covered and coverage.evening_covered:
-                    coverage_status = 'full'
-                elif coverage.morning_covered or coverage.evening_covered:
-                    coverage_status = 'partial'
+                resolution = int(request.query_params.get('resolution', 60))
+            except (ValueError, TypeError):
+                resolution = None
+            if resolution not in self.TIMELINE_RESOLUTIONS:
+                return Response(
+                    {'error': 'resolution must be one of 15, 30 or 60'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            compact = request.accepted_renderer.format == 'compact'
+            
+            etag = calendar_etag('day', previous_day, day_date, status_filter, pa_id, resolution=resolution, compact=compact)
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+            
+            cache_key = calendar_cache_key('day', previous_day, day_date, status_filter, pa_id, resolution=resolution, compact=compact)
+            cached = get_cached_calendar(cache_key)
+            if cached is not None:
+                return with_etag(Response(cached), etag)
+            
+            if compact:
+                # Carryover shifts come out with day offset 0 (the previous day)
+                response_data = encode_compact_calendar(
+                    previous_day, day_date, shifts, get_coverage_map(previous_day, day_date)
+                )
+                set_cached_calendar(cache_key, response_data)
+                return with_etag(Response(response_data), etag)
+            
+            day_shifts = []
+            carryover_shifts = []
+            for shift in shifts:
+                if shift.date == day_date:
+                    day_shifts.append(shift)
                 else:
-                    coverage_status = 'none'
-                
-                coverage_data = {
-                    'morning_covered': coverage.morning_covered,
-                    'evening_covered': coverage.evening_covered,
-                    'morning_shift': CalendarShiftSerializer(coverage.morning_shift).data if coverage.morning_shift else None,
-                    'evening_shift': CalendarShiftSerializer(coverage.evening_shift).data if coverage.evening_shift else None,
-                    'status': coverage_status
-                }
-            except CriticalTimeCoverage.DoesNotExist:
-                coverage_data = {
-                    'morning_covered': False,
-                    'evening_covered': False,
-                    'morning_shift': None,
-                    'evening_shift': None,
-                    'status': 'none'
-                }
-            
-            total_hours = sum(s.duration_hours for s in shifts)
-            
-            timeline = []
-            for hour in range(24):
-                hour_shifts = [
-                    s for s in shifts 
-                    if s.start_time.hour <= hour < s.end_time.hour or
-                    (s.start_time.hour > s.end_time.hour and (hour >= s.start_time.hour or hour < s.end_time.hour))
-                ]
-                
-                timeline.append({
-                    'hour': hour,
-                    'hour_label': f'{hour:02d}:00',
-                    'shifts': CalendarShiftSerializer(hour_shifts, many=True).data,
-                    'is_critical_time': (6 <= hour < 9) or (21 <= hour < 22)
-                })
+                    carryover_shifts.append(shift)
+            
+            shifts_data = CalendarShiftSerializer(day_shifts, many=True).data
+            carryover_data = CalendarShiftSerializer(carryover_shifts, many=True).data
+            serialized_by_id = {item['id']: item for item in list(shifts_data) + list(carryover_data)}
+            
+            coverage = CriticalTimeCoverage.objects.filter(date=day_date).first()
+            coverage_data = serialize_day_coverage(coverage)
+            coverage_data['morning_shift'] = None
+            coverage_data['evening_shift'] = None
+            
+            if coverage:
+                for slot_name in ('morning_shift', 'evening_shift'):
+                    shift_id = getattr(coverage, f'{slot_name}_id')
+                    if shift_id in serialized_by_id:
+                        coverage_data[slot_name] = serialized_by_id[shift_id]
+                    elif shift_id:
+                        coverage_data[slot_name] = CalendarShiftSerializer(getattr(coverage, slot_name)).data
             
             response_data = {
                 'date': day_date,
                 'day_name': day_date.strftime('%A, %B %d, %Y'),
-                'shifts': CalendarShiftSerializer(shifts, many=True).data,
+                'shifts': shifts_data,
+                'carryover_shifts': carryover_data,
                 'coverage': coverage_data,
-                'total_hours': total_hours,
-                'timeline': timeline
+                'total_hours': sum(s.duration_hours for s in day_shifts),
+                'resolution': resolution,
+                'timeline': build_day_timeline(day_shifts, carryover_shifts, resolution)
             }
             
-            return Response(response_data)
+            set_cached_calendar(cache_key, response_data)
+            return with_etag(Response(response_data), etag)
             
         except ValueError:
             return Response(
                 {'error': 'Invalid date format. Use YYYY-MM-DD'},
                 status=status.HTTP_400_BAD_REQUEST
-            )
\ No newline at end of file
+            )
+
+
+def _iterate_in_thread(iterator, batch_size=20):
+    """
+    Feed a synchronous iterator to an ASGI server batch by batch.
+    Django buffers sync iterators whole under ASGI; pulling batches through
+    sync_to_async keeps memory flat and keeps DB access on the sync thread.
+    """
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)), thread_sensitive=True)
+    
+    async def stream():
+        while True:
+            batch = await next_batch()
+            if not batch:
+                break
+            for part in batch:
+                yield part
+    
+    return stream()
+
+
+class RangeViewAPI(APIView):
+    """
+    GET /api/calendar/range/?start=YYYY-MM-DD&end=YYYY-MM-DD
+    Returns day records (shifts + coverage) for any span up to a year.
+    
+    Shifts and coverage are read with chunked iterators and merged by date,
+    and the JSON is streamed day by day, so memory stays flat for long ranges.
+    
+    Query params:
+    - start, end: Inclusive date range (required)
+    - pa_id: Filter by specific PA
+    - status: Filter by status (APPROVED, PENDING, etc.) - defaults to both APPROVED and PENDING
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    MAX_RANGE_DAYS = 366
+    CHUNK_SIZE = 500
+    
+    def get(self, request):
+        try:
+            start_date = datetime.strptime(request.query_params.get('start', ''), '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.query_params.get('end', ''), '%Y-%m-%d').date()
+        except ValueError:
+            return Response(
+                {'error': 'start and end are required. Use YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if end_date < start_date:
+            return Response(
+                {'error': 'end must be on or after start'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if (end_date - start_date).days + 1 > self.MAX_RANGE_DAYS:
+            return Response(
+                {'error': f'Range cannot exceed {self.MAX_RANGE_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        status_filter = request.query_params.get('status')
+        
+        if status_filter:
+            shifts = ShiftRequest.objects.filter(
+                date__gte=start_date,
+                date__lte=end_date,
+                status=status_filter.upper()
+            )
+        else:
+            shifts = ShiftRequest.objects.filter(
+                date__gte=start_date,
+                date__lte=end_date,
+                status__in=['APPROVED', 'PENDING']
+            )
+        
+        shifts = shifts.select_related('requested_by').order_by('date', 'start_time')
+        
+        pa_id = request.query_params.get('pa_id')
+        if pa_id:
+            try:
+                pa_id = int(pa_id)
+                shifts = shifts.filter(requested_by_id=pa_id)
+            except (ValueError, TypeError):
+                return Response(
+                    {'error': 'Invalid pa_id parameter'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        content = self._stream_json(start_date, end_date, shifts)
+        if isinstance(request._request, ASGIRequest):
+            content = _iterate_in_thread(content)
+        
+        return StreamingHttpResponse(content, content_type='application/json')
+    
+    def _stream_json(self, start_date, end_date, shifts):
+        """Yield the response JSON one day record at a time"""
+        shift_groups = groupby(shifts.iterator(chunk_size=self.CHUNK_SIZE), key=attrgetter('date'))
+        coverages = CriticalTimeCoverage.objects.filter(
+            date__gte=start_date,
+            date__lte=end_date
+        ).order_by('date').iterator(chunk_size=self.CHUNK_SIZE)
+        
+        next_group = next(shift_groups, None)
+        next_coverage = next(coverages, None)
+        total_shifts = 0
+        
+        yield '{"start": %s, "end": %s, "days": [' % (
+            json.dumps(start_date.isoformat()), json.dumps(end_date.isoformat())
+        )
+        
+        current_date = start_date
+        while current_date <= end_date:
+            day_shifts = []
+            if next_group is not None and next_group[0] == current_date:
+                day_shifts = list(next_group[1])
+                next_group = next(shift_groups, None)
+            
+            coverage = None
+            if next_coverage is not None and next_coverage.date == current_date:
+                coverage = next_coverage
+                next_coverage = next(coverages, None)
+            
+            total_shifts += len(day_shifts)
+            day = {
+                'date': current_date.isoformat(),
+                'day_name': current_date.strftime('%A'),
+                'shifts': CalendarShiftSerializer(day_shifts, many=True).data,
+                'coverage': serialize_day_coverage(coverage),
+                'total_hours': float(sum(s.duration_hours for s in day_shifts))
+            }
+            
+            separator = ', ' if current_date > start_date else ''
+            yield separator + json.dumps(day, cls=DjangoJSONEncoder)
+            current_date += timedelta(days=1)
+        
+        yield '], "total_shifts": %d}' % total_shifts
+
+
+class CoverageGapsAPI(APIView):
+    """
+    GET /api/calendar/gaps/?start=YYYY-MM-DD&end=YYYY-MM-DD
+    Every uncovered stretch between approved shifts in the range (admin only).
+    
+    Query params:
+    - start, end: Inclusive date range (required)
+    - sort: length (default), critical or start
+    - min_minutes: Leave out gaps shorter than this
+    """
+    permission_classes = [IsAdminUser]
+    
+    MAX_RANGE_DAYS = 366
+    
+    def get(self, request):
+        try:
+            start_date = datetime.strptime(request.query_params.get('start', ''), '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.query_params.get('end', ''), '%Y-%m-%d').date()
+        except ValueError:
+            return Response(
+                {'error': 'start and end are required. Use YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if end_date < start_date:
+            return Response(
+                {'error': 'end must be on or after start'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if (end_date - start_date).days + 1 > self.MAX_RANGE_DAYS:
+            return Response(
+                {'error': f'Range cannot exceed {self.MAX_RANGE_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        sort = request.query_params.get('sort', 'length')
+        if sort not in GAP_SORT_KEYS:
+            return Response(
+                {'error': f'sort must be one of: {", ".join(GAP_SORT_KEYS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            min_minutes = int(request.query_params.get('min_minutes', 0))
+        except ValueError:
+            return Response(
+                {'error': 'Invalid min_minutes parameter'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        gaps = find_coverage_gaps(start_date, end_date, sort=sort, min_minutes=min_minutes)
+        
+        return Response({
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat(),
+            'sort': sort,
+            'gaps': gaps,
+            'total_gaps': len(gaps),
+            'uncovered_minutes': sum(gap['duration_minutes'] for gap in gaps),
+            'uncovered_critical_minutes': sum(gap['critical_minutes'] for gap in gaps)
+        })
+
+
+class CalendarCacheStatsAPI(APIView):
+    """
+    GET /api/calendar/cache-stats/
+    Hit/miss counters for the calendar response cache (admin only)
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response(get_calendar_cache_stats())
\ No newline at end of file
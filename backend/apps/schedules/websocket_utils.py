@@ -110,4 +110,33 @@ def broadcast_period_finalized(period, message=None):
         )
         logger.info(f'WebSocket broadcast: period {period.id} finalized')
     except Exception as e:
-        logger.error(f'Failed to broadcast period finalized: {e}')
\ No newline at end of file
+        logger.error(f'Failed to broadcast period finalized: {e}')
+
+
+def broadcast_finalize_progress(period_id, job):
+    """
+    Broadcast finalize job progress to WebSocket clients.
+    
+    Args:
+        period_id: Schedule period ID
+        job: Job state dict (see apps/schedules/finalize.py)
+    """
+    channel_layer = get_channel_layer()
+    room_group_name = f'schedule_{period_id}'
+    
+    event_data = {
+        'type': 'period_finalize_progress',
+        'job_id': job.get('job_id'),
+        'status': job.get('status'),
+        'stage': job.get('stage'),
+        'progress': job.get('progress', 0),
+        'message': job.get('message', '')
+    }
+    
+    try:
+        async_to_sync(channel_layer.group_send)(
+            room_group_name,
+            event_data
+        )
+    except Exception as e:
+        logger.error(f'Failed to broadcast finalize progress: {e}')
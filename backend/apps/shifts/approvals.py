@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from .models import ShiftRequest
+from .conflicts import find_conflicts, is_overlap_violation, lock_dates, shift_lock_dates
+
+
+class ApprovalError(Exception):
+    """An approval was refused; payload is the error response body"""
+
+    def __init__(self, payload):
+        super().__init__(payload.get('error'))
+        self.payload = payload
+
+
+class ApprovalConflict(Exception):
+    """The shift overlaps one or more approved shifts"""
+
+    def __init__(self, conflicts):
+        super().__init__(f'{len(conflicts)} conflicting approved shifts')
+        self.conflicts = conflicts
+
+
+def describe_overtime(projection):
+    """e.g. 'Approving brings this PA to 44.00 hours for the week of 2025-11-03 (limit 40)'"""
+    return (
+        f'Approving brings this PA to {projection["projected_hours"]} hours for the week of '
+        f'{projection["week_start_date"]} (limit {projection["max_hours"]})'
+    )
+
+
+def approve_shift(shift, user, admin_notes=''):
+    """
+    Approve a pending shift under its per-date locks.
+
+    The locks on the shift's date (and the next date for overnight shifts)
+    serialise approvals and edits that could overlap it; approvals on other
+    dates don't wait. Under the locks the shift row is re-read, so two admins
+    approving the same request can't both succeed, and the conflict and
+    overtime checks see every approval that committed before this one.
+
+    Args:
+        shift: ShiftRequest instance (only its id and times are trusted)
+        user: approving admin
+        admin_notes: stored on the shift
+
+    Returns:
+        tuple of (approved ShiftRequest, overtime projection)
+
+    Raises:
+        ApprovalConflict: the shift overlaps an approved shift
+        ApprovalError: the shift is no longer pending, or OVERTIME_POLICY blocks it
+    """
+    from apps.coverage.utils import project_weekly_hours
+
+    try:
+        with transaction.atomic():
+            lock_dates(shift_lock_dates(shift.date, shift.start_time, shift.end_time))
+            shift = ShiftRequest.objects.select_for_update(of=('self',)).select_related(
+                'requested_by', 'schedule_period'
+            ).get(id=shift.id)
+
+            if shift.status != 'PENDING':
+                raise ApprovalError({'error': 'Can only approve pending requests'})
+
+            conflicts = find_conflicts(shift.date, shift.start_time, shift.end_time, exclude_ids=[shift.id])
+            if conflicts:
+                raise ApprovalConflict(conflicts)
+
+            overtime = project_weekly_hours(shift, lock=True)
+            if overtime['exceeds_limit'] and settings.OVERTIME_POLICY == 'block':
+                raise ApprovalError({
+                    'error': 'Cannot approve - exceeds weekly hours limit',
+                    'detail': describe_overtime(overtime),
+                    'overtime': overtime
+                })
+
+            shift.status = 'APPROVED'
+            shift.approved_by = user
+            shift.approved_at = timezone.now()
+            shift.admin_notes = admin_notes
+            shift.save()
+    except IntegrityError as e:
+        # Writers that skip the date locks are still caught by the exclusion constraint
+        if not is_overlap_violation(e):
+            raise
+        raise ApprovalConflict(
+            find_conflicts(shift.date, shift.start_time, shift.end_time, exclude_ids=[shift.id])
+        )
+
+    return shift, overtime
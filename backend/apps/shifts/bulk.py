@@ -0,0 +1,184 @@
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from .models import ShiftRequest
+from .conflicts import ApprovedIntervals, serialize_conflict, is_overlap_violation, lock_dates, shift_lock_dates
+
+# Statuses each bulk action can be applied to
+BULK_ACTIONS = {
+    'approve': ('PENDING',),
+    'reject': ('PENDING',),
+    'cancel': ('PENDING', 'APPROVED'),
+}
+
+
+class BulkActionError(Exception):
+    """A bulk action failed validation; nothing was changed"""
+
+    def __init__(self, errors):
+        super().__init__(f'{len(errors)} shifts failed validation')
+        self.errors = errors
+
+
+def batch_conflicts(shifts):
+    """
+    Overlaps for shifts being approved together: against APPROVED shifts
+    already in the database (one range query) and against each other.
+
+    Returns:
+        dict of shift id -> list of conflicting shifts
+    """
+    if not shifts:
+        return {}
+
+    batch_ids = {shift.id for shift in shifts}
+    existing = ApprovedIntervals.load(
+        min(shift.starts_at for shift in shifts),
+        max(shift.ends_at for shift in shifts)
+    )
+    batch = ApprovedIntervals(shifts)
+
+    conflicts = {}
+    for shift in shifts:
+        found = [
+            other for other in existing.overlapping(shift.starts_at, shift.ends_at)
+            if other.id not in batch_ids
+        ] + [
+            other for other in batch.overlapping(shift.starts_at, shift.ends_at)
+            if other.id != shift.id
+        ]
+        if found:
+            conflicts[shift.id] = found
+    return conflicts
+
+
+def apply_bulk_action(action, shift_ids, user, reason='', admin_notes=None):
+    """
+    Approve, reject or cancel many shifts in one transaction: either every
+    shift changes or none does.
+
+    The shifts (and, when approving, their dates) are locked, validated
+    together (status, conflicts within the batch and against existing
+    approvals, and the overtime policy when approving) and written with
+    one UPDATE. Weekly hours get one delta per
+    PA week, critical coverage is queued once per affected date, and the
+    notification emails go out as a single background job after commit.
+
+    Args:
+        action: 'approve', 'reject' or 'cancel'
+        shift_ids: list of ShiftRequest ids
+        user: the admin performing the action
+        reason: rejected_reason or cancellation_reason
+        admin_notes: replaces admin_notes on approved shifts when given
+
+    Returns:
+        tuple of (list of updated ShiftRequest instances, list of overtime projections)
+
+    Raises:
+        BulkActionError: with one entry per shift that blocked the action
+    """
+    from apps.coverage.pipeline import coverage_affected, coverage_keys_for_shift, mark_coverage_dirty
+    from apps.coverage.utils import (
+        weekly_hours_deltas,
+        merge_weekly_deltas,
+        apply_weekly_hours_deltas,
+        project_weekly_deltas
+    )
+    from apps.changes.recorder import entry_for_save, record_changes
+    from apps.schedules.cache import invalidate_calendar_dates
+    from .tasks import send_bulk_action_notifications
+
+    allowed_statuses = BULK_ACTIONS[action]
+    shift_ids = list(dict.fromkeys(shift_ids))
+
+    try:
+        with transaction.atomic():
+            if action == 'approve':
+                # Per-date locks first (as approve_shift does), then the rows
+                lock_dates(set().union(*(
+                    shift_lock_dates(*span)
+                    for span in ShiftRequest.objects.filter(id__in=shift_ids).values_list('date', 'start_time', 'end_time')
+                )))
+
+            shifts = ShiftRequest.objects.select_for_update(of=('self',)).select_related(
+                'requested_by', 'schedule_period'
+            ).in_bulk(shift_ids)
+
+            errors = []
+            for shift_id in shift_ids:
+                shift = shifts.get(shift_id)
+                if shift is None:
+                    errors.append({'shift_id': shift_id, 'error': 'Shift not found'})
+                elif shift.status not in allowed_statuses:
+                    errors.append({
+                        'shift_id': shift_id,
+                        'error': f'Cannot {action} a shift that is {shift.status.lower()}'
+                    })
+
+            shifts = [shifts[shift_id] for shift_id in shift_ids if shift_id in shifts]
+
+            if action == 'approve':
+                for shift_id, conflicts in batch_conflicts(shifts).items():
+                    errors.append({
+                        'shift_id': shift_id,
+                        'error': 'Time slot conflict',
+                        'conflicts': [serialize_conflict(other) for other in conflicts]
+                    })
+
+            if errors:
+                raise BulkActionError(errors)
+
+            now = timezone.now()
+            changes = {'status': {'approve': 'APPROVED', 'reject': 'REJECTED', 'cancel': 'CANCELLED'}[action]}
+            if action == 'approve':
+                changes.update(approved_by=user, approved_at=now)
+                if admin_notes is not None:
+                    changes['admin_notes'] = admin_notes
+            elif action == 'reject':
+                changes['rejected_reason'] = reason
+            else:
+                changes['cancellation_reason'] = reason
+
+            coverage_dates = set()
+            calendar_dates = set()
+            for shift in shifts:
+                for field, value in changes.items():
+                    setattr(shift, field, value)
+                calendar_dates.add(shift.date)
+                if coverage_affected(shift):
+                    coverage_dates |= coverage_keys_for_shift(shift)
+            deltas = merge_weekly_deltas(*[weekly_hours_deltas(shift) for shift in shifts])
+
+            overtime = [
+                projection for projection in project_weekly_deltas(deltas, lock=True)
+                if projection['exceeds_limit']
+            ] if action == 'approve' else []
+            if overtime and settings.OVERTIME_POLICY == 'block':
+                raise BulkActionError([
+                    {
+                        'pa_id': projection['pa_id'],
+                        'error': 'Exceeds weekly hours limit',
+                        'overtime': projection
+                    }
+                    for projection in overtime
+                ])
+
+            # queryset.update() skips the post_save receivers, so their work is done here once for the batch
+            ShiftRequest.objects.filter(id__in=[shift.id for shift in shifts]).update(updated_at=now, **changes)
+            apply_weekly_hours_deltas(deltas)
+            record_changes([entry_for_save('shift', shift) for shift in shifts])
+
+            transaction.on_commit(lambda: mark_coverage_dirty(coverage_dates))
+            transaction.on_commit(lambda: invalidate_calendar_dates(*calendar_dates))
+            transaction.on_commit(lambda: send_bulk_action_notifications.delay(
+                action, [shift.id for shift in shifts], reason
+            ))
+    except IntegrityError as e:
+        # A concurrent approval won between the check and the write
+        if not is_overlap_violation(e):
+            raise
+        raise BulkActionError([{'error': 'Time slot conflict with a shift approved concurrently'}])
+
+    for shift in shifts:
+        shift.updated_at = now
+    return shifts, overtime
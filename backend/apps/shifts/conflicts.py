@@ -0,0 +1,223 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate
+from django.db import connection
+from django.utils import timezone
+from .models import ShiftRequest
+
+# Exclusion constraint on ShiftRequest that forbids overlapping APPROVED spans
+APPROVED_OVERLAP_CONSTRAINT = 'exclude_overlapping_approved_shifts'
+
+# First key of pg_advisory_xact_lock(int, int) for per-date shift locks
+DATE_LOCK_NAMESPACE = 7301
+
+
+def shift_span(date, start_time, end_time):
+    """
+    Absolute (starts_at, ends_at) for a shift in the facility's timezone.
+    Overnight shifts (end_time <= start_time) end on the following date.
+
+    Args:
+        date: datetime.date
+        start_time: datetime.time
+        end_time: datetime.time
+
+    Returns:
+        tuple of aware datetimes
+    """
+    tz = timezone.get_default_timezone()
+    start = datetime.combine(date, start_time)
+    end = datetime.combine(date, end_time)
+
+    if end <= start:
+        end += timedelta(days=1)
+
+    return timezone.make_aware(start, tz), timezone.make_aware(end, tz)
+
+
+def shift_lock_dates(date, start_time, end_time):
+    """Dates whose lock guards a shift: its date, and the next one if it runs past midnight"""
+    dates = {date}
+    if end_time <= start_time:
+        dates.add(date + timedelta(days=1))
+    return dates
+
+
+def lock_dates(dates):
+    """
+    Take a transaction-scoped Postgres advisory lock per date.
+
+    Two overlapping shifts always share a locked date (an overnight shift
+    locks the next date too), so check-then-write sequences for the same
+    dates run one at a time while other dates proceed in parallel. Locks
+    are taken in date order so transactions never wait on each other in
+    opposite orders, and are released on commit or rollback.
+
+    Args:
+        dates: iterable of datetime.date, see shift_lock_dates
+    """
+    if connection.vendor != 'postgresql':
+        return
+    if not connection.in_atomic_block:
+        raise RuntimeError('lock_dates must be called inside transaction.atomic()')
+
+    with connection.cursor() as cursor:
+        for date in sorted(set(dates)):
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [DATE_LOCK_NAMESPACE, date.toordinal()])
+
+
+def find_conflicts(date, start_time, end_time, exclude_ids=()):
+    """
+    Find every APPROVED shift overlapping the requested time.
+    Only APPROVED shifts block new requests (PENDING doesn't block).
+
+    Overlap is a single range query on the stored starts_at/ends_at,
+    so overnight shifts that spill into the next date are caught too.
+
+    Args:
+        date: datetime.date
+        start_time: datetime.time
+        end_time: datetime.time
+        exclude_ids: Optional shift IDs to leave out (e.g. the shift being approved or edited)
+
+    Returns:
+        list of conflicting ShiftRequest instances ordered by start
+    """
+    starts_at, ends_at = shift_span(date, start_time, end_time)
+
+    conflicts = ShiftRequest.objects.filter(
+        status='APPROVED',
+        starts_at__lt=ends_at,
+        ends_at__gt=starts_at
+    )
+
+    if exclude_ids:
+        conflicts = conflicts.exclude(id__in=exclude_ids)
+
+    return list(conflicts.select_related('requested_by').order_by('starts_at'))
+
+
+def is_overlap_violation(error):
+    """True if an IntegrityError came from the approved-overlap exclusion constraint"""
+    return APPROVED_OVERLAP_CONSTRAINT in str(error)
+
+
+def serialize_conflict(shift):
+    """Conflict details returned to the client"""
+    return {
+        'shift_id': shift.id,
+        'pa_name': shift.requested_by.get_full_name(),
+        'date': str(shift.date),
+        'start_time': str(shift.start_time),
+        'end_time': str(shift.end_time)
+    }
+
+
+def describe_conflicts(conflicts):
+    """Human-readable summary, e.g. 'an approved shift by Jane Doe (06:00 AM - 10:00 AM)'"""
+    descriptions = [
+        f'{shift.requested_by.get_full_name()} ({shift.start_time.strftime("%I:%M %p")} - {shift.end_time.strftime("%I:%M %p")})'
+        for shift in conflicts
+    ]
+    if not descriptions:
+        return 'another approved shift'
+    if len(descriptions) == 1:
+        return f'an approved shift by {descriptions[0]}'
+    return f'{len(descriptions)} approved shifts by {", ".join(descriptions)}'
+
+
+class ApprovedIntervals:
+    """
+    APPROVED shift spans sorted by start, for answering many overlap
+    queries from a single database read.
+
+    ends_max[i] is the latest end among the first i+1 spans, so it is sorted
+    even if legacy rows overlap, and the candidates for a query are the
+    contiguous slice between two bisections.
+    """
+
+    def __init__(self, shifts):
+        self.shifts = sorted(shifts, key=lambda shift: (shift.starts_at, shift.ends_at))
+        self.starts = [shift.starts_at for shift in self.shifts]
+        self.ends_max = list(accumulate((shift.ends_at for shift in self.shifts), max))
+
+    @classmethod
+    def load(cls, starts_at, ends_at):
+        """One range query for every APPROVED shift overlapping [starts_at, ends_at)"""
+        return cls(
+            ShiftRequest.objects.filter(
+                status='APPROVED',
+                starts_at__lt=ends_at,
+                ends_at__gt=starts_at
+            ).select_related('requested_by')
+        )
+
+    def overlapping(self, starts_at, ends_at):
+        """Shifts overlapping [starts_at, ends_at), ordered by start"""
+        first = bisect_right(self.ends_max, starts_at)
+        last = bisect_left(self.starts, ends_at)
+        return [
+            shift for shift in self.shifts[first:last]
+            if shift.ends_at > starts_at
+        ]
+
+
+def covered_windows(date, start_time, end_time, windows):
+    """
+    Critical windows a shift would cover in full, including the next
+    morning for overnight shifts.
+
+    Args:
+        windows: list of (name, start_time, end_time), see get_critical_windows
+
+    Returns:
+        list of dicts with window name and date
+    """
+    starts_at, ends_at = shift_span(date, start_time, end_time)
+    covered = []
+
+    for day in sorted({starts_at.date(), ends_at.date()}):
+        for name, window_start, window_end in windows:
+            window_starts_at, window_ends_at = shift_span(day, window_start, window_end)
+            if starts_at <= window_starts_at and ends_at >= window_ends_at:
+                covered.append({'name': name, 'date': str(day)})
+
+    return covered
+
+
+def check_availability(slots):
+    """
+    Check many candidate slots against APPROVED shifts at once.
+
+    Args:
+        slots: list of dicts with date, start_time and end_time
+
+    Returns:
+        list of dicts, one per slot in the same order, with availability,
+        the conflicting shifts and the critical windows the slot would cover
+    """
+    if not slots:
+        return []
+
+    spans = [shift_span(slot['date'], slot['start_time'], slot['end_time']) for slot in slots]
+    intervals = ApprovedIntervals.load(
+        min(starts_at for starts_at, _ in spans),
+        max(ends_at for _, ends_at in spans)
+    )
+
+    from apps.coverage.utils import get_critical_windows
+
+    windows = get_critical_windows()
+    results = []
+    for slot, (starts_at, ends_at) in zip(slots, spans):
+        conflicts = intervals.overlapping(starts_at, ends_at)
+        results.append({
+            'date': str(slot['date']),
+            'start_time': str(slot['start_time']),
+            'end_time': str(slot['end_time']),
+            'available': not conflicts,
+            'conflicts': [serialize_conflict(shift) for shift in conflicts],
+            'critical_windows': covered_windows(slot['date'], slot['start_time'], slot['end_time'], windows)
+        })
+
+    return results
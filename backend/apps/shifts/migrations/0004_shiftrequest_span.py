@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:51
+
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_spans(apps, schema_editor):
+    ShiftRequest = apps.get_model('shifts', 'ShiftRequest')
+    tz = timezone.get_default_timezone()
+    batch = []
+
+    for shift in ShiftRequest.objects.only('id', 'date', 'start_time', 'end_time').iterator(chunk_size=1000):
+        start = datetime.combine(shift.date, shift.start_time)
+        end = datetime.combine(shift.date, shift.end_time)
+        if end <= start:
+            end += timedelta(days=1)
+        shift.starts_at = timezone.make_aware(start, tz)
+        shift.ends_at = timezone.make_aware(end, tz)
+        batch.append(shift)
+
+        if len(batch) >= 1000:
+            ShiftRequest.objects.bulk_update(batch, ['starts_at', 'ends_at'])
+            batch = []
+
+    if batch:
+        ShiftRequest.objects.bulk_update(batch, ['starts_at', 'ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+        ('shifts', '0003_shiftrequest_cancellation_reason'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shiftrequest',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='shiftrequest',
+            name='starts_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_spans, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='shiftrequest',
+            index=models.Index(condition=models.Q(('status', 'APPROVED')), fields=['starts_at', 'ends_at'], name='shift_approved_span_idx'),
+        ),
+    ]
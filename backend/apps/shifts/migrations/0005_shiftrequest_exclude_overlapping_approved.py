@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:53
+
+import apps.shifts.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.conf import settings
+from django.db import migrations, models
+
+NOTE = 'Set back to pending: overlapped shift {} when overlapping approvals were disallowed.'
+
+
+def unapprove_overlapping_shifts(apps, schema_editor):
+    """
+    The old same-date check missed overnight overlaps and could lose races,
+    so approved shifts may already overlap. Keep the earlier approval of each
+    overlapping pair and set the later one back to PENDING for an admin to
+    review; otherwise adding the constraint would fail.
+    """
+    ShiftRequest = apps.get_model('shifts', 'ShiftRequest')
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('''
+            SELECT later.id, array_agg(earlier.id ORDER BY earlier.id)
+            FROM shift_requests earlier
+            JOIN shift_requests later
+              ON tstzrange(earlier.starts_at, earlier.ends_at) && tstzrange(later.starts_at, later.ends_at)
+             AND (coalesce(later.approved_at, later.created_at), later.id)
+               > (coalesce(earlier.approved_at, earlier.created_at), earlier.id)
+            WHERE earlier.status = 'APPROVED' AND later.status = 'APPROVED'
+            GROUP BY later.id, coalesce(later.approved_at, later.created_at)
+            ORDER BY coalesce(later.approved_at, later.created_at), later.id
+        ''')
+        pairs = cursor.fetchall()
+
+    # In approval order, so a shift only yields to earlier ones that stay approved
+    overlapping = []
+    unapproved = set()
+    for shift_id, earlier_ids in pairs:
+        kept = [earlier_id for earlier_id in earlier_ids if earlier_id not in unapproved]
+        if kept:
+            unapproved.add(shift_id)
+            overlapping.append((shift_id, kept[0]))
+
+    for shift_id, kept_id in overlapping:
+        shift = ShiftRequest.objects.get(id=shift_id)
+        shift.status = 'PENDING'
+        shift.approved_at = None
+        shift.approved_by = None
+        shift.admin_notes = '\n'.join(filter(None, [shift.admin_notes, NOTE.format(kept_id)]))
+        shift.save(update_fields=['status', 'approved_at', 'approved_by', 'admin_notes'])
+
+    if overlapping:
+        print(
+            f'\n  Set {len(overlapping)} overlapping approved shifts back to PENDING: '
+            f'{", ".join(str(shift_id) for shift_id, _ in overlapping)}. '
+            'Weekly hours catch up at the next reconcile_weekly_hours run.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+        ('shifts', '0004_shiftrequest_span'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(unapprove_overlapping_shifts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='shiftrequest',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status', 'APPROVED')), expressions=[(apps.shifts.models.TsTzRange('starts_at', 'ends_at', django.contrib.postgres.fields.ranges.RangeBoundary()), '&&')], name='exclude_overlapping_approved_shifts'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:13
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking shift_requests against writes
+    atomic = False
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+        ('shifts', '0005_shiftrequest_exclude_overlapping_approved'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(fields=['created_at', 'id'], name='shift_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(fields=['requested_by', 'created_at', 'id'], name='shift_pa_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='shift_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(fields=['schedule_period', 'created_at', 'id'], name='shift_period_created_idx'),
+        ),
+    ]
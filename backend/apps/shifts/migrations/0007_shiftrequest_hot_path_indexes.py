@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:14
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+        ('shifts', '0006_shiftrequest_listing_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(fields=['date', 'status'], name='shift_date_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(condition=models.Q(('status', 'APPROVED')), fields=['date', 'start_time'], name='shift_approved_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(fields=['requested_by', 'status', 'date'], name='shift_pa_status_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(fields=['schedule_period', 'status'], name='shift_period_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shiftrequest',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['schedule_period', 'id'], name='shift_pending_period_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Drop the indexes without locking the table against writes. A plain
+    # AlterField would also drop and re-validate both FK constraints.
+    atomic = False
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+        ('shifts', '0007_shiftrequest_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX CONCURRENTLY IF EXISTS shift_requests_requested_by_id_8bb98172',
+                    'CREATE INDEX CONCURRENTLY IF NOT EXISTS shift_requests_requested_by_id_8bb98172 '
+                    'ON shift_requests (requested_by_id)',
+                ),
+                migrations.RunSQL(
+                    'DROP INDEX CONCURRENTLY IF EXISTS shift_requests_schedule_period_id_86599bda',
+                    'CREATE INDEX CONCURRENTLY IF NOT EXISTS shift_requests_schedule_period_id_86599bda '
+                    'ON shift_requests (schedule_period_id)',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='shiftrequest',
+                    name='requested_by',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='shiftrequest',
+                    name='schedule_period',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='schedules.scheduleperiod'),
+                ),
+            ],
+        ),
+    ]
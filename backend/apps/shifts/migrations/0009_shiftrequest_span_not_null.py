@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:52
+
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_missing_spans(apps, schema_editor):
+    """Spans for rows written since 0004 by a path that skipped save()"""
+    ShiftRequest = apps.get_model('shifts', 'ShiftRequest')
+    tz = timezone.get_default_timezone()
+    batch = []
+
+    missing = ShiftRequest.objects.filter(models.Q(starts_at__isnull=True) | models.Q(ends_at__isnull=True))
+    for shift in missing.only('id', 'date', 'start_time', 'end_time').iterator(chunk_size=1000):
+        start = datetime.combine(shift.date, shift.start_time)
+        end = datetime.combine(shift.date, shift.end_time)
+        if end <= start:
+            end += timedelta(days=1)
+        shift.starts_at = timezone.make_aware(start, tz)
+        shift.ends_at = timezone.make_aware(end, tz)
+        batch.append(shift)
+
+        if len(batch) >= 1000:
+            ShiftRequest.objects.bulk_update(batch, ['starts_at', 'ends_at'])
+            batch = []
+
+    if batch:
+        ShiftRequest.objects.bulk_update(batch, ['starts_at', 'ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+        ('shifts', '0008_drop_redundant_fk_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_missing_spans, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='shiftrequest',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='shiftrequest',
+            name='starts_at',
+            field=models.DateTimeField(editable=False),
+        ),
+    ]
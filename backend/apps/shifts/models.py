@@ -1,10 +1,18 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeBoundary, RangeOperators
 from decimal import Decimal
 from datetime import datetime, timedelta
+from apps.changes.tracking import LoadedValuesMixin
 
 
-class ShiftRequest(models.Model):
+class TsTzRange(models.Func):
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
+
+class ShiftRequest(LoadedValuesMixin, models.Model):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('APPROVED', 'Approved'),
@@ -12,8 +20,9 @@ class ShiftRequest(models.Model):
         ('CANCELLED', 'Cancelled'),
     ]
     
-    schedule_period = models.ForeignKey('schedules.SchedulePeriod', on_delete=models.CASCADE)
-    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # No single-column FK indexes: the composite indexes below lead with these columns
+    schedule_period = models.ForeignKey('schedules.SchedulePeriod', on_delete=models.CASCADE, db_index=False)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
     date = models.DateField()
     start_time = models.TimeField()
     end_time = models.TimeField()
@@ -23,6 +32,10 @@ class ShiftRequest(models.Model):
     admin_notes = models.TextField(blank=True)
     rejected_reason = models.TextField(blank=True)
     cancellation_reason = models.TextField(blank=True, default='')
+    # Absolute span derived from date/start_time/end_time on save; overnight shifts end the next day
+    # NOT NULL: an unbounded range would collide with every approved shift in the exclusion constraint
+    starts_at = models.DateTimeField(editable=False)
+    ends_at = models.DateTimeField(editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     approved_at = models.DateTimeField(null=True, blank=True)
@@ -37,20 +50,70 @@ class ShiftRequest(models.Model):
     class Meta:
         db_table = 'shift_requests'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['starts_at', 'ends_at'],
+                name='shift_approved_span_idx',
+                condition=models.Q(status='APPROVED')
+            ),
+            # Keyset listing on (created_at, id). Unfiltered, or filtered by one of
+            # pa_id / status / period_id, each page is a single index range scan in
+            # page order. With several of those filters the most selective index is
+            # used and the others are checked per row. start_date/end_date ranges use
+            # shift_date_status_idx and sort the (narrow) range instead.
+            models.Index(fields=['created_at', 'id'], name='shift_created_id_idx'),
+            models.Index(fields=['requested_by', 'created_at', 'id'], name='shift_pa_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='shift_status_created_idx'),
+            models.Index(fields=['schedule_period', 'created_at', 'id'], name='shift_period_created_idx'),
+            # Calendar ranges (any status), coverage (approved only, read in date/start order),
+            # weekly hours and PA stats, period summaries and finalize
+            models.Index(fields=['date', 'status'], name='shift_date_status_idx'),
+            models.Index(
+                fields=['date', 'start_time'],
+                name='shift_approved_date_idx',
+                condition=models.Q(status='APPROVED')
+            ),
+            models.Index(fields=['requested_by', 'status', 'date'], name='shift_pa_status_date_idx'),
+            models.Index(fields=['schedule_period', 'status'], name='shift_period_status_idx'),
+            models.Index(
+                fields=['schedule_period', 'id'],
+                name='shift_pending_period_idx',
+                condition=models.Q(status='PENDING')
+            ),
+        ]
+        constraints = [
+            # Approved shifts may never overlap; enforced by Postgres so concurrent approvals can't race
+            ExclusionConstraint(
+                name='exclude_overlapping_approved_shifts',
+                expressions=[
+                    (TsTzRange('starts_at', 'ends_at', RangeBoundary()), RangeOperators.OVERLAPS),
+                ],
+                condition=models.Q(status='APPROVED'),
+            ),
+        ]
     
     def save(self, *args, **kwargs):
         if self.start_time and self.end_time:
-            from datetime import datetime, timedelta
-            start = datetime.combine(datetime.today(), self.start_time)
-            end = datetime.combine(datetime.today(), self.end_time)
-            if end < start:
-                end += timedelta(days=1)
-            duration = (end - start).total_seconds() / 3600
-            self.duration_hours = Decimal(str(duration))
+            self.update_duration()
+            self.update_span()
         super().save(*args, **kwargs)
+    
+    def update_duration(self):
+        """Set duration_hours from start_time/end_time; call before bulk_create, which skips save()"""
+        start = datetime.combine(datetime.today(), self.start_time)
+        end = datetime.combine(datetime.today(), self.end_time)
+        if end < start:
+            end += timedelta(days=1)
+        duration = (end - start).total_seconds() / 3600
+        self.duration_hours = Decimal(str(duration))
+    
+    def update_span(self):
+        """Set starts_at/ends_at (used by conflict checks); call before bulk_create, which skips save()"""
+        from .conflicts import shift_span
+        self.starts_at, self.ends_at = shift_span(self.date, self.start_time, self.end_time)
 
 
-class ShiftSuggestion(models.Model):
+class ShiftSuggestion(LoadedValuesMixin, models.Model):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('ACCEPTED', 'Accepted'),
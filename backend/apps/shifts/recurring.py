@@ -0,0 +1,113 @@
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import ShiftRequest
+from .conflicts import ApprovedIntervals, serialize_conflict, describe_conflicts
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def expand_weekly_pattern(start_date, end_date, days):
+    """
+    Every date in [start_date, end_date] that falls on one of the given weekdays.
+
+    Args:
+        days: iterable of weekday names (see WEEKDAYS)
+
+    Returns:
+        sorted list of datetime.date
+    """
+    weekdays = {WEEKDAYS.index(day) for day in days}
+    dates = []
+    day = start_date
+    while day <= end_date:
+        if day.weekday() in weekdays:
+            dates.append(day)
+        day += timedelta(days=1)
+    return dates
+
+
+def create_recurring_requests(user, schedule_period, days, start_time, end_time,
+                              notes='', start_date=None, end_date=None, dry_run=False):
+    """
+    Expand a weekly pattern over a schedule period into pending shift requests.
+
+    Every generated date is checked against APPROVED shifts with one range
+    query; the dates that pass are inserted with a single bulk_create and the
+    rest are reported with the reason they were skipped.
+
+    Args:
+        user: the PA requesting the shifts
+        schedule_period: SchedulePeriod (must be OPEN, checked by the serializer)
+        days: weekday names the pattern repeats on
+        start_time, end_time: datetime.time; end_time <= start_time is overnight
+        notes: copied to every request
+        start_date, end_date: optional narrower range inside the period
+        dry_run: validate and report without creating anything
+
+    Returns:
+        tuple of (list of created or would-be-created ShiftRequest, list of skipped dicts)
+    """
+    from apps.changes.recorder import entry_for_save, record_changes
+    from apps.schedules.cache import invalidate_calendar_range, invalidate_period_shift_counts
+    from .tasks import send_recurring_requests_email
+
+    first = max(start_date or schedule_period.start_date, schedule_period.start_date)
+    last = min(end_date or schedule_period.end_date, schedule_period.end_date)
+    today = timezone.now().date()
+
+    candidates = []
+    skipped = []
+    for date in expand_weekly_pattern(first, last, days):
+        if date < today:
+            skipped.append({'date': str(date), 'reason': 'Cannot request shifts for past dates'})
+            continue
+        shift = ShiftRequest(
+            schedule_period=schedule_period,
+            requested_by=user,
+            date=date,
+            start_time=start_time,
+            end_time=end_time,
+            notes=notes
+        )
+        # bulk_create skips save(), which normally derives these
+        shift.update_duration()
+        shift.update_span()
+        candidates.append(shift)
+
+    if not candidates:
+        return [], skipped
+
+    approved = ApprovedIntervals.load(
+        min(shift.starts_at for shift in candidates),
+        max(shift.ends_at for shift in candidates)
+    )
+
+    valid = []
+    for shift in candidates:
+        conflicts = approved.overlapping(shift.starts_at, shift.ends_at)
+        if conflicts:
+            skipped.append({
+                'date': str(shift.date),
+                'reason': f'Conflicts with {describe_conflicts(conflicts)}',
+                'conflicts': [serialize_conflict(other) for other in conflicts]
+            })
+        else:
+            valid.append(shift)
+
+    skipped.sort(key=lambda entry: entry['date'])
+
+    if dry_run or not valid:
+        return valid, skipped
+
+    with transaction.atomic():
+        created = ShiftRequest.objects.bulk_create(valid)
+        # bulk_create skips the post_save receivers; pending shifts don't change
+        # coverage, but the change log and the cached calendars that show them do
+        record_changes([entry_for_save('shift', shift, created=True) for shift in created])
+        first_date, last_date = created[0].date, created[-1].date
+        transaction.on_commit(lambda: invalidate_calendar_range(first_date, last_date + timedelta(days=1)))
+        transaction.on_commit(lambda: invalidate_period_shift_counts(schedule_period.id))
+        transaction.on_commit(lambda: send_recurring_requests_email.delay([shift.id for shift in created]))
+
+    return created, skipped
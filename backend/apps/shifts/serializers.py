@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.utils import timezone
 from datetime import datetime, timedelta
 from .models import ShiftRequest, ShiftSuggestion
+from .recurring import WEEKDAYS
 from apps.schedules.models import SchedulePeriod
 from apps.users.serializers import UserSerializer
 
@@ -61,19 +62,7 @@ class ShiftRequestCreateSerializer(serializers.ModelSerializer):
         if date and date < timezone.now().date():
             raise serializers.ValidationError('Cannot request shifts for past dates')
         
-        if schedule_period and date and start_time and end_time:
-            from apps.schedules.utils import check_shift_conflicts
-            conflicts = check_shift_conflicts(
-                schedule_period=schedule_period,
-                date=date,
-                start_time=start_time,
-                end_time=end_time,
-                exclude_request_id=None
-            )
-            if conflicts:
-                raise serializers.ValidationError(
-                    'This shift conflicts with existing approved shifts'
-                )
+        # Conflicts with approved shifts are checked once by the view (apps/shifts/conflicts.py)
         
         return data
 
@@ -137,3 +126,66 @@ class ShiftSuggestionAcceptSerializer(serializers.Serializer):
 
 class ShiftSuggestionDeclineSerializer(serializers.Serializer):
     decline_reason = serializers.CharField(required=False, allow_blank=True)
+
+
+class AvailabilitySlotSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    
+    def validate(self, data):
+        if data['start_time'] == data['end_time']:
+            raise serializers.ValidationError('Start and end time cannot be the same')
+        return data
+
+
+class AvailabilityCheckSerializer(serializers.Serializer):
+    MAX_SLOTS = 1000
+    
+    slots = AvailabilitySlotSerializer(many=True, allow_empty=False, max_length=MAX_SLOTS)
+
+
+class BulkShiftActionSerializer(serializers.Serializer):
+    MAX_IDS = 500
+    
+    action = serializers.ChoiceField(choices=['approve', 'reject', 'cancel'])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS
+    )
+    reason = serializers.CharField(required=False, allow_blank=True, default='')
+    admin_notes = serializers.CharField(required=False, allow_blank=True)
+
+
+class RecurringShiftRequestSerializer(serializers.Serializer):
+    schedule_period = serializers.PrimaryKeyRelatedField(queryset=SchedulePeriod.objects.all())
+    days = serializers.ListField(
+        child=serializers.ChoiceField(choices=WEEKDAYS),
+        allow_empty=False,
+        max_length=len(WEEKDAYS)
+    )
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    dry_run = serializers.BooleanField(required=False, default=False)
+    
+    def validate_schedule_period(self, value):
+        if value.status != 'OPEN':
+            raise serializers.ValidationError(
+                f'Cannot submit requests for {value.status} periods. Period must be OPEN.'
+            )
+        return value
+    
+    def validate(self, data):
+        if data['start_time'] == data['end_time']:
+            raise serializers.ValidationError('Start and end time cannot be the same')
+        
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError('start_date must be on or before end_date')
+        
+        return data
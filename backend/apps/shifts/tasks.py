@@ -1,104 +1,93 @@
 from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.conf import settings
+from django.utils import timezone
 from django.utils.html import strip_tags
+from apps.users.mail import build_message, build_messages, send_messages
 
 
 @shared_task
 def send_new_request_email(request_id):
     from .models import ShiftRequest
     try:
-        shift_request = ShiftRequest.objects.get(id=request_id)
-        admin_users = shift_request.requested_by.__class__.objects.filter(role='ADMIN')
+        shift_request = ShiftRequest.objects.select_related('requested_by', 'schedule_period').get(id=request_id)
+        admin_users = list(shift_request.requested_by.__class__.objects.filter(role='ADMIN'))
         
-        for admin in admin_users:
-            context = {
-                'pa_name': shift_request.requested_by.get_full_name(),
-                'date': shift_request.date.strftime('%B %d, %Y'),
-                'start_time': shift_request.start_time.strftime('%I:%M %p'),
-                'end_time': shift_request.end_time.strftime('%I:%M %p'),
-                'duration': shift_request.duration_hours,
-                'notes': shift_request.notes,
-                'period_name': shift_request.schedule_period.name,
-            }
-            
-            html_message = render_to_string('emails/new_request_admin.html', context)
-            plain_message = render_to_string('emails/new_request_admin.txt', context)
-            
-            send_mail(
-                subject=f'New Shift Request from {shift_request.requested_by.get_full_name()}',
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[admin.email],
-                html_message=html_message,
-                fail_silently=False,
-            )
+        context = {
+            'pa_name': shift_request.requested_by.get_full_name(),
+            'pa_email': shift_request.requested_by.email,
+            'shift_date': shift_request.date.strftime('%B %d, %Y'),
+            'start_time': shift_request.start_time.strftime('%I:%M %p'),
+            'end_time': shift_request.end_time.strftime('%I:%M %p'),
+            'duration': shift_request.duration_hours,
+            'pa_notes': shift_request.notes,
+            'period_name': shift_request.schedule_period.name,
+            'submitted_at': timezone.localtime(shift_request.created_at).strftime('%B %d, %Y %I:%M %p'),
+            'frontend_url': settings.FRONTEND_URL,
+        }
+        
+        # Rendered once for the event; only the greeting is filled in per admin
+        messages = build_messages(
+            f'New Shift Request from {shift_request.requested_by.get_full_name()}',
+            'new_request_admin', context,
+            [admin.email for admin in admin_users],
+            recipient_context={admin.email: {'admin_name': admin.first_name or 'Admin'} for admin in admin_users}
+        )
+        send_messages(messages, 'new_request')
     except Exception as e:
         print(f"Error sending new request email: {e}")
 
 
+def shift_approved_message(shift):
+    context = {
+        'pa_name': shift.requested_by.first_name,
+        'admin_name': shift.approved_by.get_full_name() if shift.approved_by else 'Admin',
+        'date': shift.date.strftime('%B %d, %Y'),
+        'start_time': shift.start_time.strftime('%I:%M %p'),
+        'end_time': shift.end_time.strftime('%I:%M %p'),
+        'duration': shift.duration_hours,
+        'period_name': shift.schedule_period.name,
+        'admin_notes': shift.admin_notes,
+        'schedule_url': f'{settings.FRONTEND_URL}/schedule',
+    }
+    return build_message(
+        'Your Shift Request Has Been Approved',
+        'shift_approved', context, [shift.requested_by.email]
+    )
+
+
 @shared_task
 def send_shift_approved_email(shift_id):
     from .models import ShiftRequest
     try:
-        shift = ShiftRequest.objects.get(id=shift_id)
-        
-        context = {
-            'pa_name': shift.requested_by.first_name,
-            'admin_name': shift.approved_by.get_full_name() if shift.approved_by else 'Admin',
-            'date': shift.date.strftime('%B %d, %Y'),
-            'start_time': shift.start_time.strftime('%I:%M %p'),
-            'end_time': shift.end_time.strftime('%I:%M %p'),
-            'duration': shift.duration_hours,
-            'period_name': shift.schedule_period.name,
-            'admin_notes': shift.admin_notes,
-            'schedule_url': f'{settings.FRONTEND_URL}/schedule',
-        }
-        
-        html_message = render_to_string('emails/shift_approved.html', context)
-        plain_message = render_to_string('emails/shift_approved.txt', context)
-        
-        send_mail(
-            subject='Your Shift Request Has Been Approved',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[shift.requested_by.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
+        shift = ShiftRequest.objects.select_related('requested_by', 'approved_by', 'schedule_period').get(id=shift_id)
+        send_messages([shift_approved_message(shift)], 'shift_approved')
     except Exception as e:
         print(f"Error sending approval email: {e}")
 
 
+def shift_rejected_message(shift):
+    context = {
+        'pa_name': shift.requested_by.first_name,
+        'date': shift.date.strftime('%B %d, %Y'),
+        'start_time': shift.start_time.strftime('%I:%M %p'),
+        'end_time': shift.end_time.strftime('%I:%M %p'),
+        'duration': shift.duration_hours,
+        'period_name': shift.schedule_period.name,
+        'rejected_reason': shift.rejected_reason,
+        'new_request_url': f'{settings.FRONTEND_URL}/requests/new',
+    }
+    return build_message(
+        'Shift Request Not Approved',
+        'shift_rejected', context, [shift.requested_by.email]
+    )
+
+
 @shared_task
 def send_shift_rejected_email(shift_id):
     from .models import ShiftRequest
     try:
-        shift = ShiftRequest.objects.get(id=shift_id)
-        
-        context = {
-            'pa_name': shift.requested_by.first_name,
-            'date': shift.date.strftime('%B %d, %Y'),
-            'start_time': shift.start_time.strftime('%I:%M %p'),
-            'end_time': shift.end_time.strftime('%I:%M %p'),
-            'duration': shift.duration_hours,
-            'period_name': shift.schedule_period.name,
-            'rejected_reason': shift.rejected_reason,
-            'new_request_url': f'{settings.FRONTEND_URL}/requests/new',
-        }
-        
-        html_message = render_to_string('emails/shift_rejected.html', context)
-        plain_message = render_to_string('emails/shift_rejected.txt', context)
-        
-        send_mail(
-            subject='Shift Request Not Approved',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[shift.requested_by.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
+        shift = ShiftRequest.objects.select_related('requested_by', 'schedule_period').get(id=shift_id)
+        send_messages([shift_rejected_message(shift)], 'shift_rejected')
     except Exception as e:
         print(f"Error sending rejection email: {e}")
 
@@ -120,17 +109,11 @@ def send_shift_suggestion_email(suggestion_id):
             'dashboard_url': f'{settings.FRONTEND_URL}/dashboard',
         }
         
-        html_message = render_to_string('emails/shift_suggested.html', context)
-        plain_message = render_to_string('emails/shift_suggested.txt', context)
-        
-        send_mail(
-            subject=f'Shift Suggestion from {suggestion.suggested_by.get_full_name()}',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[suggestion.suggested_to.email],
-            html_message=html_message,
-            fail_silently=False,
+        message = build_message(
+            f'Shift Suggestion from {suggestion.suggested_by.get_full_name()}',
+            'shift_suggested', context, [suggestion.suggested_to.email]
         )
+        send_messages([message], 'shift_suggested')
     except Exception as e:
         print(f"Error sending suggestion email: {e}")
 
@@ -150,17 +133,11 @@ def notify_admin_suggestion_accepted(suggestion_id):
             'requests_url': f'{settings.FRONTEND_URL}/requests',
         }
         
-        html_message = render_to_string('emails/suggestion_accepted.html', context)
-        plain_message = render_to_string('emails/suggestion_accepted.txt', context)
-        
-        send_mail(
-            subject=f'{suggestion.suggested_to.get_full_name()} Accepted Your Shift Suggestion',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[suggestion.suggested_by.email],
-            html_message=html_message,
-            fail_silently=False,
+        message = build_message(
+            f'{suggestion.suggested_to.get_full_name()} Accepted Your Shift Suggestion',
+            'suggestion_accepted', context, [suggestion.suggested_by.email]
         )
+        send_messages([message], 'suggestion_accepted')
     except Exception as e:
         print(f"Error sending accepted notification: {e}")
 
@@ -180,17 +157,11 @@ def notify_admin_suggestion_declined(suggestion_id):
             'reason': suggestion.decline_reason,
         }
         
-        html_message = render_to_string('emails/suggestion_declined.html', context)
-        plain_message = render_to_string('emails/suggestion_declined.txt', context)
-        
-        send_mail(
-            subject=f'{suggestion.suggested_to.get_full_name()} Declined Your Shift Suggestion',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[suggestion.suggested_by.email],
-            html_message=html_message,
-            fail_silently=False,
+        message = build_message(
+            f'{suggestion.suggested_to.get_full_name()} Declined Your Shift Suggestion',
+            'suggestion_declined', context, [suggestion.suggested_by.email]
         )
+        send_messages([message], 'suggestion_declined')
     except Exception as e:
         print(f"Error sending declined notification: {e}")
 
@@ -218,17 +189,11 @@ def send_shift_edited_notification(shift_id, old_date, old_start_time, old_end_t
             'schedule_url': f'{settings.FRONTEND_URL}/schedule',
         }
         
-        html_message = render_to_string('emails/shift_edited.html', context)
-        plain_message = render_to_string('emails/shift_edited.txt', context)
-        
-        send_mail(
-            subject='Your Shift Has Been Updated',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[shift.requested_by.email],
-            html_message=html_message,
-            fail_silently=False,
+        message = build_message(
+            'Your Shift Has Been Updated',
+            'shift_edited', context, [shift.requested_by.email]
         )
+        send_messages([message], 'shift_edited')
     except Exception as e:
         print(f"Error sending shift edited email: {e}")
 
@@ -237,8 +202,8 @@ def send_shift_edited_notification(shift_id, old_date, old_start_time, old_end_t
 def send_shift_cancelled_by_pa_notification(shift_id, cancellation_reason):
     from .models import ShiftRequest
     try:
-        shift = ShiftRequest.objects.get(id=shift_id)
-        admin_users = shift.requested_by.__class__.objects.filter(role='ADMIN')
+        shift = ShiftRequest.objects.select_related('requested_by').get(id=shift_id)
+        admin_users = list(shift.requested_by.__class__.objects.filter(role='ADMIN'))
         
         coverage_warning = ''
         from datetime import time
@@ -247,59 +212,147 @@ def send_shift_cancelled_by_pa_notification(shift_id, cancellation_reason):
         elif (shift.start_time <= time(21, 0) and shift.end_time >= time(22, 0)):
             coverage_warning = '⚠️ WARNING: This shift covered the critical EVENING time slot (9-10 PM). This date may now have a coverage gap.'
         
-        for admin in admin_users:
-            context = {
-                'admin_name': admin.first_name,
-                'pa_name': shift.requested_by.get_full_name(),
-                'date': shift.date.strftime('%B %d, %Y'),
-                'start_time': shift.start_time.strftime('%I:%M %p'),
-                'end_time': shift.end_time.strftime('%I:%M %p'),
-                'duration': shift.duration_hours,
-                'cancellation_reason': cancellation_reason,
-                'coverage_warning': coverage_warning,
-                'schedule_url': f'{settings.FRONTEND_URL}/schedule',
-            }
-            
-            html_message = render_to_string('emails/shift_cancelled_by_pa.html', context)
-            plain_message = render_to_string('emails/shift_cancelled_by_pa.txt', context)
-            
-            send_mail(
-                subject=f'⚠️ Shift Cancelled by {shift.requested_by.get_full_name()}',
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[admin.email],
-                html_message=html_message,
-                fail_silently=False,
-            )
+        context = {
+            'pa_name': shift.requested_by.get_full_name(),
+            'date': shift.date.strftime('%B %d, %Y'),
+            'start_time': shift.start_time.strftime('%I:%M %p'),
+            'end_time': shift.end_time.strftime('%I:%M %p'),
+            'duration': shift.duration_hours,
+            'cancellation_reason': cancellation_reason,
+            'coverage_warning': coverage_warning,
+            'schedule_url': f'{settings.FRONTEND_URL}/schedule',
+        }
+        
+        # Rendered once for the event; only the greeting is filled in per admin
+        messages = build_messages(
+            f'⚠️ Shift Cancelled by {shift.requested_by.get_full_name()}',
+            'shift_cancelled_by_pa', context,
+            [admin.email for admin in admin_users],
+            recipient_context={admin.email: {'admin_name': admin.first_name} for admin in admin_users}
+        )
+        send_messages(messages, 'shift_cancelled_by_pa')
     except Exception as e:
         print(f"Error sending PA cancellation email: {e}")
 
 
+def shift_cancelled_by_admin_message(shift, cancellation_reason):
+    context = {
+        'pa_name': shift.requested_by.first_name,
+        'date': shift.date.strftime('%B %d, %Y'),
+        'start_time': shift.start_time.strftime('%I:%M %p'),
+        'end_time': shift.end_time.strftime('%I:%M %p'),
+        'cancellation_reason': cancellation_reason,
+        'schedule_url': f'{settings.FRONTEND_URL}/schedule',
+    }
+    return build_message(
+        'Your Shift Has Been Cancelled',
+        'shift_cancelled_by_admin', context, [shift.requested_by.email]
+    )
+
+
 @shared_task
 def send_shift_cancelled_by_admin_notification(shift_id, cancellation_reason):
     from .models import ShiftRequest
     try:
-        shift = ShiftRequest.objects.get(id=shift_id)
+        shift = ShiftRequest.objects.select_related('requested_by').get(id=shift_id)
+        send_messages([shift_cancelled_by_admin_message(shift, cancellation_reason)], 'shift_cancelled_by_admin')
+    except Exception as e:
+        print(f"Error sending admin cancellation email: {e}")
+
+
+@shared_task
+def send_requests_closed_email(pa_id, shift_ids):
+    """One email listing every pending request closed when a period was finalized"""
+    from .models import ShiftRequest
+    from apps.users.models import User
+    try:
+        pa = User.objects.get(id=pa_id)
+        shifts = ShiftRequest.objects.filter(id__in=shift_ids).select_related('schedule_period').order_by('date', 'start_time')
         
         context = {
-            'pa_name': shift.requested_by.first_name,
-            'date': shift.date.strftime('%B %d, %Y'),
-            'start_time': shift.start_time.strftime('%I:%M %p'),
-            'end_time': shift.end_time.strftime('%I:%M %p'),
-            'cancellation_reason': cancellation_reason,
+            'pa_name': pa.first_name,
+            'period_names': sorted({shift.schedule_period.name for shift in shifts}),
+            'shifts': [
+                {
+                    'date': shift.date.strftime('%B %d, %Y'),
+                    'start_time': shift.start_time.strftime('%I:%M %p'),
+                    'end_time': shift.end_time.strftime('%I:%M %p'),
+                    'duration': shift.duration_hours,
+                }
+                for shift in shifts
+            ],
             'schedule_url': f'{settings.FRONTEND_URL}/schedule',
         }
         
-        html_message = render_to_string('emails/shift_cancelled_by_admin.html', context)
-        plain_message = render_to_string('emails/shift_cancelled_by_admin.txt', context)
+        message = build_message(
+            'Schedule Finalized - Pending Requests Closed',
+            'requests_closed', context, [pa.email]
+        )
+        send_messages([message], 'requests_closed')
+    except Exception as e:
+        print(f"Error sending requests closed email: {e}")
+
+
+@shared_task
+def send_bulk_action_notifications(action, shift_ids, reason=''):
+    """Send the per-shift emails for a bulk approve/reject/cancel as one batch"""
+    from .models import ShiftRequest
+    try:
+        shifts = ShiftRequest.objects.filter(id__in=shift_ids).select_related(
+            'requested_by', 'approved_by', 'schedule_period'
+        ).order_by('id')
+        
+        if action == 'approve':
+            messages = [shift_approved_message(shift) for shift in shifts]
+        elif action == 'reject':
+            messages = [shift_rejected_message(shift) for shift in shifts]
+        else:
+            messages = [shift_cancelled_by_admin_message(shift, reason) for shift in shifts]
+        
+        send_messages(messages, f'bulk_{action}')
+    except Exception as e:
+        print(f"Error sending bulk {action} emails: {e}")
+
+
+@shared_task
+def send_recurring_requests_email(shift_ids):
+    """One email to each admin for a batch of recurring requests, instead of one per shift"""
+    from .models import ShiftRequest
+    from apps.users.models import User
+    try:
+        shifts = list(
+            ShiftRequest.objects.filter(id__in=shift_ids)
+            .select_related('requested_by', 'schedule_period')
+            .order_by('date', 'start_time')
+        )
+        if not shifts:
+            return
+        
+        pa = shifts[0].requested_by
+        context = {
+            'pa_name': pa.get_full_name(),
+            'pa_email': pa.email,
+            'period_name': shifts[0].schedule_period.name,
+            'notes': shifts[0].notes,
+            'shifts': [
+                {
+                    'date': shift.date.strftime('%a, %B %d, %Y'),
+                    'start_time': shift.start_time.strftime('%I:%M %p'),
+                    'end_time': shift.end_time.strftime('%I:%M %p'),
+                    'duration': shift.duration_hours,
+                }
+                for shift in shifts
+            ],
+            'frontend_url': settings.FRONTEND_URL,
+        }
         
-        send_mail(
-            subject='Your Shift Has Been Cancelled',
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[shift.requested_by.email],
-            html_message=html_message,
-            fail_silently=False,
+        admins = list(User.objects.filter(role='ADMIN'))
+        messages = build_messages(
+            f'{len(shifts)} New Shift Requests from {pa.get_full_name()}',
+            'recurring_requests_admin', context,
+            [admin.email for admin in admins],
+            recipient_context={admin.email: {'admin_name': admin.first_name or 'Admin'} for admin in admins}
         )
+        send_messages(messages, 'recurring_requests')
     except Exception as e:
-        print(f"Error sending admin cancellation email: {e}")
\ No newline at end of file
+        print(f"Error sending recurring requests email: {e}")
@@ -1,3 +1,215 @@
-from django.test import TestCase
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time, timedelta
+import json
+import random
+from apps.users.models import User
+from apps.schedules.models import SchedulePeriod
+from apps.shifts.models import ShiftRequest
+from apps.shifts.approvals import approve_shift, ApprovalConflict, ApprovalError
+from apps.shifts.conflicts import ApprovedIntervals, shift_span
+from apps.coverage.models import WeeklyCoverage
+from apps.coverage.utils import reconcile_weekly_coverage
 
-# Create your tests here.
+
+def _scans(plan):
+    """Yield (node type, relation, index) for every node of an EXPLAIN (FORMAT JSON) plan"""
+    yield plan.get('Node Type'), plan.get('Relation Name'), plan.get('Index Name')
+    for child in plan.get('Plans', []):
+        yield from _scans(child)
+
+
+class QueryPlanTests(TestCase):
+    """
+    The scheduling hot-path queries use an index, never a sequential scan,
+    on a realistically sized table with fresh planner statistics
+    """
+    days = 3650
+    pa_count = 50
+    # Tables whose hot queries must never fall back to a sequential scan
+    checked_tables = {'shift_requests', 'weekly_coverage'}
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(42)
+        start_date = timezone.now().date()
+        end_date = start_date + timedelta(days=cls.days - 1)
+
+        admin = User.objects.create(email='admin@example.com', role='ADMIN', first_name='Plan', last_name='Admin')
+        pas = User.objects.bulk_create([
+            # bulk_create skips User.save(), which normally fills in the username
+            User(username=f'pa{n}', email=f'pa{n}@example.com', role='PA', first_name='Plan', last_name=f'PA {n}')
+            for n in range(cls.pa_count)
+        ])
+        periods = SchedulePeriod.objects.bulk_create([
+            SchedulePeriod(
+                name=f'Plan period {n}',
+                start_date=start_date + timedelta(days=n * 14),
+                end_date=start_date + timedelta(days=n * 14 + 13),
+                created_by=admin
+            )
+            for n in range((cls.days + 13) // 14)
+        ])
+
+        shifts = []
+        day = start_date
+        while day <= end_date:
+            period = periods[(day - start_date).days // 14]
+            # Three back-to-back approved shifts (they may not overlap) and a few other requests
+            for start_hour, end_hour in [(0, 8), (8, 16), (16, 0)]:
+                shifts.append((period, rng.choice(pas), day, time(start_hour), time(end_hour), 'APPROVED'))
+            for status in ['PENDING', 'REJECTED', 'CANCELLED', 'PENDING']:
+                start_hour = rng.randrange(24)
+                shifts.append((period, rng.choice(pas), day, time(start_hour), time((start_hour + 6) % 24), status))
+            day += timedelta(days=1)
+
+        rows = []
+        for period, pa, date, start_time, end_time, status in shifts:
+            shift = ShiftRequest(
+                schedule_period=period, requested_by=pa, date=date,
+                start_time=start_time, end_time=end_time, status=status
+            )
+            shift.update_duration()
+            shift.update_span()
+            rows.append(shift)
+        ShiftRequest.objects.bulk_create(rows, batch_size=5000)
+        reconcile_weekly_coverage(start_date, end_date, batch_size=5000)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE shift_requests')
+            cursor.execute('ANALYZE weekly_coverage')
+
+        cls.day = start_date + timedelta(days=cls.days // 2)
+        cls.pa = pas[0]
+        cls.period = periods[len(periods) // 2]
+
+    def hot_queries(self):
+        """(name, queryset) for each query shape the scheduling code runs often"""
+        day, pa, period = self.day, self.pa, self.period
+        starts_at, ends_at = shift_span(day, time(6), time(14))
+        week_start = day - timedelta(days=day.weekday())
+        month_start = day.replace(day=1)
+
+        return [
+            ('conflict check', ShiftRequest.objects.filter(
+                status='APPROVED', starts_at__lt=ends_at, ends_at__gt=starts_at
+            )),
+            ('critical coverage for a day', ShiftRequest.objects.filter(
+                date__gte=day - timedelta(days=1), date__lte=day + timedelta(days=1), status='APPROVED'
+            ).order_by('date', 'start_time', 'id')),
+            ('calendar month', ShiftRequest.objects.filter(
+                date__gte=month_start, date__lte=month_start + timedelta(days=41),
+                status__in=['APPROVED', 'PENDING']
+            ).order_by('date', 'start_time')),
+            ('weekly hours', ShiftRequest.objects.filter(
+                requested_by=pa, status='APPROVED', date__gte=week_start, date__lte=week_start + timedelta(days=6)
+            )),
+            ('PA shift history', ShiftRequest.objects.filter(
+                requested_by=pa, status='APPROVED', date__gte=day - timedelta(days=90)
+            )),
+            ('period status summary', ShiftRequest.objects.filter(
+                schedule_period=period
+            ).values('status').annotate(count=Count('id')).order_by()),
+            ('finalize pending chunk', ShiftRequest.objects.filter(
+                schedule_period=period, status='PENDING'
+            ).order_by('id')[:500]),
+            ('weekly canonical row', WeeklyCoverage.objects.filter(
+                pa=pa, week_start_date=week_start
+            ).order_by('id')[:1]),
+            ('weekly reconcile range', WeeklyCoverage.objects.filter(
+                week_start_date__gte=week_start - timedelta(weeks=8),
+                week_start_date__lte=week_start + timedelta(weeks=8)
+            )),
+        ]
+
+    def test_hot_queries_use_an_index(self):
+        for name, queryset in self.hot_queries():
+            with self.subTest(query=name):
+                plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+                seq_scans = [
+                    relation for node, relation, _ in _scans(plan)
+                    if node == 'Seq Scan' and relation in self.checked_tables
+                ]
+                self.assertEqual(seq_scans, [], f'{name} uses a sequential scan:\n{json.dumps(plan, indent=2)}')
+
+
+@override_settings(COVERAGE_SYNC_UPDATES=True)
+class ConcurrentApprovalTests(TransactionTestCase):
+    """
+    Approving overlapping pending shifts from many threads at once leaves no
+    overlapping approvals and no lost weekly-hours updates. Each thread has
+    its own connection and commits, hence TransactionTestCase.
+    """
+    days = 3
+    per_day = 8
+    threads = 8
+
+    def setUp(self):
+        rng = random.Random(42)
+        self.start_date = timezone.now().date() + timedelta(days=7)
+        self.end_date = self.start_date + timedelta(days=self.days - 1)
+
+        self.admin = User.objects.create(email='admin@example.com', role='ADMIN', first_name='Stress', last_name='Admin')
+        pas = [
+            User.objects.create(email=f'pa{n}@example.com', role='PA', first_name='Stress', last_name=f'PA {n}')
+            for n in range(4)
+        ]
+        self.period = SchedulePeriod.objects.create(
+            name='Approval stress test', start_date=self.start_date, end_date=self.end_date, created_by=self.admin
+        )
+        self.shifts = []
+        day = self.start_date
+        while day <= self.end_date:
+            for n in range(self.per_day):
+                start_hour = 5 + n * 2 % 16
+                self.shifts.append(ShiftRequest.objects.create(
+                    schedule_period=self.period,
+                    requested_by=pas[n % len(pas)],
+                    date=day,
+                    start_time=time(start_hour, 30 * (n % 2)),
+                    end_time=time((start_hour + 4) % 24, 0)
+                ))
+            # Overnight shift competing with the next morning's shifts
+            self.shifts.append(ShiftRequest.objects.create(
+                schedule_period=self.period, requested_by=rng.choice(pas), date=day,
+                start_time=time(22, 0), end_time=time(7, 0)
+            ))
+            day += timedelta(days=1)
+
+        # Every shift is approved twice, from different threads, in random order
+        self.attempts = [shift for shift in self.shifts for _ in range(2)]
+        rng.shuffle(self.attempts)
+
+    def approve(self, shift):
+        try:
+            approve_shift(shift, self.admin)
+            return 'approved'
+        except ApprovalConflict:
+            return 'conflict'
+        except ApprovalError:
+            return 'not pending'
+        finally:
+            connection.close()
+
+    def test_parallel_approvals_never_overlap(self):
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            outcomes = list(pool.map(self.approve, self.attempts))
+
+        approved = list(ShiftRequest.objects.filter(schedule_period=self.period, status='APPROVED'))
+        intervals = ApprovedIntervals(approved)
+        overlaps = [
+            (shift.id, other.id)
+            for shift in approved
+            for other in intervals.overlapping(shift.starts_at, shift.ends_at)
+            if other.id > shift.id
+        ]
+        self.assertEqual(overlaps, [])
+        # Every reported approval stuck, and no shift was approved twice
+        self.assertTrue(approved)
+        self.assertEqual(outcomes.count('approved'), len(approved))
+
+        drift = reconcile_weekly_coverage(self.start_date, self.end_date, dry_run=True)['changes']
+        self.assertEqual(drift, [])
@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ShiftRequestViewSet, ShiftSuggestionViewSet
+from .views import ShiftRequestViewSet, ShiftSuggestionViewSet, AvailabilityCheckAPI
 
 router = DefaultRouter()
 router.register(r'requests', ShiftRequestViewSet, basename='shift-request')
 router.register(r'suggestions', ShiftSuggestionViewSet, basename='shift-suggestion')
 
 urlpatterns = [
+    path('availability/check/', AvailabilityCheckAPI.as_view(), name='availability-check'),
     path('', include(router.urls)),
 ]
@@ -1,18 +1,39 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
+from django.db import transaction, IntegrityError
 from django.utils import timezone
 from datetime import datetime, timedelta
 from .models import ShiftRequest, ShiftSuggestion
+from .conflicts import (
+    find_conflicts,
+    serialize_conflict,
+    describe_conflicts,
+    is_overlap_violation,
+    check_availability,
+    lock_dates,
+    shift_lock_dates
+)
+from apps.coverage.utils import project_weekly_hours
 from .serializers import (
     ShiftRequestSerializer, 
     ShiftRequestCreateSerializer,
     ShiftSuggestionSerializer, 
     ShiftSuggestionCreateSerializer,
     ShiftSuggestionAcceptSerializer, 
-    ShiftSuggestionDeclineSerializer
+    ShiftSuggestionDeclineSerializer,
+    AvailabilityCheckSerializer,
+    BulkShiftActionSerializer,
+    RecurringShiftRequestSerializer
 )
+from .approvals import approve_shift, describe_overtime, ApprovalConflict, ApprovalError
+from .bulk import apply_bulk_action, BulkActionError
+from .pagination import KeysetPagination
+from .recurring import create_recurring_requests
 from .tasks import (
     send_new_request_email, 
     send_shift_approved_email, 
@@ -26,48 +47,98 @@ from .tasks import (
 )
 
 
-def check_time_conflict(date, start_time, end_time, exclude_shift_id=None):
-    """
-    Check if requested time conflicts with any APPROVED shift.
-    Only APPROVED shifts block new requests (PENDING doesn't block).
-    
-    Returns: (has_conflict: bool, conflicting_shift: ShiftRequest or None)
+def conflict_response(error, detail, conflicts):
+    """400 response listing every conflicting approved shift"""
+    return Response({
+        'error': error,
+        'detail': detail,
+        'conflict': serialize_conflict(conflicts[0]) if conflicts else None,
+        'conflicts': [serialize_conflict(shift) for shift in conflicts]
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AvailabilityCheckAPI(APIView):
     """
-    conflicts = ShiftRequest.objects.filter(
-        date=date,
-        status='APPROVED'
-    )
-    
-    if exclude_shift_id:
-        conflicts = conflicts.exclude(id=exclude_shift_id)
+    Check many candidate slots against approved shifts in one request.
     
-    requested_start = datetime.combine(date, start_time)
-    requested_end = datetime.combine(date, end_time)
+    POST /api/shifts/availability/check/
+    Body: {"slots": [{"date": "2025-11-03", "start_time": "06:00", "end_time": "10:00"}, ...]}
     
-    if requested_end <= requested_start:
-        requested_end += timedelta(days=1)
+    Returns one result per slot, in order, with whether it is free, the approved
+    shifts it conflicts with and the critical windows it would cover.
+    """
+    permission_classes = [IsAuthenticated]
     
-    for shift in conflicts:
-        shift_start = datetime.combine(shift.date, shift.start_time)
-        shift_end = datetime.combine(shift.date, shift.end_time)
+    def post(self, request):
+        serializer = AvailabilityCheckSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
-        if shift_end <= shift_start:
-            shift_end += timedelta(days=1)
+        results = check_availability(serializer.validated_data['slots'])
+        available_count = sum(1 for result in results if result['available'])
         
-        if requested_start < shift_end and requested_end > shift_start:
-            return True, shift
-    
-    return False, None
+        return Response({
+            'slots': results,
+            'available_count': available_count,
+            'taken_count': len(results) - available_count
+        })
 
 
 class ShiftRequestViewSet(viewsets.ModelViewSet):
+    """
+    Listing filters: status (comma separated), start_date, end_date (YYYY-MM-DD),
+    period_id and pa_id (admins only).
+    Pass ?pagination=cursor (or a cursor from a previous page) for keyset
+    pagination on (created_at, id) instead of page numbers.
+    """
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
-        if user.role == 'ADMIN':
-            return ShiftRequest.objects.all()
-        return ShiftRequest.objects.filter(requested_by=user)
+        # The serializer reads all three relations, so join them up front
+        queryset = ShiftRequest.objects.select_related('requested_by', 'approved_by', 'schedule_period')
+        if user.role != 'ADMIN':
+            queryset = queryset.filter(requested_by=user)
+        
+        if self.action == 'list':
+            queryset = self.filter_list(queryset).order_by('-created_at', '-id')
+        
+        return queryset
+    
+    def filter_list(self, queryset):
+        params = self.request.query_params
+        
+        status_filter = params.get('status')
+        if status_filter:
+            statuses = [value.strip().upper() for value in status_filter.split(',') if value.strip()]
+            valid = {choice for choice, _ in ShiftRequest.STATUS_CHOICES}
+            if not set(statuses) <= valid:
+                raise ValidationError({'status': f'Must be one of {", ".join(sorted(valid))}'})
+            queryset = queryset.filter(status__in=statuses)
+        
+        for param, lookup in [('start_date', 'date__gte'), ('end_date', 'date__lte')]:
+            if params.get(param):
+                try:
+                    value = datetime.strptime(params[param], '%Y-%m-%d').date()
+                except ValueError:
+                    raise ValidationError({param: 'Invalid date format. Use YYYY-MM-DD'})
+                queryset = queryset.filter(**{lookup: value})
+        
+        for param, field in [('period_id', 'schedule_period_id'), ('pa_id', 'requested_by_id')]:
+            if params.get(param):
+                try:
+                    queryset = queryset.filter(**{field: int(params[param])})
+                except ValueError:
+                    raise ValidationError({param: 'Must be an integer'})
+        
+        return queryset
+    
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.request is not None:
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or KeysetPagination.cursor_query_param in params:
+                self._paginator = KeysetPagination()
+        return super().paginator
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -82,20 +153,14 @@ class ShiftRequestViewSet(viewsets.ModelViewSet):
         start_time = serializer.validated_data['start_time']
         end_time = serializer.validated_data['end_time']
         
-        has_conflict, conflicting_shift = check_time_conflict(date, start_time, end_time)
+        conflicts = find_conflicts(date, start_time, end_time)
         
-        if has_conflict:
-            return Response({
-                'error': 'Time slot already taken',
-                'detail': f'This time conflicts with an approved shift by {conflicting_shift.requested_by.get_full_name()} ({conflicting_shift.start_time.strftime("%I:%M %p")} - {conflicting_shift.end_time.strftime("%I:%M %p")})',
-                'conflict': {
-                    'shift_id': conflicting_shift.id,
-                    'pa_name': conflicting_shift.requested_by.get_full_name(),
-                    'date': str(conflicting_shift.date),
-                    'start_time': str(conflicting_shift.start_time),
-                    'end_time': str(conflicting_shift.end_time)
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
+        if conflicts:
+            return conflict_response(
+                'Time slot already taken',
+                f'This time conflicts with {describe_conflicts(conflicts)}',
+                conflicts
+            )
         
         self.perform_create(serializer)
         headers = self.get_success_url(serializer) if hasattr(self, 'get_success_url') else {}
@@ -105,6 +170,48 @@ class ShiftRequestViewSet(viewsets.ModelViewSet):
         shift_request = serializer.save(requested_by=self.request.user)
         send_new_request_email.delay(shift_request.id)
     
+    @action(detail=False, methods=['post'])
+    def recurring(self, request):
+        """
+        Create pending requests for a weekly pattern across a schedule period.
+        
+        POST /api/shifts/requests/recurring/
+        Body: {"schedule_period": 1, "days": ["monday", "wednesday"],
+               "start_time": "06:00", "end_time": "14:00", "dry_run": false}
+        
+        Dates that conflict with approved shifts (or are in the past) are
+        skipped and listed with the reason; the rest are created together.
+        """
+        serializer = RecurringShiftRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        created, skipped = create_recurring_requests(
+            request.user,
+            data['schedule_period'],
+            data['days'],
+            data['start_time'],
+            data['end_time'],
+            notes=data['notes'],
+            start_date=data.get('start_date'),
+            end_date=data.get('end_date'),
+            dry_run=data['dry_run']
+        )
+        
+        if not created and not data['dry_run']:
+            return Response({
+                'error': 'No shifts could be requested for this pattern',
+                'skipped': skipped
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'dry_run': data['dry_run'],
+            'created_count': len(created),
+            'skipped_count': len(skipped),
+            'created': ShiftRequestSerializer(created, many=True).data,
+            'skipped': skipped
+        }, status=status.HTTP_200_OK if data['dry_run'] else status.HTTP_201_CREATED)
+    
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         if request.user.role != 'ADMIN':
@@ -114,35 +221,98 @@ class ShiftRequestViewSet(viewsets.ModelViewSet):
         if shift_request.status != 'PENDING':
             return Response({'error': 'Can only approve pending requests'}, status=status.HTTP_400_BAD_REQUEST)
         
-        has_conflict, conflicting_shift = check_time_conflict(
+        try:
+            shift_request, overtime = approve_shift(
+                shift_request,
+                request.user,
+                admin_notes=request.data.get('admin_notes', '')
+            )
+        except ApprovalConflict as e:
+            return conflict_response(
+                'Cannot approve - time slot conflict',
+                f'This shift conflicts with {describe_conflicts(e.conflicts)}',
+                e.conflicts
+            )
+        except ApprovalError as e:
+            return Response(e.payload, status=status.HTTP_400_BAD_REQUEST)
+        
+        send_shift_approved_email.delay(shift_request.id)
+        
+        data = ShiftRequestSerializer(shift_request).data
+        if overtime['exceeds_limit']:
+            data['overtime_warning'] = describe_overtime(overtime)
+            data['overtime'] = overtime
+        
+        return Response(data)
+    
+    @action(detail=True, methods=['get'], url_path='approve/preview')
+    def approve_preview(self, request, pk=None):
+        """
+        Dry run of approve: the conflicts and projected weekly hours the
+        approval would meet, without changing anything.
+        """
+        if request.user.role != 'ADMIN':
+            return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+        
+        shift_request = self.get_object()
+        
+        conflicts = find_conflicts(
             shift_request.date,
             shift_request.start_time,
             shift_request.end_time,
-            exclude_shift_id=shift_request.id
+            exclude_ids=[shift_request.id]
         )
+        overtime = project_weekly_hours(shift_request)
+        blocked = overtime['exceeds_limit'] and settings.OVERTIME_POLICY == 'block'
+        
+        return Response({
+            'shift_id': shift_request.id,
+            'can_approve': shift_request.status == 'PENDING' and not conflicts and not blocked,
+            'status': shift_request.status,
+            'conflicts': [serialize_conflict(shift) for shift in conflicts],
+            'overtime': overtime,
+            'overtime_policy': settings.OVERTIME_POLICY,
+            'overtime_warning': describe_overtime(overtime) if overtime['exceeds_limit'] else None
+        })
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Approve, reject or cancel many shifts at once; all of them change or none do.
+        
+        POST /api/shifts/requests/bulk/
+        Body: {"action": "approve", "ids": [1, 2, 3], "reason": "", "admin_notes": ""}
+        """
+        if request.user.role != 'ADMIN':
+            return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
         
-        if has_conflict:
+        serializer = BulkShiftActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        try:
+            shifts, overtime = apply_bulk_action(
+                data['action'],
+                data['ids'],
+                request.user,
+                reason=data['reason'],
+                admin_notes=data.get('admin_notes')
+            )
+        except BulkActionError as e:
             return Response({
-                'error': 'Cannot approve - time slot conflict',
-                'detail': f'This shift conflicts with an existing approved shift by {conflicting_shift.requested_by.get_full_name()} ({conflicting_shift.start_time.strftime("%I:%M %p")} - {conflicting_shift.end_time.strftime("%I:%M %p")})',
-                'conflict': {
-                    'shift_id': conflicting_shift.id,
-                    'pa_name': conflicting_shift.requested_by.get_full_name(),
-                    'date': str(conflicting_shift.date),
-                    'start_time': str(conflicting_shift.start_time),
-                    'end_time': str(conflicting_shift.end_time)
-                }
+                'error': f'Cannot {data["action"]} - nothing was changed',
+                'errors': e.errors
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        shift_request.status = 'APPROVED'
-        shift_request.approved_by = request.user
-        shift_request.approved_at = timezone.now()
-        shift_request.admin_notes = request.data.get('admin_notes', '')
-        shift_request.save()
-        
-        send_shift_approved_email.delay(shift_request.id)
+        response = {
+            'action': data['action'],
+            'updated_count': len(shifts),
+            'shifts': ShiftRequestSerializer(shifts, many=True).data
+        }
+        if overtime:
+            response['overtime_warnings'] = overtime
         
-        return Response(ShiftRequestSerializer(shift_request).data)
+        return Response(response)
     
     @action(detail=True, methods=['post'])
     def reject(self, request, pk=None):
@@ -193,35 +363,52 @@ class ShiftRequestViewSet(viewsets.ModelViewSet):
             else:
                 new_end_time = datetime.strptime(new_end_time, '%H:%M').time()
         
-        has_conflict, conflicting_shift = check_time_conflict(
-            new_date,
-            new_start_time,
-            new_end_time,
-            exclude_shift_id=shift_request.id
-        )
-        
-        if has_conflict:
-            return Response({
-                'error': 'Time slot conflict',
-                'detail': f'This time conflicts with an approved shift by {conflicting_shift.requested_by.get_full_name()} ({conflicting_shift.start_time.strftime("%I:%M %p")} - {conflicting_shift.end_time.strftime("%I:%M %p")})',
-                'conflict': {
-                    'shift_id': conflicting_shift.id,
-                    'pa_name': conflicting_shift.requested_by.get_full_name(),
-                    'date': str(conflicting_shift.date),
-                    'start_time': str(conflicting_shift.start_time),
-                    'end_time': str(conflicting_shift.end_time)
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        old_date = str(shift_request.date)
-        old_start_time = str(shift_request.start_time)
-        old_end_time = str(shift_request.end_time)
-        
-        shift_request.date = new_date
-        shift_request.start_time = new_start_time
-        shift_request.end_time = new_end_time
-        shift_request.admin_notes = admin_notes
-        shift_request.save()
+        try:
+            with transaction.atomic():
+                # Same per-date locks as approve, for the dates the shift moves onto
+                lock_dates(shift_lock_dates(new_date, new_start_time, new_end_time))
+                shift_request = ShiftRequest.objects.select_for_update(of=('self',)).get(id=shift_request.id)
+                
+                if shift_request.status != 'APPROVED':
+                    return Response({'error': 'Can only edit approved shifts'}, status=status.HTTP_400_BAD_REQUEST)
+                
+                conflicts = find_conflicts(
+                    new_date,
+                    new_start_time,
+                    new_end_time,
+                    exclude_ids=[shift_request.id]
+                )
+                
+                if conflicts:
+                    return conflict_response(
+                        'Time slot conflict',
+                        f'This time conflicts with {describe_conflicts(conflicts)}',
+                        conflicts
+                    )
+                
+                old_date = str(shift_request.date)
+                old_start_time = str(shift_request.start_time)
+                old_end_time = str(shift_request.end_time)
+                
+                shift_request.date = new_date
+                shift_request.start_time = new_start_time
+                shift_request.end_time = new_end_time
+                shift_request.admin_notes = admin_notes
+                shift_request.save()
+        except IntegrityError as e:
+            if not is_overlap_violation(e):
+                raise
+            conflicts = find_conflicts(
+                new_date,
+                new_start_time,
+                new_end_time,
+                exclude_ids=[shift_request.id]
+            )
+            return conflict_response(
+                'Time slot conflict',
+                f'This time conflicts with {describe_conflicts(conflicts)}',
+                conflicts
+            )
         
         send_shift_edited_notification.delay(shift_request.id, old_date, old_start_time, old_end_time)
         
@@ -283,20 +470,14 @@ class ShiftSuggestionViewSet(viewsets.ModelViewSet):
         start_time = serializer.validated_data['start_time']
         end_time = serializer.validated_data['end_time']
         
-        has_conflict, conflicting_shift = check_time_conflict(date, start_time, end_time)
+        conflicts = find_conflicts(date, start_time, end_time)
         
-        if has_conflict:
-            return Response({
-                'error': 'Time slot already taken',
-                'detail': f'This time conflicts with an approved shift by {conflicting_shift.requested_by.get_full_name()} ({conflicting_shift.start_time.strftime("%I:%M %p")} - {conflicting_shift.end_time.strftime("%I:%M %p")})',
-                'conflict': {
-                    'shift_id': conflicting_shift.id,
-                    'pa_name': conflicting_shift.requested_by.get_full_name(),
-                    'date': str(conflicting_shift.date),
-                    'start_time': str(conflicting_shift.start_time),
-                    'end_time': str(conflicting_shift.end_time)
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
+        if conflicts:
+            return conflict_response(
+                'Time slot already taken',
+                f'This time conflicts with {describe_conflicts(conflicts)}',
+                conflicts
+            )
         
         suggestion = serializer.save(suggested_by=request.user)
         send_shift_suggestion_email.delay(suggestion.id)
@@ -313,38 +494,41 @@ class ShiftSuggestionViewSet(viewsets.ModelViewSet):
         if suggestion.status != 'PENDING':
             return Response({'error': 'Suggestion already responded to'}, status=status.HTTP_400_BAD_REQUEST)
         
-        has_conflict, conflicting_shift = check_time_conflict(
-            suggestion.date,
-            suggestion.start_time,
-            suggestion.end_time
-        )
-        
-        if has_conflict:
-            return Response({
-                'error': 'Cannot accept - time slot now taken',
-                'detail': f'This time now conflicts with an approved shift by {conflicting_shift.requested_by.get_full_name()} ({conflicting_shift.start_time.strftime("%I:%M %p")} - {conflicting_shift.end_time.strftime("%I:%M %p")}). The shift was approved after this suggestion was created.',
-                'conflict': {
-                    'shift_id': conflicting_shift.id,
-                    'pa_name': conflicting_shift.requested_by.get_full_name(),
-                    'date': str(conflicting_shift.date),
-                    'start_time': str(conflicting_shift.start_time),
-                    'end_time': str(conflicting_shift.end_time)
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        shift_request = ShiftRequest.objects.create(
-            schedule_period=suggestion.schedule_period,
-            requested_by=request.user,
-            date=suggestion.date,
-            start_time=suggestion.start_time,
-            end_time=suggestion.end_time,
-            notes=f"Accepted suggestion from {suggestion.suggested_by.get_full_name()}"
-        )
-        
-        suggestion.status = 'ACCEPTED'
-        suggestion.responded_at = timezone.now()
-        suggestion.related_shift_request = shift_request
-        suggestion.save()
+        with transaction.atomic():
+            lock_dates(shift_lock_dates(suggestion.date, suggestion.start_time, suggestion.end_time))
+            suggestion = ShiftSuggestion.objects.select_for_update(of=('self',)).select_related(
+                'suggested_by'
+            ).get(id=suggestion.id)
+            
+            if suggestion.status != 'PENDING':
+                return Response({'error': 'Suggestion already responded to'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            conflicts = find_conflicts(
+                suggestion.date,
+                suggestion.start_time,
+                suggestion.end_time
+            )
+            
+            if conflicts:
+                return conflict_response(
+                    'Cannot accept - time slot now taken',
+                    f'This time now conflicts with {describe_conflicts(conflicts)}. The shift was approved after this suggestion was created.',
+                    conflicts
+                )
+            
+            shift_request = ShiftRequest.objects.create(
+                schedule_period=suggestion.schedule_period,
+                requested_by=request.user,
+                date=suggestion.date,
+                start_time=suggestion.start_time,
+                end_time=suggestion.end_time,
+                notes=f"Accepted suggestion from {suggestion.suggested_by.get_full_name()}"
+            )
+            
+            suggestion.status = 'ACCEPTED'
+            suggestion.responded_at = timezone.now()
+            suggestion.related_shift_request = shift_request
+            suggestion.save()
         
         notify_admin_suggestion_accepted.delay(suggestion.id)
         
@@ -1,8 +1,7 @@
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.conf import settings
 from celery import shared_task
 import logging
+from .mail import build_message, send_messages
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +25,12 @@ def send_verification_email(self, user_id, token):
             'verification_url': verification_url,
         }
         
-        # Render HTML and text versions
-        html_message = render_to_string('emails/verification.html', context)
-        text_message = render_to_string('emails/verification.txt', context)
-        
-        # Send email
-        send_mail(
-            subject='✉️ Verify Your Email - PA Scheduling System',
-            message=text_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
+        # Render HTML and text versions and send
+        message = build_message(
+            '✉️ Verify Your Email - PA Scheduling System',
+            'verification', context, [user.email]
         )
+        send_messages([message], 'verification')
         
         logger.info(f'Verification email sent to {user.email}')
         return f'Email sent to {user.email}'
@@ -67,19 +59,12 @@ def send_password_reset_email(self, user_id, token):
             'reset_url': reset_url,
         }
         
-        # Render HTML and text versions
-        html_message = render_to_string('emails/password_reset.html', context)
-        text_message = render_to_string('emails/password_reset.txt', context)
-        
-        # Send email
-        send_mail(
-            subject='🔐 Password Reset - PA Scheduling System',
-            message=text_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
+        # Render HTML and text versions and send
+        message = build_message(
+            '🔐 Password Reset - PA Scheduling System',
+            'password_reset', context, [user.email]
         )
+        send_messages([message], 'password_reset')
         
         logger.info(f'Password reset email sent to {user.email}')
         return f'Email sent to {user.email}'
@@ -0,0 +1,224 @@
+import functools
+import os
+import smtplib
+import threading
+import time
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+from django.utils.html import conditional_escape
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Stand-in rendered for each per-recipient field; contains nothing autoescape touches
+RECIPIENT_FIELD_MARKER = '[[recipient:{}]]'
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_template(name):
+    """Template parsed once per worker process (the cached loader is off under DEBUG)"""
+    return get_template(name)
+
+
+def render_email(template, context, recipient_fields=()):
+    """
+    Render emails/<template>.txt and .html once.
+
+    Fields named in recipient_fields are rendered as markers for
+    fill_recipient_fields. They must be output plainly ({{ admin_name }}),
+    not through filters or {% if %}, which would act on the marker.
+
+    Returns:
+        (text, html)
+    """
+    context = {**context, **{field: RECIPIENT_FIELD_MARKER.format(field) for field in recipient_fields}}
+    return (
+        compiled_template(f'emails/{template}.txt').render(context),
+        compiled_template(f'emails/{template}.html').render(context),
+    )
+
+
+def fill_recipient_fields(text, html, values):
+    """
+    Substitute one recipient's values for the markers left by render_email,
+    escaped as the template engine would have (it autoescapes .txt too)
+    """
+    for field, value in values.items():
+        marker = RECIPIENT_FIELD_MARKER.format(field)
+        value = conditional_escape(value)
+        text = text.replace(marker, value)
+        html = html.replace(marker, value)
+    return text, html
+
+
+def _message(subject, text, html, recipients):
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=recipients,
+    )
+    message.attach_alternative(html, 'text/html')
+    return message
+
+
+def build_message(subject, template, context, recipients):
+    """
+    Render emails/<template>.txt and .html into one message.
+
+    Args:
+        subject: Subject line
+        template: Template name without extension, e.g. 'shift_approved'
+        context: Template context
+        recipients: List of email addresses
+
+    Returns:
+        EmailMultiAlternatives ready for send_messages
+    """
+    return _message(subject, *render_email(template, context), recipients)
+
+
+def build_messages(subject, template, context, recipients, recipient_context=None):
+    """
+    One message per recipient (so recipients don't see each other's
+    addresses) from a single render of the templates, however many
+    recipients there are.
+
+    Args:
+        subject: Subject line
+        template: Template name without extension
+        context: Template context shared by every recipient
+        recipients: List of email addresses
+        recipient_context: Optional dict of email -> {field: value} for the
+            fields that differ per recipient, e.g. {'admin_name': 'Sam'}
+
+    Returns:
+        List of EmailMultiAlternatives
+    """
+    recipient_context = recipient_context or {}
+    fields = sorted({field for values in recipient_context.values() for field in values})
+    text, html = render_email(template, context, fields)
+
+    return [
+        _message(
+            subject,
+            *fill_recipient_fields(text, html, {field: '' for field in fields} | recipient_context.get(recipient, {})),
+            [recipient]
+        )
+        for recipient in recipients
+    ]
+
+
+class MailDispatcher:
+    """
+    Sends batches of messages over one SMTP connection that stays open for
+    the life of the worker process, so a notification fan-out pays for the
+    TCP and TLS handshake with SES once instead of once per recipient.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connection = None
+        self.pid = None
+        self.last_used = 0
+
+    def get_connection(self):
+        """Open connection for this process, reopened if it has gone stale"""
+        if self.connection is not None and self.pid != os.getpid():
+            # Inherited across a fork: the socket belongs to the parent
+            self.connection = None
+
+        if self.connection is not None:
+            idle = time.monotonic() - self.last_used
+            if idle > settings.EMAIL_CONNECTION_CHECK_SECONDS and not self.is_alive():
+                logger.info(f'Mail connection dropped after {idle:.0f}s idle, reconnecting')
+                self.close()
+
+        if self.connection is None:
+            connection = get_connection(fail_silently=False)
+            # Opening it ourselves stops send_messages() closing it after each batch
+            connection.open()
+            self.connection = connection
+            self.pid = os.getpid()
+
+        return self.connection
+
+    def is_alive(self):
+        smtp = getattr(self.connection, 'connection', None)
+        if smtp is None:
+            # Non-SMTP backends (console, locmem) have nothing to keep alive
+            return True
+        try:
+            return smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+
+    def send_messages(self, messages, event):
+        """
+        Send already-rendered messages in one batch.
+
+        A reused connection the server has since dropped (SES closes idle
+        sessions) fails on the first command; the unsent messages are then
+        retried once on a fresh connection.
+
+        Args:
+            messages: List of EmailMessage
+            event: Short name for the batch in the latency log, e.g. 'new_request'
+
+        Returns:
+            int: Number of messages sent
+
+        Raises the backend's error on failure; the connection is dropped so
+        the next batch starts on a fresh one.
+        """
+        if not messages:
+            return 0
+
+        with self.lock:
+            started = time.perf_counter()
+            previous = self.connection
+            connection = None
+            sent = 0
+            retried = False
+            while True:
+                try:
+                    connection = self.get_connection()
+                    # One call per message so a disconnect part-way through
+                    # knows which ones went out and never resends them
+                    for message in messages[sent:]:
+                        sent += connection.send_messages([message])
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    self.close()
+                    if retried or connection is not previous:
+                        raise
+                    logger.info(f'Mail connection dropped by the server, reconnecting to send {event}')
+                    retried = True
+                except Exception:
+                    self.close()
+                    raise
+            self.last_used = time.monotonic()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        logger.info(
+            f'Mail batch {event}: sent {sent}/{len(messages)} in {elapsed_ms:.0f} ms '
+            f'({"reconnected" if retried else "reused connection" if connection is previous else "new connection"})'
+        )
+        return sent
+
+
+mail_dispatcher = MailDispatcher()
+
+
+def send_messages(messages, event):
+    """Convenience function for sending a batch over the shared connection"""
+    return mail_dispatcher.send_messages(messages, event)
@@ -18,6 +18,14 @@ app.conf.beat_schedule = {
         'task': 'apps.ai.tasks.check_upcoming_coverage',
         'schedule': crontab(hour=6, minute=0),
     },
+    'reconcile-weekly-hours': {
+        'task': 'apps.coverage.tasks.reconcile_weekly_hours',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'prune-change-log': {
+        'task': 'apps.changes.tasks.prune_change_log',
+        'schedule': crontab(hour=3, minute=30),
+    },
     'calculate-pa-patterns': {
         'task': 'apps.users.tasks.calculate_all_pa_patterns',
         'schedule': crontab(day_of_week=1, hour=2, minute=0),
@@ -34,6 +42,8 @@ def task_failure_handler(sender=None, task_id=None, exception=None, args=None, k
 @signals.worker_process_shutdown.connect
 def worker_shutdown_handler(sender=None, pid=None, exitcode=None, **kwargs):
     logger.error(f'Celery worker process shutting down - PID: {pid}, Exit Code: {exitcode}')
+    from apps.users.mail import mail_dispatcher
+    mail_dispatcher.close()
 
 @signals.worker_ready.connect
 def worker_ready_handler(sender=None, **kwargs):
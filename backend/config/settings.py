@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'apps.coverage',
     'apps.ai',
     'apps.chat',
+    'apps.changes',
 
 ]
 
@@ -152,6 +153,28 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Coverage recompute pipeline (apps/coverage/pipeline.py)
+# Changes to the same date or PA week within the debounce window share one recompute.
+# Sync mode recomputes on commit in-process (tests, local scripts).
+COVERAGE_UPDATE_DEBOUNCE_SECONDS = int(os.environ.get('COVERAGE_UPDATE_DEBOUNCE_SECONDS', 5))
+COVERAGE_SYNC_UPDATES = os.environ.get('COVERAGE_SYNC_UPDATES', 'False') == 'True'
+
+# Weekly hours are kept current by F() deltas on save; the nightly reconciler
+# (apps.coverage.tasks.reconcile_weekly_hours) recounts this many weeks back onwards.
+WEEKLY_HOURS_RECONCILE_WEEKS = int(os.environ.get('WEEKLY_HOURS_RECONCILE_WEEKS', 8))
+
+# What approving a shift that takes a PA past max_hours_per_week does:
+# 'warn' approves and returns an overtime warning, 'block' refuses the approval.
+OVERTIME_POLICY = os.environ.get('OVERTIME_POLICY', 'warn')
+
+# Delta-sync change log (GET /api/changes/); apps.changes.tasks.prune_change_log
+# drops older entries nightly and clients that fall behind it get 410 and reload.
+CHANGE_LOG_RETENTION_DAYS = int(os.environ.get('CHANGE_LOG_RETENTION_DAYS', 30))
+
+# Daily coverage digest (apps.ai.tasks.check_upcoming_coverage)
+COVERAGE_ALERT_DAYS = int(os.environ.get('COVERAGE_ALERT_DAYS', 14))
+COVERAGE_ALERT_URGENT_DAYS = int(os.environ.get('COVERAGE_ALERT_URGENT_DAYS', 3))
+
 # Channels (WebSockets)
 CHANNEL_LAYERS = {
     'default': {
@@ -162,6 +185,25 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache (calendar responses are versioned per month, see apps/schedules/cache.py)
+# Must be shared by web and Celery processes: invalidations run in the worker.
+# Locmem is only a fallback for running a single process without Redis.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'pa-scheduler',
+        }
+    }
+CALENDAR_CACHE_TIMEOUT = int(os.environ.get('CALENDAR_CACHE_TIMEOUT', 60 * 60))
+
 # Email Configuration (Amazon SES)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend' if not DEBUG else 'django.core.mail.backends.console.EmailBackend'
 EMAIL_HOST = 'email-smtp.us-east-2.amazonaws.com'
@@ -170,6 +212,10 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.environ.get('AWS_ACCESS_KEY_ID', '')
 EMAIL_HOST_PASSWORD = os.environ.get('AWS_SECRET_ACCESS_KEY', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@example.com')
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 10))
+# Each worker process keeps one SMTP connection open (apps/users/mail.py); after
+# this many idle seconds it is checked with a NOOP before reuse and reopened if dead.
+EMAIL_CONNECTION_CHECK_SECONDS = int(os.environ.get('EMAIL_CONNECTION_CHECK_SECONDS', 30))
 AWS_SNS_REGION = 'us-east-2'
 
 
@@ -11,6 +11,7 @@ urlpatterns = [
     path('api/auth/', include('apps.users.urls')),
     path('api/schedule-periods/', include('apps.schedules.urls')),
     path('api/shifts/', include('apps.shifts.urls')),
+    path('api/changes/', include('apps.changes.urls')),
     path('api/', include('apps.schedules.urls')),
     path('api/chat/', include('apps.chat.urls')),
 